@@ -0,0 +1,19 @@
+"""Runs the headless update loop benchmarks.
+
+Usage: python benchmarks.py [--rows ROWS] [--cols COLS] [--npcs NPCS] [--ticks TICKS] [--seed SEED]
+"""
+
+from argparse import ArgumentParser
+from game.benchmarks import benchmark_layer_manager, benchmark_collision_resolver
+
+if __name__ == '__main__':
+	parser = ArgumentParser(description='Runs the headless update loop benchmarks.')
+	parser.add_argument('--rows', type=int, default=200, help='rows of tiles in generated maps')
+	parser.add_argument('--cols', type=int, default=2000, help='columns of tiles in generated maps')
+	parser.add_argument('--npcs', type=int, default=100, help='NPCs or moving objects in each benchmark')
+	parser.add_argument('--ticks', type=int, default=1200, help='ticks to measure for each benchmark')
+	parser.add_argument('--seed', type=int, default=0, help='seed for generating maps')
+	args = parser.parse_args()
+
+	print benchmark_layer_manager(args.rows, args.cols, args.npcs, args.ticks, args.seed).format()
+	print benchmark_collision_resolver(args.rows, args.cols, args.npcs, args.ticks, args.seed).format()
@@ -0,0 +1,14 @@
+"""Compiles levels into binary level files for faster loading.
+
+Usage: python compile_level.py level_title [level_title ...]
+"""
+
+from game.load.compiled_level import compile_level
+import sys
+
+if __name__ == '__main__':
+	if len(sys.argv) < 2:
+		sys.exit(__doc__.strip())
+
+	for level_title in sys.argv[1:]:
+		print 'Compiled {0} to {1}'.format(level_title, compile_level(level_title))
@@ -6,5 +6,11 @@ pyglet.resource.reindex()
 
 # Global level variable
 level = None
+# Global level stack, for pushing and popping sub-levels
+level_stack = None
+# Global texture atlas, for packing the images used by levels
+atlas = None
+# Global fixed step scheduler, for reporting frame and simulation rates
+scheduler = None
 # Handler for all keyboard events
 key_handler = key.KeyStateHandler()
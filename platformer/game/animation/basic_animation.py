@@ -191,15 +191,26 @@ class BasicAnimation(EventDispatcher):
 	def from_image(cls, image, rows, cols, *args, **kwargs):
 		"""Creates an animation from an image.
 
+		If an atlas is given, the image is packed into the atlas and each
+		frame is a region of the atlas texture, rather than every frame
+		having its own texture.
+
 		Args:
 			image (:class:`pyglet.image.AbstractImage`): An image containing the frames of an animation.
 			rows (int): The number of rows of frames in the image.
 			cols (int): The number of columns of frames in the image.
 			durations (list of floats): A list of the number of seconds to display each image.
 
+		Kwargs:
+			atlas (:class:`game.texture_atlas.TextureAtlas`): An atlas to pack the image into.
+
 		Returns:
 			A :class:`game.animation.BasicAnimation` object.
 		"""
+		atlas = kwargs.pop('atlas', None)
+		if atlas:
+			image = atlas.add(image)
+
 		image_grid = ImageGrid(image, rows, cols)
 		sequence = map(cls._create_animation_frame_image, image_grid)
 
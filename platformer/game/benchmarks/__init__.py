@@ -0,0 +1,46 @@
+"""Headless benchmarks for the update loop.
+
+Benchmarks run without drawing, using scripted input, generated maps,
+and a fixed time step so that runs are repeatable. Each benchmark
+reports per-tick latency percentiles and allocations, which can be
+compared against the frame budget of ``FRAME_LENGTH``.
+"""
+
+from harness import ScriptedKeyHandler, BenchmarkResult, run_benchmark
+from scenes import LevelScene, CollisionScene, generate_value_map
+
+def benchmark_layer_manager(rows=200, cols=2000, npcs=100, ticks=1200, seed=0):
+	"""Benchmarks updating a level through its layer manager.
+
+	Kwargs:
+		rows (int): The number of rows of tiles in the map.
+		cols (int): The number of columns of tiles in the map.
+		npcs (int): The number of NPCs in the level.
+		ticks (int): The number of ticks to measure.
+		seed (int): The seed for generating the level.
+
+	Returns:
+		A :class:`game.benchmarks.BenchmarkResult` object.
+	"""
+	scene = LevelScene(rows, cols, npcs, seed)
+	parameters = {'rows': rows, 'cols': cols, 'npcs': npcs, 'seed': seed}
+
+	return run_benchmark('layer_manager.update', parameters, scene.tick, ticks, warmup_ticks=ticks / 10)
+
+def benchmark_collision_resolver(rows=200, cols=2000, objects=100, ticks=1200, seed=0):
+	"""Benchmarks resolving collisions for objects moving over a map.
+
+	Kwargs:
+		rows (int): The number of rows of tiles in the map.
+		cols (int): The number of columns of tiles in the map.
+		objects (int): The number of moving objects.
+		ticks (int): The number of ticks to measure.
+		seed (int): The seed for generating the map.
+
+	Returns:
+		A :class:`game.benchmarks.BenchmarkResult` object.
+	"""
+	scene = CollisionScene(rows, cols, objects, seed)
+	parameters = {'rows': rows, 'cols': cols, 'objects': objects, 'seed': seed}
+
+	return run_benchmark('collision_resolver', parameters, scene.tick, ticks, warmup_ticks=ticks / 10)
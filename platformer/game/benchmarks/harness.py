@@ -0,0 +1,174 @@
+import gc
+import math
+from timeit import default_timer
+from ..settings.general_settings import FRAME_LENGTH
+
+class ScriptedKeyHandler(object):
+	"""Stand-in for :class:`pyglet.window.key.KeyStateHandler` which presses keys from a script.
+
+	The script is a list of segments, each held for a number of ticks.
+	Once the last segment ends, the script starts over from the first.
+
+	Example:
+		>>> key_handler = ScriptedKeyHandler([(60, [key.RIGHT]), (10, [key.RIGHT, key.UP])])
+		>>> key_handler[key.RIGHT]
+		True
+
+	Attributes:
+		tick (int): The number of ticks the script has been advanced by.
+	"""
+
+	def __init__(self, script):
+		"""Creates a scripted key handler.
+
+		Args:
+			script (list of tuple): The script as a list of ``(ticks, pressed_keys)`` segments.
+		"""
+		# The keys pressed on each tick of the script
+		self._pressed_keys = []
+		for ticks, pressed_keys in script:
+			self._pressed_keys.extend([frozenset(pressed_keys)] * ticks)
+
+		self.tick = 0
+
+	def __getitem__(self, symbol):
+		"""Returns whether a key is pressed on the current tick of the script.
+
+		Args:
+			symbol (int): The key symbol to check.
+
+		Returns:
+			True if the key is pressed, False otherwise.
+		"""
+		return symbol in self._pressed_keys[self.tick % len(self._pressed_keys)]
+
+	def advance(self):
+		"""Advances the script by one tick."""
+		self.tick += 1
+
+class BenchmarkResult(object):
+	"""The measurements from a benchmark run.
+
+	Attributes:
+		name (str): The name of the benchmark.
+		parameters (dict): The parameters the benchmark was run with.
+		latencies (list of float): The duration of each measured tick, in seconds.
+		allocations (list of int): The net number of objects tracked by the garbage collector allocated on each measured tick.
+		tracked_objects (int): The change in the number of objects tracked by the garbage collector over the run.
+	"""
+
+	def __init__(self, name, parameters, latencies, allocations, tracked_objects):
+		"""Creates a benchmark result.
+
+		Args:
+			name (str): The name of the benchmark.
+			parameters (dict): The parameters the benchmark was run with.
+			latencies (list of float): The duration of each measured tick, in seconds.
+			allocations (list of int): The net number of objects allocated on each measured tick.
+			tracked_objects (int): The change in the number of tracked objects over the run.
+		"""
+		self.name = name
+		self.parameters = parameters
+		self.latencies = latencies
+		self.allocations = allocations
+		self.tracked_objects = tracked_objects
+
+	def get_percentile(self, percentile):
+		"""Returns a percentile of the tick latencies, using the nearest rank.
+
+		Args:
+			percentile (float): The percentile to return, from 0 to 100.
+
+		Returns:
+			The tick latency at the percentile, in seconds.
+		"""
+		latencies = sorted(self.latencies)
+		rank = int(math.ceil(percentile / 100.0 * len(latencies))) - 1
+
+		return latencies[min(max(rank, 0), len(latencies) - 1)]
+
+	def get_ticks_over_budget(self, budget=FRAME_LENGTH):
+		"""Returns the number of ticks which exceeded a time budget.
+
+		Kwargs:
+			budget (float): The time budget for each tick, in seconds.
+
+		Returns:
+			The number of ticks longer than the budget.
+		"""
+		return len([latency for latency in self.latencies if latency > budget])
+
+	def format(self):
+		"""Returns a readable report of the benchmark result.
+
+		Returns:
+			The report as a string.
+		"""
+		parameters = ', '.join('{0}={1}'.format(name, self.parameters[name]) for name in sorted(self.parameters))
+		milliseconds = lambda seconds: '{0:.3f} ms'.format(seconds * 1000)
+
+		return '\n'.join([
+			'{0} ({1})'.format(self.name, parameters),
+			'  p50 {0}  p95 {1}  p99 {2}  max {3}  mean {4}'.format(
+				milliseconds(self.get_percentile(50)),
+				milliseconds(self.get_percentile(95)),
+				milliseconds(self.get_percentile(99)),
+				milliseconds(max(self.latencies)),
+				milliseconds(sum(self.latencies) / len(self.latencies)),
+			),
+			'  over budget ({0}): {1} of {2} ticks'.format(milliseconds(FRAME_LENGTH), self.get_ticks_over_budget(), len(self.latencies)),
+			'  allocations: {0:.1f} objects/tick (max {1}), {2:+d} tracked objects'.format(
+				float(sum(self.allocations)) / len(self.allocations),
+				max(self.allocations),
+				self.tracked_objects,
+			),
+		])
+
+def run_benchmark(name, parameters, tick, ticks, warmup_ticks=0, dt=FRAME_LENGTH):
+	"""Runs a benchmark, timing each tick with a fixed time step.
+
+	The garbage collector is disabled while measuring, so the collector's
+	allocation count gives the net number of objects allocated by each
+	tick without collections affecting tick latencies.
+
+	Args:
+		name (str): The name of the benchmark.
+		parameters (dict): The parameters the benchmark was run with, for reporting.
+		tick (function): The function to benchmark, which accepts the time step.
+		ticks (int): The number of ticks to measure.
+
+	Kwargs:
+		warmup_ticks (int): The number of ticks to run before measuring.
+		dt (float): The time step to pass to each tick, in seconds.
+
+	Returns:
+		A :class:`game.benchmarks.harness.BenchmarkResult` object.
+	"""
+	for i in xrange(warmup_ticks):
+		tick(dt)
+
+	latencies = [0.0] * ticks
+	allocations = [0] * ticks
+
+	gc.collect()
+	gc_was_enabled = gc.isenabled()
+	gc.disable()
+
+	try:
+		tracked_objects = len(gc.get_objects())
+
+		for i in xrange(ticks):
+			allocated = gc.get_count()[0]
+			start = default_timer()
+
+			tick(dt)
+
+			latencies[i] = default_timer() - start
+			allocations[i] = gc.get_count()[0] - allocated
+
+		tracked_objects = len(gc.get_objects()) - tracked_objects
+	finally:
+		if gc_was_enabled:
+			gc.enable()
+
+	return BenchmarkResult(name, parameters, latencies, allocations, tracked_objects)
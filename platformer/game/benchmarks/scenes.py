@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+from random import Random
+from pyglet.window import key
+from harness import ScriptedKeyHandler
+from ..bounded_box import BoundedBox
+from ..layers import LayerManager, create_from
+from ..load import Player
+from ..physical_objects.physical_object import PhysicalObject
+from ..physical_objects.simpleai import SimpleAI
+from ..physical_objects.collision_resolver import resolve_collisions
+from ..settings.general_settings import TILE_SIZE
+from ..image import dummy_image
+from ..tiles import CollisionGrid, Tileset, VertexTileMap
+from ..tiles.tileset import TilesetImage, TilesetConfig
+from ..viewport import Camera
+
+# Tile values used by generated maps
+_SOLID = 1
+_LEFTWARD_SLOPE = 2 # ◢
+_RIGHTWARD_SLOPE = 3 # ◣
+
+_benchmark_tileset_config = '''{
+	"2": {"type": "slope", "left_height": 0, "right_height": 32},
+	"3": {"type": "slope", "left_height": 32, "right_height": 0}
+}'''
+
+"""The keys pressed by the benchmark player, as ``(ticks, pressed_keys)`` segments.
+
+The player walks, jumps, and dashes right before walking back left.
+"""
+player_script = [
+	(120, [key.RIGHT]),
+	(30, [key.RIGHT, key.UP]),
+	(90, [key.RIGHT, key.LSHIFT]),
+	(20, []),
+	(120, [key.LEFT]),
+	(30, [key.LEFT, key.UP]),
+	(90, [key.LEFT, key.LSHIFT]),
+	(20, []),
+]
+
+def get_benchmark_tileset():
+	"""Returns a tileset with a solid tile and slope tiles for generated maps.
+
+	Returns:
+		A :class:`game.tiles.Tileset` object.
+	"""
+	return Tileset('benchmark', TilesetImage(dummy_image(3 * TILE_SIZE, TILE_SIZE)), TilesetConfig(_benchmark_tileset_config))
+
+def generate_value_map(rows, cols, seed=0):
+	"""Generates a map of rolling ground with slopes and floating platforms.
+
+	The same seed always generates the same map.
+
+	Args:
+		rows (int): The number of rows of tiles in the map.
+		cols (int): The number of columns of tiles in the map.
+
+	Kwargs:
+		seed (int): The seed for generating the map.
+
+	Returns:
+		A tuple of the 2d list of tile values, where row 0 is the bottom of the map, and a list of the height of the ground in each column.
+	"""
+	random = Random(seed)
+	value_map = [[0] * cols for y in xrange(rows)]
+	max_ground_height = max(2, rows / 3)
+
+	# Walk the height of the ground across the map, changing by at most one tile per column
+	ground_heights = [2]
+	for x in xrange(1, cols):
+		height = ground_heights[-1] + random.choice([0, 0, 0, 1, -1])
+		ground_heights.append(min(max(height, 2), max_ground_height))
+
+	for x in xrange(cols):
+		for y in xrange(ground_heights[x]):
+			value_map[y][x] = _SOLID
+
+	# Smooth steps in the ground with slopes
+	for x in xrange(cols - 1):
+		if ground_heights[x+1] > ground_heights[x]:
+			value_map[ground_heights[x]][x+1] = _LEFTWARD_SLOPE
+		elif ground_heights[x+1] < ground_heights[x]:
+			value_map[ground_heights[x+1]][x] = _RIGHTWARD_SLOPE
+
+	# Scatter floating platforms above the ground
+	for i in xrange(cols / 8):
+		x = random.randrange(cols)
+		y = ground_heights[x] + random.randint(3, 5)
+		width = random.randint(2, 6)
+
+		if y < rows:
+			for platform_x in xrange(x, min(x + width, cols)):
+				value_map[y][platform_x] = _SOLID
+
+	return value_map, ground_heights
+
+class LevelScene(object):
+	"""A level with a scripted player and patrolling NPCs, for benchmarking :func:`game.layers.LayerManager.update`.
+
+	Attributes:
+		layer_manager (:class:`game.layers.LayerManager`): The layer manager for the level.
+		player (:class:`game.physical_objects.player.Player`): The scripted player.
+		npcs (list of :class:`game.physical_objects.simpleai.SimpleAI`): The patrolling NPCs.
+	"""
+
+	def __init__(self, rows, cols, npcs, seed=0, patrol_ticks=180):
+		"""Generates a level for benchmarking.
+
+		Args:
+			rows (int): The number of rows of tiles in the map.
+			cols (int): The number of columns of tiles in the map.
+			npcs (int): The number of NPCs to create.
+
+		Kwargs:
+			seed (int): The seed for generating the map and placing NPCs.
+			patrol_ticks (int): The number of ticks between each NPC changing direction.
+		"""
+		random = Random(seed)
+		value_map, ground_heights = generate_value_map(rows, cols, seed)
+		tile_map = VertexTileMap(value_map, get_benchmark_tileset())
+		stage = tile_map.collision_grid
+
+		self._key_handler = ScriptedKeyHandler(player_script)
+		# Start in the middle of the map so the player never leaves it
+		player_x = cols / 2
+		self.player = Player({'x': player_x, 'y': ground_heights[player_x] + 1}, stage, key_handler=self._key_handler).character
+
+		viewport = Camera(target=self.player, bounds=BoundedBox(0, 0, cols * TILE_SIZE, rows * TILE_SIZE), x=0, y=0, width=800, height=600)
+		self.layer_manager = LayerManager(viewport, [create_from(tile_map, title='stage'), create_from(self.player, title='player')])
+
+		npc_image = dummy_image(TILE_SIZE, TILE_SIZE)
+		self.npcs = []
+		for i in xrange(npcs):
+			x = random.randrange(1, cols - 1)
+			npc = SimpleAI(stage=stage, img=npc_image, x=x * TILE_SIZE, y=(ground_heights[x] + 1) * TILE_SIZE, mass=100)
+
+			self.layer_manager.physics_world.register(npc)
+			self.npcs.append(npc)
+
+		self._max_x = (cols - 1) * TILE_SIZE
+		self._patrol_ticks = patrol_ticks
+		self._patrol_distances = [random.randint(2, 8) * TILE_SIZE for npc in self.npcs]
+		self._tick = 0
+
+	def _patrol(self):
+		"""Sends each NPC back and forth on a fixed schedule."""
+		if self._tick % self._patrol_ticks == 0:
+			direction = 1 if (self._tick / self._patrol_ticks) % 2 == 0 else -1
+
+			for npc, distance in zip(self.npcs, self._patrol_distances):
+				npc.go_to_x(min(max(npc.x + direction * distance, 0), self._max_x))
+
+	def tick(self, dt):
+		"""Advances the scripted input and updates the level.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		self._patrol()
+		self.layer_manager.update(dt)
+
+		self._key_handler.advance()
+		self._tick += 1
+
+class CollisionScene(object):
+	"""Objects moving over a generated map, for benchmarking the collision resolver alone.
+
+	Attributes:
+		objects (list of :class:`game.physical_objects.physical_object.PhysicalObject`): The moving objects.
+	"""
+
+	def __init__(self, rows, cols, objects, seed=0, turn_ticks=60):
+		"""Generates a map and places objects on it for benchmarking.
+
+		Args:
+			rows (int): The number of rows of tiles in the map.
+			cols (int): The number of columns of tiles in the map.
+			objects (int): The number of objects to move.
+
+		Kwargs:
+			seed (int): The seed for generating the map and placing objects.
+			turn_ticks (int): The number of ticks between each object changing direction.
+		"""
+		random = Random(seed)
+		value_map, ground_heights = generate_value_map(rows, cols, seed)
+		stage = CollisionGrid.from_value_map(value_map, get_benchmark_tileset())
+
+		image = dummy_image(TILE_SIZE, TILE_SIZE)
+		self.objects = []
+		for i in xrange(objects):
+			x = random.randrange(1, cols - 1)
+			self.objects.append(PhysicalObject(stage=stage, img=image, x=x * TILE_SIZE, y=(ground_heights[x] + 1) * TILE_SIZE))
+
+		# Fixed per-tick movements, as (dx, dy)
+		self._movements = [(random.choice([-1, 1]) * random.randint(1, 8), random.randint(-6, -1)) for obj in self.objects]
+
+		self._max_x = (cols - 1) * TILE_SIZE
+		self._turn_ticks = turn_ticks
+		self._tick = 0
+
+	def tick(self, dt):
+		"""Moves each object and resolves its collisions.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		direction = 1 if (self._tick / self._turn_ticks) % 2 == 0 else -1
+
+		for obj, (dx, dy) in zip(self.objects, self._movements):
+			obj.moving_to_x = min(max(obj.x + direction * dx, 0), self._max_x)
+			obj.moving_to_y = obj.y + dy
+
+			resolve_collisions(obj)
+
+		self._tick += 1
@@ -1,4 +1,4 @@
-from physical_objects import physicalobject, simpleai
+from physical_objects import physical_object, simpleai
 from resources import demo_sprites
 
 # @TODO We need our own test_object tileset
@@ -7,35 +7,35 @@ from resources import demo_sprites
 look_up = {
     # No gravity
     'test_object_1': {
-        'class': physicalobject.PhysicalObject,
+        'class': physical_object.PhysicalObject,
         'img': demo_sprites.floating,
         'mass': 0
     },
     
     # No gravity
     'test_object_2': {
-        'class': physicalobject.PhysicalObject,
+        'class': physical_object.PhysicalObject,
         'img': demo_sprites.floating,
         'mass': 0
     },
     
     # No gravity
     'test_object_3': {
-        'class': physicalobject.PhysicalObject,
+        'class': physical_object.PhysicalObject,
         'img': demo_sprites.floating,
         'mass': 0
     },
     
     # 1 mass
     'test_object_4': {
-        'class': physicalobject.PhysicalObject,
+        'class': physical_object.PhysicalObject,
         'img': demo_sprites.floating,
         'mass': 1
     },
     
     # Incredibly heavy
     'test_object_5': {
-        'class': physicalobject.PhysicalObject,
+        'class': physical_object.PhysicalObject,
         'img': demo_sprites.floating,
         'mass': 10000
     },
@@ -4,6 +4,13 @@ from math import ceil
 class BoundedBox(object):
 	"""A box which keeps track of its position and dimensions in terms of pixels and tiles.
 
+	Only the position and dimensions are stored when the box is moved.
+	The tile indices of the box are computed when they are first read,
+	and are cached until the box is moved or resized again, so boxes
+	which move every update don't pay for values which aren't used.
+	Boxes can be reused with :func:`set_bounds` and
+	:func:`intersect_into` rather than allocating new boxes.
+
 	Attributes:
 		x (int): The x coordinate of the box's anchor point (usually the bottom left corner)
 		y (int): The y coordinate of the box's anchor point (usually the bottom left corner)
@@ -27,6 +34,14 @@ class BoundedBox(object):
 		half_tile_height (float): Half of the box's height in terms of tiles.
 	"""
 
+	__slots__ = (
+		'_x', '_y', '_width', '_height',
+		'_half_width', '_half_height', '_half_width_int', '_half_height_int',
+		'_tile_width', '_tile_height', '_tile_width_float', '_tile_height_float',
+		'_half_tile_width', '_half_tile_height', '_half_tile_width_int', '_half_tile_height_int',
+		'_x_tiles', '_y_tiles',
+	)
+
 	def __init__(self, x, y, width, height):
 		"""Creates a new bounded box.
 
@@ -37,34 +52,34 @@ class BoundedBox(object):
 			height (int): The height of the box.
 		"""
 		# Set the initial dimensions before setting coordinates
-		self._height      = int(height)
-		self._half_height = self._height / 2.0
+		BoundedBox._set_width(self, width)
+		BoundedBox._set_height(self, height)
 
-		self._tile_height_float = self._height / TILE_SIZE_FLOAT
-		self._half_tile_height  = self._tile_height_float / 2.0
-
-		self._half_tile_height_int = int(self._half_tile_height)
-		self._half_height_int      = int(self._half_height)
-
-		self._tile_height = int(ceil(self._tile_height_float))
-
-
-		self._width      = int(width)
-		self._half_width = self._width / 2.0
+		# Set the coordinates
+		self._set_x(x)
+		self._set_y(y)
 
-		self._tile_width_float = self._width / TILE_SIZE_FLOAT
-		self._half_tile_width  = self._tile_width_float / 2.0
 
-		self._half_tile_width_int = int(self._half_tile_width)
-		self._half_width_int      = int(self._half_width)
 
-		self._tile_width = int(ceil(self._tile_width_float))
+	def set_bounds(self, x, y, width, height):
+		"""Moves and resizes the box, so that it can be reused instead of creating a new box.
 
+		Args:
+			x (int): The x coordinate of the box.
+			y (int): The y coordinate of the box.
+			width (int): The width of the box.
+			height (int): The height of the box.
 
-		# Set the coordinates
+		Returns:
+			This box.
+		"""
+		self._set_width(width)
+		self._set_height(height)
 		self._set_x(x)
 		self._set_y(y)
 
+		return self
+
 
 
 	def get_intersection(self, box):
@@ -78,29 +93,36 @@ class BoundedBox(object):
 		Returns:
 			A :class:`game.bounded_box.BoundedBox` of the intersection region, or ``None`` if there was no intersection.
 		"""
-		intersection = BoundedBox(self._x, self._y, self._width, self._height)
+		return self.intersect_into(box, BoundedBox(0, 0, 0, 0))
+
+	def intersect_into(self, box, out):
+		"""Stores the intersection of this box and another box in an existing box.
 
-		if self._x2 > box.x2:
-			intersection._set_width(max(box.x2 - self._x, 0))
-		if intersection._x < box.x:
-			intersection._set_width(max(intersection._x2 - box.x, 0))
-			intersection._set_x(box.x)
+		If the boxes do not overlap, ``out`` is left unchanged and ``None``
+		will be returned. ``out`` may be either of the intersected boxes.
+
+		Args:
+			box (:class:`game.bounded_box.BoundedBox`): The bounded box to intersect with.
+			out (:class:`game.bounded_box.BoundedBox`): The box to store the intersection region in.
+
+		Returns:
+			``out``, or ``None`` if there was no intersection.
+		"""
+		x = max(self._x, box.x)
+		width = min(self._x + self._width, box.x2) - x
 
 		# No overlap in this case
-		if intersection._width == 0:
+		if width <= 0:
 			return None
 
-		if self._y2 > box.y2:
-			intersection._set_height(max(box.y2 - self._y, 0))
-		if intersection._y < box.y:
-			intersection._set_height(max(intersection._y2 - box.y, 0))
-			intersection._set_y(box.y)
+		y = max(self._y, box.y)
+		height = min(self._y + self._height, box.y2) - y
 
 		# No overlap in this case
-		if intersection._height == 0:
+		if height <= 0:
 			return None
 
-		return intersection
+		return out.set_bounds(x, y, width, height)
 
 
 
@@ -115,121 +137,145 @@ class BoundedBox(object):
 		"""
 		if self._x < bounding_box.x:
 			self._set_x(bounding_box.x)
-		elif self._x2 > bounding_box.x2:
+		elif self._x + self._width > bounding_box.x2:
 			self._set_x(bounding_box.x2 - self._width)
 
 		if self._y < bounding_box.y:
 			self._set_y(bounding_box.y)
-		elif self._y2 > bounding_box.y2:
+		elif self._y + self._height > bounding_box.y2:
 			self._set_y(bounding_box.y2 - self._height)
 
 		return self
 
 
 
-	def _set_x(self, x):
-		"""Positions the box to have its lower left corner on the specified coordinate."""
-		x = int(x)
+	def _get_x_tiles(self):
+		"""Returns the x indices of the tiles under the box, computing them if the box has moved.
 
-		self._x     = x
-		self._mid_x = x + self._half_width_int
-		self._x2    = x + self._width
+		Returns:
+			A tuple of the x indices of the tiles under the box's x, mid x, and x2 coordinates.
+		"""
+		if self._x_tiles is None:
+			x = self._x
+			mid_x = x + self._half_width_int
+			x2 = x + self._width
 
-		self._x_tile_float  = x / TILE_SIZE_FLOAT
-		self._x2_tile_float = self._x_tile_float + self._tile_width_float
+			x_tile_float = x / TILE_SIZE_FLOAT
 
-		self._x_tile = int(self._x_tile_float)
-		if (self._x < 0 and self._x % TILE_SIZE != 0):
-			self._x_tile -= 1
+			x_tile = int(x_tile_float)
+			if (x < 0 and x % TILE_SIZE != 0):
+				x_tile -= 1
 
-		self._mid_x_tile = int(self._x_tile_float + self._half_tile_width)
-		if (self._mid_x > 0 and self._mid_x % TILE_SIZE == 0):
-			self._mid_x_tile -= 1
-		elif (self._mid_x < 0 and self._mid_x % TILE_SIZE != 0):
-			self._mid_x_tile -= 1
+			mid_x_tile = int(x_tile_float + self._half_tile_width)
+			if (mid_x > 0 and mid_x % TILE_SIZE == 0):
+				mid_x_tile -= 1
+			elif (mid_x < 0 and mid_x % TILE_SIZE != 0):
+				mid_x_tile -= 1
 
-		# If the rightmost pixel is divisible by the tile size, our x2_tile
-		# will be off by a tile. For example, for a 64px wide object at (0,0)
-		# with a 32px tile size, the 64th pixel falls on the 2nd tile, but
-		# 64/32 = 2 gives the wrong tile index.
-		self._x2_tile = int(self._x2_tile_float)
-		if ((self._x2 > 0 and self._x2 % TILE_SIZE == 0) or self._x2 < 0):
-			self._x2_tile -= 1
+			# If the rightmost pixel is divisible by the tile size, our x2_tile
+			# will be off by a tile. For example, for a 64px wide object at (0,0)
+			# with a 32px tile size, the 64th pixel falls on the 2nd tile, but
+			# 64/32 = 2 gives the wrong tile index.
+			x2_tile = int(x_tile_float + self._tile_width_float)
+			if ((x2 > 0 and x2 % TILE_SIZE == 0) or x2 < 0):
+				x2_tile -= 1
 
-	x = property(lambda self: self._x, _set_x)
+			self._x_tiles = (x_tile, mid_x_tile, x2_tile)
 
+		return self._x_tiles
 
-	def _set_y(self, y):
-		"""Positions the box to have its lower left corner on the specified coordinate."""
-		y = int(y)
+	def _get_y_tiles(self):
+		"""Returns the y indices of the tiles under the box, computing them if the box has moved.
+
+		Returns:
+			A tuple of the y indices of the tiles under the box's y, mid y, and y2 coordinates.
+		"""
+		if self._y_tiles is None:
+			y = self._y
+			mid_y = y + self._half_height_int
+			y2 = y + self._height
+
+			y_tile_float = y / TILE_SIZE_FLOAT
 
-		self._y     = y
-		self._mid_y = y + self._half_height_int
-		self._y2    = y + self._height
+			y_tile = int(y_tile_float)
+			if (y < 0 and y % TILE_SIZE != 0):
+				y_tile -= 1
 
-		self._y_tile_float  = y / TILE_SIZE_FLOAT
-		self._y2_tile_float = self._y_tile_float + self._tile_height_float
+			mid_y_tile = int(y_tile_float + self._half_tile_height)
+			if (mid_y > 0 and mid_y % TILE_SIZE == 0):
+				mid_y_tile -= 1
+			elif (mid_y < 0 and mid_y % TILE_SIZE != 0):
+				mid_y_tile -= 1
 
-		self._y_tile = int(self._y_tile_float)
-		if (self._y < 0 and self._y % TILE_SIZE != 0):
-			self._y_tile -= 1
+			y2_tile = int(y_tile_float + self._tile_height_float)
+			if ((y2 > 0 and y2 % TILE_SIZE == 0) or y2 < 0):
+				y2_tile -= 1
 
-		self._mid_y_tile = int(self._y_tile_float + self._half_tile_height)
-		if (self._mid_y > 0 and self._mid_y % TILE_SIZE == 0):
-			self._mid_y_tile -= 1
-		elif (self._mid_y < 0 and self._mid_y % TILE_SIZE != 0):
-			self._mid_y_tile -= 1
+			self._y_tiles = (y_tile, mid_y_tile, y2_tile)
 
-		self._y2_tile = int(self._y2_tile_float)
-		if ((self._y2 != 0 and self._y2 % TILE_SIZE == 0) or self._y2 < 0):
-			self._y2_tile -= 1
+		return self._y_tiles
+
+
+
+	def _set_x(self, x):
+		"""Positions the box to have its lower left corner on the specified coordinate."""
+		self._x = int(x)
+		self._x_tiles = None
+
+	x = property(lambda self: self._x, _set_x)
+
+
+	def _set_y(self, y):
+		"""Positions the box to have its lower left corner on the specified coordinate."""
+		self._y = int(y)
+		self._y_tiles = None
 
 	y = property(lambda self: self._y, _set_y)
 
 
 	def _set_mid_x(self, mid_x):
 		self._set_x(int(mid_x) - self._half_width_int)
-	mid_x = property(lambda self: self._mid_x, _set_mid_x)
+	mid_x = property(lambda self: self._x + self._half_width_int, _set_mid_x)
 
 	def _set_mid_y(self, mid_y):
 		self._set_y(int(mid_y) - self._half_height_int)
-	mid_y = property(lambda self: self._mid_y, _set_mid_y)
+	mid_y = property(lambda self: self._y + self._half_height_int, _set_mid_y)
 
 
 	def _set_x2(self, x2):
 		self._set_x(x2 - self._width)
-	x2 = property(lambda self: self._x2, _set_x2)
+	x2 = property(lambda self: self._x + self._width, _set_x2)
 
 	def _set_y2(self, y2):
 		self._set_y(y2 - self._height)
-	y2 = property(lambda self: self._y2, _set_y2)
+	y2 = property(lambda self: self._y + self._height, _set_y2)
 
 
 	def _set_x_tile(self, x_tile):
 		self._set_x(x_tile * TILE_SIZE)
-	x_tile = property(lambda self: self._x_tile, _set_x_tile)
+	x_tile = property(lambda self: self._get_x_tiles()[0], _set_x_tile)
 
 	def _set_y_tile(self, y_tile):
 		self._set_y(y_tile * TILE_SIZE)
-	y_tile = property(lambda self: self._y_tile, _set_y_tile)
+	y_tile = property(lambda self: self._get_y_tiles()[0], _set_y_tile)
 
 
 	def _set_mid_x_tile(self, mid_x_tile):
 		self._set_x((int(mid_x_tile) - self._half_tile_width_int) * TILE_SIZE)
-	mid_x_tile = property(lambda self: self._mid_x_tile, _set_mid_x_tile)
+	mid_x_tile = property(lambda self: self._get_x_tiles()[1], _set_mid_x_tile)
 
 	def _set_mid_y_tile(self, mid_y_tile):
 		self._set_y((int(mid_y_tile) - self._half_tile_height_int) * TILE_SIZE)
-	mid_y_tile = property(lambda self: self._mid_y_tile, _set_mid_y_tile)
+	mid_y_tile = property(lambda self: self._get_y_tiles()[1], _set_mid_y_tile)
 
 
 	def _set_x2_tile(self, x2_tile):
 		self._set_x((x2_tile - self._tile_width_float) * TILE_SIZE)
-	x2_tile = property(lambda self: self._x2_tile, _set_x2_tile)
+	x2_tile = property(lambda self: self._get_x_tiles()[2], _set_x2_tile)
 
 	def _set_y2_tile(self, y2_tile):
 		self._set_y((y2_tile - self._tile_height_float) * TILE_SIZE)
-	y2_tile = property(lambda self: self._y2_tile, _set_y2_tile)
+	y2_tile = property(lambda self: self._get_y_tiles()[2], _set_y2_tile)
 
 
 
@@ -247,19 +293,7 @@ class BoundedBox(object):
 
 		self._tile_width = int(ceil(self._tile_width_float))
 
-		self._mid_x         = self._x + self._half_width_int
-		self._x2            = self._x + self._width
-		self._x2_tile_float = self._x_tile_float + self._tile_width_float
-
-		self._mid_x_tile = int(self._x_tile_float + self._half_tile_width)
-		if (self._mid_x > 0 and self._mid_x % TILE_SIZE == 0):
-			self._mid_x_tile -= 1
-		elif (self._mid_x < 0 and self._mid_x % TILE_SIZE != 0):
-			self._mid_x_tile -= 1
-
-		self._x2_tile = int(self._x2_tile_float)
-		if ((self._x2 > 0 and self._x2 % TILE_SIZE == 0) or self._x2 < 0):
-			self._x2_tile -= 1
+		self._x_tiles = None
 
 	width = property(lambda self: self._width, _set_width)
 
@@ -269,7 +303,7 @@ class BoundedBox(object):
 		self._height      = int(height)
 		self._half_height = self._height / 2.0
 
-		self._tile_height_float = self.height / TILE_SIZE_FLOAT
+		self._tile_height_float = self._height / TILE_SIZE_FLOAT
 		self._half_tile_height  = self._tile_height_float / 2.0
 
 		self._half_tile_height_int = int(self._half_tile_height)
@@ -277,19 +311,7 @@ class BoundedBox(object):
 
 		self._tile_height = int(ceil(self._tile_height_float))
 
-		self._mid_y         = self._y + self._half_height_int
-		self._y2            = self._y + self._height
-		self._y2_tile_float = self._y_tile_float + self._tile_height_float
-
-		self._mid_y_tile = int(self._y_tile_float + self._half_tile_height)
-		if (self._mid_y > 0 and self._mid_y % TILE_SIZE == 0):
-			self._mid_y_tile -= 1
-		elif (self._mid_y < 0 and self._mid_y % TILE_SIZE != 0):
-			self._mid_y_tile -= 1
-
-		self._y2_tile = int(self._y2_tile_float)
-		if ((self._y2 > 0 and self._y2 % TILE_SIZE == 0) or self._y2 < 0):
-			self._y2_tile -= 1
+		self._y_tiles = None
 
 	height = property(lambda self: self._height, _set_height)
 
@@ -2,7 +2,13 @@ from bounded_box import BoundedBox
 from pyglet.sprite import Sprite
 
 class ExtendedSprite(BoundedBox, Sprite):
-	""":class:`pgylet.sprite.Sprite` which tracks its position and dimensions in terms of pixels and tiles."""
+	""":class:`pgylet.sprite.Sprite` which tracks its position and dimensions in terms of pixels and tiles.
+
+	Attributes:
+		defers_sprite_updates (bool): Whether moving the sprite postpones updating its vertices until :func:`update_sprite_position` is called.
+	"""
+
+	defers_sprite_updates = False
 
 	def __init__(self, *args, **kwargs):
 		Sprite.__init__(self, *args, **kwargs)
@@ -11,11 +17,17 @@ class ExtendedSprite(BoundedBox, Sprite):
 		self._height = self._texture.height * self._scale
 		BoundedBox.__init__(self, self._x, self._y, self._width, self._height)
 
+		# The position at the start of the last simulation step, for interpolation
+		self._previous_x = self._x
+		self._previous_y = self._y
+
 
 
 	def _set_x(self, x):
 		BoundedBox._set_x(self, x)
-		Sprite._set_x(self, self._x)
+
+		if not self.defers_sprite_updates:
+			Sprite._set_x(self, self._x)
 
 	x = property(lambda self: self._x, _set_x)
 
@@ -23,7 +35,9 @@ class ExtendedSprite(BoundedBox, Sprite):
 
 	def _set_y(self, y):
 		BoundedBox._set_y(self, y)
-		Sprite._set_y(self, self._y)
+
+		if not self.defers_sprite_updates:
+			Sprite._set_y(self, self._y)
 
 	y = property(lambda self: self._y, _set_y)
 
@@ -43,3 +57,47 @@ class ExtendedSprite(BoundedBox, Sprite):
 		lambda self: (self._x, self._y),
 		lambda self, pos: self.set_position(*pos)
 	)
+
+
+
+	def update_sprite_position(self):
+		"""Updates the sprite's vertices to its current position.
+
+		This is only necessary when sprite updates are being deferred.
+		"""
+		self._update_position()
+
+
+
+	def store_previous_position(self):
+		"""Stores the sprite's current position as its previous position.
+
+		This should be called before each simulation step, so that the
+		sprite can be drawn between its positions before and after the step.
+		"""
+		self._previous_x = self._x
+		self._previous_y = self._y
+
+	def has_moved(self):
+		"""Returns whether the sprite has moved since its previous position was stored."""
+		return self._x != self._previous_x or self._y != self._previous_y
+
+	def interpolate(self, alpha):
+		"""Draws the sprite between its previous and current positions.
+
+		Only the sprite's vertices are moved, so the sprite's position
+		is unchanged. The vertices are moved back to the sprite's position
+		the next time it moves.
+
+		Args:
+			alpha (float): How far between the previous and current positions to draw the sprite, from 0 to 1.
+		"""
+		x = self._x
+		y = self._y
+
+		self._x = self._previous_x + (x - self._previous_x) * alpha
+		self._y = self._previous_y + (y - self._previous_y) * alpha
+		self._update_position()
+
+		self._x = x
+		self._y = y
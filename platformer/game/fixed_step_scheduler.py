@@ -0,0 +1,150 @@
+from collections import deque
+from settings.general_settings import FRAME_LENGTH, MAX_SIMULATION_STEPS, MAX_SKIPPED_FRAMES
+
+class FixedStepScheduler(object):
+	"""Runs a simulation at a fixed time step, independent of the frame rate.
+
+	Each frame, the real time since the last frame is added to an
+	accumulator, and the simulation is updated with the fixed time step
+	until less than one step remains. Slow frames are caught up with
+	multiple steps, and fast frames may run no steps at all.
+
+	If more than ``max_steps`` would be needed, the tick is late. Drawing
+	the next frame is skipped so that the simulation can catch up on the
+	following tick, at the cost of the visual frame rate. Once
+	``max_skipped_frames`` frames in a row have been skipped, the time
+	which could not be caught up on is dropped instead, so the simulation
+	can not fall further behind each frame.
+
+	The remaining fraction of a step, ``alpha``, can be used to draw
+	objects between their previous and current positions.
+
+	Example:
+		>>> scheduler = FixedStepScheduler(layer_manager.update)
+		>>> pyglet.clock.schedule_interval(scheduler.tick, FRAME_LENGTH)
+
+	Attributes:
+		update (function): The simulation update function, which accepts the time step.
+		step (float): The fixed time step of the simulation, in seconds.
+		max_steps (int): The maximum number of steps to run in a single frame.
+		max_skipped_frames (int): The maximum number of frames in a row to skip drawing.
+		alpha (float): The fraction of a step which has accumulated since the last step, from 0 up to 1.
+		should_draw (bool): Whether the frame following the last tick should be drawn.
+		ticks (int): The number of ticks which have run.
+		late_ticks (int): The number of ticks which could not run every accumulated step.
+		dropped_frames (int): The number of frames which were skipped.
+		dropped_time (float): The number of seconds which the simulation dropped rather than caught up on.
+	"""
+
+	def __init__(self, update, step=FRAME_LENGTH, max_steps=MAX_SIMULATION_STEPS, max_skipped_frames=MAX_SKIPPED_FRAMES, rate_window=1.0):
+		"""Creates a fixed step scheduler.
+
+		Args:
+			update (function): The simulation update function, which accepts the time step.
+
+		Kwargs:
+			step (float): The fixed time step of the simulation, in seconds.
+			max_steps (int): The maximum number of steps to run in a single frame.
+			max_skipped_frames (int): The maximum number of frames in a row to skip drawing.
+			rate_window (float): The number of seconds of recent ticks to measure rates over.
+		"""
+		self.update = update
+		self.step = step
+		self.max_steps = max_steps
+		self.max_skipped_frames = max_skipped_frames
+		self.alpha = 0.0
+		self.should_draw = True
+
+		self.ticks = 0
+		self.late_ticks = 0
+		self.dropped_frames = 0
+		self.dropped_time = 0.0
+
+		self._accumulator = 0.0
+		self._skipped_frames = 0 # Frames skipped in a row
+
+		# Recent ticks as (dt, steps, drawn), with running totals for measuring rates
+		self._rate_window = rate_window
+		self._history = deque()
+		self._history_time = 0.0
+		self._history_steps = 0
+		self._history_frames = 0
+
+	def tick(self, dt):
+		"""Runs as many simulation steps as have accumulated.
+
+		Args:
+			dt (float): The number of seconds since the last frame.
+
+		Returns:
+			The number of simulation steps which were run.
+		"""
+		self._accumulator += dt
+		self.ticks += 1
+		steps = 0
+
+		while self._accumulator >= self.step and steps < self.max_steps:
+			self.update(self.step)
+			self._accumulator -= self.step
+			steps += 1
+
+		self.should_draw = True
+
+		if self._accumulator >= self.step:
+			self.late_ticks += 1
+
+			if self._skipped_frames < self.max_skipped_frames:
+				# Skip drawing so the next tick comes sooner and catches up
+				self.should_draw = False
+			else:
+				# Drop whole steps which could not be caught up on
+				dropped_time = self._accumulator - self._accumulator % self.step
+				self._accumulator -= dropped_time
+				self.dropped_time += dropped_time
+
+		if self.should_draw:
+			self._skipped_frames = 0
+		else:
+			self._skipped_frames += 1
+			self.dropped_frames += 1
+
+		self.alpha = min(self._accumulator / self.step, 1.0)
+
+		self._record_tick(dt, steps, self.should_draw)
+
+		return steps
+
+	def get_simulation_rate(self):
+		"""Returns the number of simulation steps per second over recent ticks.
+
+		Returns:
+			The simulation rate as a float.
+		"""
+		return self._history_steps / self._history_time if self._history_time else 0.0
+
+	def get_draw_rate(self):
+		"""Returns the number of frames drawn per second over recent ticks.
+
+		Returns:
+			The draw rate as a float.
+		"""
+		return self._history_frames / self._history_time if self._history_time else 0.0
+
+	def _record_tick(self, dt, steps, drawn):
+		"""Records a tick for measuring rates, forgetting ticks older than the rate window.
+
+		Args:
+			dt (float): The number of seconds since the last frame.
+			steps (int): The number of simulation steps which were run.
+			drawn (bool): Whether the frame was drawn.
+		"""
+		self._history.append((dt, steps, drawn))
+		self._history_time += dt
+		self._history_steps += steps
+		self._history_frames += drawn
+
+		while self._history_time > self._rate_window and len(self._history) > 1:
+			dt, steps, drawn = self._history.popleft()
+			self._history_time -= dt
+			self._history_steps -= steps
+			self._history_frames -= drawn
@@ -0,0 +1,54 @@
+from pyglet import app
+from pyglet.app import EventLoop
+
+class FrameSkippingEventLoop(EventLoop):
+	"""Application event loop which skips drawing frames while the simulation catches up.
+
+	Windows are only drawn after a tick which sets the scheduler's
+	``should_draw``, so skipped frames are neither cleared nor flipped.
+	Windows which pyglet has invalidated, such as after being exposed
+	or resized, are still redrawn while frames are being skipped.
+
+	The scheduler should be ticked at an interval, so that the event
+	loop can sleep between frames.
+
+	Example:
+		>>> pyglet.clock.schedule_interval(scheduler.tick, FRAME_LENGTH)
+		>>> pyglet.app.event_loop = FrameSkippingEventLoop(scheduler)
+		>>> pyglet.app.run()
+
+	Attributes:
+		scheduler (:class:`game.fixed_step_scheduler.FixedStepScheduler`): The scheduler deciding which frames to draw.
+	"""
+
+	def __init__(self, scheduler):
+		"""Creates an event loop.
+
+		Args:
+			scheduler (:class:`game.fixed_step_scheduler.FixedStepScheduler`): The scheduler deciding which frames to draw.
+		"""
+		super(FrameSkippingEventLoop, self).__init__()
+
+		self.scheduler = scheduler
+
+	def idle(self):
+		"""Calls scheduled functions, and draws windows after a tick unless the frame was skipped.
+
+		Returns:
+			The number of seconds before this method should be called again.
+		"""
+		ticks = self.scheduler.ticks
+
+		dt = self.clock.update_time()
+		self.clock.call_scheduled_functions(dt)
+
+		redraw_all = self.scheduler.ticks != ticks and self.scheduler.should_draw
+
+		for window in app.windows:
+			if redraw_all or (window._legacy_invalid and window.invalid):
+				window.switch_to()
+				window.dispatch_event('on_draw')
+				window.flip()
+				window._legacy_invalid = False
+
+		return self.clock.get_sleep_time(True)
@@ -0,0 +1,12 @@
+from game.tiles import ChunkedTileMap
+from . import install_graphics_module
+
+def recognizer(graphics_type):
+	"""Recognizes whether this graphics type is handled by :class:`game.tiles.ChunkedTileMap`."""
+	return graphics_type == 'chunked tile map'
+
+def factory(*args, **kwargs):
+	"""Returns a :class:`game.tiles.ChunkedTileMap` for the given arguments."""
+	return ChunkedTileMap(*args, **kwargs)
+
+install_graphics_module(__name__)
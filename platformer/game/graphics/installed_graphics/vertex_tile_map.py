@@ -0,0 +1,12 @@
+from game.tiles import VertexTileMap
+from . import install_graphics_module
+
+def recognizer(graphics_type):
+	"""Recognizes whether this graphics type is handled by :class:`game.tiles.VertexTileMap`."""
+	return graphics_type == 'vertex tile map'
+
+def factory(*args, **kwargs):
+	"""Returns a :class:`game.tiles.VertexTileMap` for the given arguments."""
+	return VertexTileMap(*args, **kwargs)
+
+install_graphics_module(__name__)
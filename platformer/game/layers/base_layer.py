@@ -15,9 +15,13 @@ class BaseLayer(EventDispatcher):
 	All registered ``on_delete`` callbacks should accept the layer
 	as their only argument.
 
+	Layers which are updated should set ``dirty`` whenever their update
+	changes how their contents are drawn.
+
 	Attributes:
 		graphic (object): The graphical content.
 		viewport (object): The viewport that this layer is drawn to.
+		dirty (bool): Whether the layer's contents have changed since they were last drawn.
 	"""
 
 	untitled_count = 0
@@ -35,6 +39,7 @@ class BaseLayer(EventDispatcher):
 		self.graphic = graphic
 		self.viewport = viewport
 		self.title = title
+		self.dirty = True
 
 		# Ensure untitled layers have unique names
 		if title == 'untitled':
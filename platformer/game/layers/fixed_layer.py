@@ -32,3 +32,14 @@ class FixedLayer(object):
 		"""
 		self.graphic.x = self.viewport.x + self.offset_x
 		self.graphic.y = self.viewport.y + self.offset_y
+
+	def interpolate(self, alpha):
+		"""Fixes the layer's graphical content to its viewport's interpolated position.
+
+		Args:
+			alpha (float): How far between the previous and current positions the viewport is drawn, from 0 to 1.
+		"""
+		x, y = self.viewport.get_interpolated_position()
+
+		self.graphic.x = x + self.offset_x
+		self.graphic.y = y + self.offset_y
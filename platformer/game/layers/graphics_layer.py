@@ -72,6 +72,7 @@ class GraphicsLayer(StaticGraphicsLayer):
 			dt (float): The number of seconds that elapsed between the last update.
 		"""
 		self.graphic.update(dt)
+		self.dirty = True
 
 
 
@@ -42,6 +42,7 @@ class ImageLayer(StaticImageLayer):
 			dt (float): The number of seconds that elapsed between the last update.
 		"""
 		self.graphic.update(dt)
+		self.dirty = True
 
 
 
@@ -58,7 +59,16 @@ class FixedStaticImageLayer(FixedLayer, StaticImageLayer):
 		where ``x`` and ``y`` are provided by the viewport and are
 		offset by the amount specified when initializing this class.
 		"""
-		self.graphic.blit(self.viewport.x + self.offset_x, self.viewport.y + self.offset_y)
+		x, y = self.viewport.get_interpolated_position()
+		self.graphic.blit(x + self.offset_x, y + self.offset_y)
+
+	def interpolate(self, alpha):
+		"""Does nothing, since images are blit at the viewport's interpolated position when drawn.
+
+		Args:
+			alpha (float): How far between the previous and current positions the viewport is drawn, from 0 to 1.
+		"""
+		pass
 
 
 
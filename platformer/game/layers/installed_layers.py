@@ -1,5 +1,6 @@
 import texture_tile_map_layer
 import tile_map_layer
+import vertex_tile_map_layer
 import text_layer
 import animation_layer
 import graphics_layer
@@ -17,6 +18,7 @@ def install_layer(layer_module):
 # Before TileMapLayer because TextureTileMap is more specific
 install_layer(texture_tile_map_layer)
 install_layer(tile_map_layer)
+install_layer(vertex_tile_map_layer)
 install_layer(text_layer)
 install_layer(animation_layer)
 
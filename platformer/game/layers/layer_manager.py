@@ -1,7 +1,8 @@
 from pyglet.graphics import Batch, OrderedGroup
-
-# TODO Layer manager should support hiding layers (no drawing) and deactivating layers (no drawing or updating)
-# TODO Layer manager should support being disabled and re-enabled (like when you enter a sublevel and the current layer manager changes to the sub-level's)
+from fixed_layer import FixedLayer
+from static_layer_cache import StaticLayerCache
+from ..physical_objects.physics_world import PhysicsWorld
+from ..physical_objects.simulation_lod import SimulationLOD
 
 # TODO This should probably support adding layers relative to a pre-existing layer at any time.
 
@@ -12,25 +13,69 @@ from pyglet.graphics import Batch, OrderedGroup
 class LayerManager(object):
 		"""Manager for updating and drawing layers in a specified order.
 
+		When offscreen framebuffers are supported, the bottom run of
+		layers which are not dirty is composited into a cached texture.
+		Once the run has been unchanged for a frame, the cache is drawn
+		in place of those layers until one of them becomes dirty or, for
+		layers which are not fixed, the viewport moves.
+
+		Layers can be hidden, so that they are not drawn, or suspended, so
+		that they are neither drawn nor updated. Layers which are not drawn
+		are moved out of their batch, and return to their original depth
+		once they are drawn again.
+
 		Attributes:
 			viwport (:class:`viewport.Viewport`): The viewport that the layers will be viewed through.
 			layers (dict): A dictionary of layers in the form layer_title: layer_object.
+			physics_world (:class:`game.physical_objects.physics_world.PhysicsWorld`): The physics world integrating the motion of objects which are not layers, such as NPCs.
+			draw_calls (int): The number of draw calls issued by the last draw.
+			suspended (bool): Whether the layer manager has been suspended and will not update its layers.
 		"""
 
-		def __init__(self, viewport, layers):
+		def __init__(self, viewport, layers, cache_static_layers=True, simulation_lod=True):
 				"""Begins managing the given layers.
 
 				Args:
 					viwport (:class:`viewport.Viewport`): The viewport that the layers will be viewed through.
 					layers (list of :class:`game.layers.BaseLayer`): The layers to maintain, with the highest index being the top foreground layer and the first index being the bottom background layer.
+
+				Kwargs:
+					cache_static_layers (bool): Whether to cache the bottom run of static layers offscreen.
+					simulation_lod (bool): Whether to simulate objects in the physics world less often the further they are from the viewport.
 				"""
 				self.viewport = viewport
 				self.layers = {}
+				self.physics_world = PhysicsWorld()
+
+				if simulation_lod:
+					self.physics_world.simulation_lod = SimulationLOD(viewport)
 
 				self._drawing_queue = []
+				self._batch_layers = {} # The layers drawn by each batch in the drawing queue
+				self._layer_batches = {} # The batch in the drawing queue of each batched layer
+				self._target_layer = None
+
+				self._static_layer_cache = None
+				if cache_static_layers and StaticLayerCache.is_supported():
+					self._static_layer_cache = StaticLayerCache(viewport.width, viewport.height)
+
+				# The static run in the cache and on the last frame, as (drawing queue entries, viewport position)
+				self._cached_run = None
+				self._previous_run = None
 
 				self._update_queue = []
+				self._interpolated_layers = []
+				self._interpolated_objects = [] # Objects drawn between their positions on the last frame
+
+				self._hidden_layers = set()
+				self._suspended_layers = set()
+				self._undrawn_batch = Batch() # Holds the graphics of batched layers which aren't drawn, but is never drawn itself
 				self._depth = 0 # Used for setting draw order with OrderedGroups
+				self._groups = {} # Ordered groups in use, as depth: group
+				self._layer_depths = {} # The depth of each batched layer
+
+				self.draw_calls = 0
+				self.suspended = False
 
 				# Begin managing the layers
 				map(self.manage_layer, layers)
@@ -42,15 +87,317 @@ class LayerManager(object):
 				Args:
 						dt (float): The number of seconds since the last update.
 				"""
-				self.viewport.target.update(dt)
+				if self.suspended:
+					return
+
+				suspended_layers = self._suspended_layers
+
+				# Updated layers report whether this update changed them
+				for layer in self._update_queue:
+					layer.dirty = False
+
+				if not self._target_layer in suspended_layers:
+					self.viewport.target.update(dt)
+
 				self.viewport.update(dt)
-				map(lambda item: item.update(dt), self._update_queue)
+
+				for layer in self._update_queue:
+					if not layer in suspended_layers:
+						layer.update(dt)
+
+				self.physics_world.update(dt)
+
+				# The viewport target is updated directly, so assume it changed
+				if self._target_layer:
+					self._target_layer.dirty = True
+
+				if self._cached_run and self._is_run_dirty(self._cached_run[0]):
+					self._cached_run = None
+
+
+		def store_previous_positions(self):
+				"""Stores the positions of the viewport and moving objects before a simulation step.
+
+				This should be called before each fixed step of the simulation,
+				so that :func:`interpolate` can draw between the positions
+				before and after the last step.
+				"""
+				self.viewport.store_previous_position()
+				self.viewport.target.store_previous_position()
+				for obj in self.physics_world.objects:
+					obj.store_previous_position()
+
+
+		def interpolate(self, alpha):
+				"""Draws the viewport and moving objects between their previous and current positions.
+
+				Positions are not changed, so the simulation is unaffected.
+				Only objects which were stepped and moved by the last update
+				are interpolated, so sleeping, frozen and resting objects
+				cost nothing to draw.
+
+				Args:
+						alpha (float): How far between the previous and current positions to draw, from 0 to 1.
+				"""
+				self.viewport.interpolate(alpha)
+				self.viewport.target.interpolate(alpha)
+
+				physics_world = self.physics_world
+				sleeping = physics_world._state['sleeping']
+				step_dt = physics_world._state['step_dt']
+
+				interpolated_objects = []
+				interpolated_indices = set()
+
+				for index, obj in enumerate(physics_world.objects):
+					if step_dt[index] and not sleeping[index] and obj.has_moved():
+						obj.interpolate(alpha)
+						interpolated_objects.append(obj)
+						interpolated_indices.add(index)
+
+				# Objects which have stopped moving are drawn at their positions again
+				for obj in self._interpolated_objects:
+					if obj.physics_world is physics_world and not obj.physics_index in interpolated_indices:
+						obj.update_sprite_position()
+
+				self._interpolated_objects = interpolated_objects
+
+				for layer in self._interpolated_layers:
+					layer.interpolate(alpha)
+
+
+		def suspend(self, compact=False):
+				"""Stops updating all layers, such as while a sub-level is running.
+
+				Graphics remain loaded so the layers can be resumed instantly.
+
+				Kwargs:
+						compact (bool): Whether to release data which the layers can recreate once they are resumed.
+				"""
+				self.suspended = True
+
+				if compact:
+					self.compact()
+
+
+		def resume(self):
+				"""Resumes updating layers after the layer manager was suspended."""
+				self.suspended = False
+
+
+		def compact(self):
+				"""Releases data which the layers can recreate when they are next updated.
+
+				Graphics which support compaction, such as chunked tile maps,
+				are compacted, and the static layer cache is invalidated.
+				"""
+				for layer in self.layers.itervalues():
+					if hasattr(layer.graphic, 'compact'):
+						layer.graphic.compact()
+
+				self._cached_run = None
+				self._previous_run = None
+
+
+		def hide_layer(self, layer_title):
+				"""Stops drawing a layer, although it is still updated.
+
+				Args:
+						layer_title (str): The title of the layer to hide.
+				"""
+				layer = self.layers[layer_title]
+				self._hidden_layers.add(layer)
+				self._set_layer_drawn(layer)
+
+
+		def show_layer(self, layer_title):
+				"""Resumes drawing a hidden layer.
+
+				Args:
+						layer_title (str): The title of the layer to show.
+				"""
+				layer = self.layers[layer_title]
+				self._hidden_layers.discard(layer)
+				self._set_layer_drawn(layer)
+
+
+		def suspend_layer(self, layer_title):
+				"""Stops drawing and updating a layer.
+
+				Args:
+						layer_title (str): The title of the layer to suspend.
+				"""
+				layer = self.layers[layer_title]
+				self._suspended_layers.add(layer)
+				self._set_layer_drawn(layer)
+
+
+		def resume_layer(self, layer_title):
+				"""Resumes drawing and updating a suspended layer.
+
+				The layer will remain hidden if it was hidden before it was suspended.
+
+				Args:
+						layer_title (str): The title of the layer to resume.
+				"""
+				layer = self.layers[layer_title]
+				self._suspended_layers.discard(layer)
+				self._set_layer_drawn(layer)
+
+
+		def _is_layer_drawn(self, layer):
+				"""Returns whether a layer is neither hidden nor suspended.
+
+				Args:
+						layer (:class:`game.layers.BaseLayer`): The layer to check.
+
+				Returns:
+						True if the layer is drawn, False otherwise.
+				"""
+				return not (layer in self._hidden_layers or layer in self._suspended_layers)
+
+
+		def _set_layer_drawn(self, layer):
+				"""Moves a batched layer into or out of its batch, depending on whether it is drawn.
+
+				The layer keeps its group, so it returns to its original depth.
+
+				Args:
+						layer (:class:`game.layers.BaseLayer`): The layer which was hidden, shown, suspended, or resumed.
+				"""
+				# Hidden and shown layers change what the cached layers look like
+				layer.dirty = True
+				self._cached_run = None
+
+				if layer in self._layer_batches:
+					batch = self._layer_batches[layer] if self._is_layer_drawn(layer) else self._undrawn_batch
+
+					if not layer.batch is batch:
+						layer.batch = batch
 
 
 		def draw(self):
 				"""Draws all managed layers in the specified order."""
 				self.viewport.focus()
-				map(lambda item: item.draw(), self._drawing_queue)
+
+				cached_count = 0
+				if self._static_layer_cache:
+					cached_count = self._draw_static_layer_cache()
+
+				drawn_entries = self._get_drawn_entries(self._drawing_queue[cached_count:])
+				map(lambda item: item.draw(), drawn_entries)
+
+				self.draw_calls = int(cached_count > 0) + sum(map(self._get_draw_calls, drawn_entries))
+
+				# Layers which aren't updated stay clean until they're changed
+				for layer in self.layers.itervalues():
+					if not (layer in self._update_queue or layer is self._target_layer):
+						layer.dirty = False
+
+
+		def _draw_static_layer_cache(self):
+				"""Draws the cached run of static layers, caching it first if it has been unchanged for a frame.
+
+				Returns:
+						The number of drawing queue entries which were drawn from the cache.
+				"""
+				run = self._get_static_run()
+				if not run:
+					self._previous_run = None
+					return 0
+
+				# Fixed layers are drawn in the same place wherever the viewport is
+				if all(isinstance(layer, FixedLayer) for entry in run for layer in self._get_entry_layers(entry)):
+					static_run = (run, None)
+				else:
+					static_run = (run, self.viewport.get_interpolated_position())
+
+				if self._cached_run != static_run and self._previous_run == static_run:
+					self._static_layer_cache.render(lambda: map(lambda item: item.draw(), self._get_drawn_entries(run)))
+					self._cached_run = static_run
+
+				self._previous_run = static_run
+
+				if self._cached_run != static_run:
+					return 0
+
+				x, y = self.viewport.get_interpolated_position()
+				self._static_layer_cache.blit(x, y)
+
+				return len(run)
+
+
+		def _get_drawn_entries(self, entries):
+				"""Returns the drawing queue entries which are not hidden layers.
+
+				Args:
+						entries (list): Batches and layers from the drawing queue.
+
+				Returns:
+						A list of the batches and layers to draw.
+				"""
+				if not (self._hidden_layers or self._suspended_layers):
+					return entries
+
+				return [entry for entry in entries if isinstance(entry, Batch) or self._is_layer_drawn(entry)]
+
+
+		def _get_static_run(self):
+				"""Returns the entries at the bottom of the drawing queue whose layers are all clean.
+
+				Returns:
+						A list of batches and layers from the drawing queue.
+				"""
+				for index, entry in enumerate(self._drawing_queue):
+					if self._is_run_dirty([entry]):
+						return self._drawing_queue[:index]
+
+				return self._drawing_queue[:]
+
+
+		def _is_run_dirty(self, entries):
+				"""Returns whether any layer drawn by drawing queue entries is dirty.
+
+				Args:
+						entries (list): Batches and layers from the drawing queue.
+
+				Returns:
+						True if a layer is dirty, False otherwise.
+				"""
+				return any(layer.dirty and self._is_layer_drawn(layer) for entry in entries for layer in self._get_entry_layers(entry))
+
+
+		def _get_draw_calls(self, entry):
+				"""Returns the number of draw calls issued when drawing an entry in the drawing queue.
+
+				Batches issue a draw call for each vertex domain in each group,
+				and layers which draw themselves are counted as one draw call.
+
+				Args:
+						entry: A batch or layer from the drawing queue.
+
+				Returns:
+						The number of draw calls as an int.
+				"""
+				if isinstance(entry, Batch):
+					return sum(len([domain for domain in domain_map.itervalues() if not domain._is_empty()]) for domain_map in entry.group_map.itervalues())
+
+				return 1
+
+
+		def _get_entry_layers(self, entry):
+				"""Returns the layers drawn by an entry in the drawing queue.
+
+				Args:
+						entry: A batch or layer from the drawing queue.
+
+				Returns:
+						A list of :class:`game.layers.BaseLayer` objects.
+				"""
+				if isinstance(entry, Batch):
+					return self._batch_layers[entry]
+
+				return [entry]
 
 
 		def manage_layer(self, layer):
@@ -62,6 +409,9 @@ class LayerManager(object):
 				self.layers[layer.title] = layer
 				layer.viewport = self.viewport
 
+				# Layers may have been added to a cached batch
+				self._cached_run = None
+
 				self._append_to_drawing_queue(layer)
 				self._push_layer_event_handlers(layer)
 
@@ -70,6 +420,13 @@ class LayerManager(object):
 				if hasattr(layer, 'update') and not layer.graphic is self.viewport.target:
 					self._update_queue.append(layer)
 
+				if layer.graphic is self.viewport.target:
+					self._target_layer = layer
+
+				# Fixed layers follow the viewport while it is interpolated
+				if hasattr(layer, 'interpolate'):
+					self._interpolated_layers.append(layer)
+
 
 		def _get_current_graphics_batch(self):
 				"""Returns the batch at the top of the drawing queue.
@@ -90,7 +447,10 @@ class LayerManager(object):
 				Returns:
 						:class:`pyglet.graphics.OrderedGroup`.
 				"""
-				group = OrderedGroup(self._depth)
+				group = self._groups.get(self._depth)
+				if group is None:
+					group = self._groups[self._depth] = OrderedGroup(self._depth)
+
 				self._depth += 1 # Render the next layer at the next depth
 
 				return group
@@ -109,8 +469,12 @@ class LayerManager(object):
 				"""
 				# Add the layer to the current batch if it supports batches
 				if hasattr(layer, 'batch'):
-						layer.batch = self._get_current_graphics_batch()
+						batch = self._get_current_graphics_batch()
+						layer.batch = batch
+						self._layer_depths[layer] = self._depth
 						layer.group = self._get_current_graphics_group()
+						self._batch_layers.setdefault(batch, []).append(layer)
+						self._layer_batches[layer] = batch
 				# The layer should draw itself if it doesn't support batches
 				else:
 						self._drawing_queue.append(layer)
@@ -139,9 +503,88 @@ class LayerManager(object):
 				if layer in self._update_queue:
 					self._update_queue.remove(layer)
 
-				# TODO If this was the last thing in its batch/group, delete the group
-				if layer in self._drawing_queue:
-					self._drawing_queue.remove(layer)
+				if layer in self._interpolated_layers:
+					self._interpolated_layers.remove(layer)
+
+				if layer is self._target_layer:
+					self._target_layer = None
+
+				if self.layers.get(layer.title) is layer:
+					del self.layers[layer.title]
+
+				self._hidden_layers.discard(layer)
+				self._suspended_layers.discard(layer)
+
+				self._cached_run = None
+				self._previous_run = None
+
+				if layer in self._layer_depths:
+					self._free_graphics_group(self._layer_depths.pop(layer))
+
+				# Remove the layer, or its batch if the layer was the last in it
+				entry = self._layer_batches.pop(layer, layer)
+
+				if not entry in self._drawing_queue:
+					return
+
+				if isinstance(entry, Batch):
+					self._batch_layers[entry].remove(layer)
+
+					if self._batch_layers[entry]:
+						return
+
+					del self._batch_layers[entry]
+
+				index = self._drawing_queue.index(entry)
+				del self._drawing_queue[index]
+				self._coalesce_batches(index)
+
+
+		def _free_graphics_group(self, depth):
+				"""Frees the ordered group at a depth once no layer is using it.
+
+				If the topmost depths are no longer in use, they will be
+				reused by the next layers to be managed.
+
+				Args:
+						depth (int): The depth of the group to free.
+				"""
+				del self._groups[depth]
+
+				while self._depth > 0 and not self._depth - 1 in self._groups:
+					self._depth -= 1
+
+
+		def _coalesce_batches(self, index):
+				"""Merges the batches adjacent to a removed drawing queue entry.
+
+				The batch with less layers is merged into the batch with more,
+				and layers keep their draw order because each layer in a batch
+				is drawn at its own depth.
+
+				Args:
+						index (int): The index in the drawing queue of the removed entry.
+				"""
+				if index == 0 or index >= len(self._drawing_queue):
+					return
+
+				first = self._drawing_queue[index - 1]
+				second = self._drawing_queue[index]
+
+				if not (isinstance(first, Batch) and isinstance(second, Batch)):
+					return
+
+				if len(self._batch_layers[first]) >= len(self._batch_layers[second]):
+					larger, smaller = first, second
+				else:
+					larger, smaller = second, first
+
+				for layer in self._batch_layers[smaller]:
+					self._layer_batches[layer] = larger
+
+					# Layers which aren't drawn join the batch once they are drawn again
+					if self._is_layer_drawn(layer):
+						layer.batch = larger
 
-				# TODO Coalesce batches if necessary
-				# TODO Whichever batch has less items in it should be merged into the batch with more
+				self._batch_layers[larger].extend(self._batch_layers.pop(smaller))
+				self._drawing_queue[index - 1:index + 1] = [larger]
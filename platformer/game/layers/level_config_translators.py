@@ -3,15 +3,17 @@ from game.load.level import Level
 # Dictionary of layers and their layer graphic dependencies
 _layer_graphic_dependencies = {}
 
-def _layer_dependencies_met(layer_title):
-	"""Returns True if the given layer has had its dependencies met, or False otherwise.
+def _get_layer_dependencies(layer_title):
+	"""Returns the titles of the layers whose graphics the given layer depends on.
 
 	Args:
-	layer_title (str): The name of the layer to check the dependencies of.
+	layer_title (str): The name of the layer to get the dependencies of.
 	"""
-	if layer_title in _layer_graphic_dependencies:
-		return reduce(lambda x,y: x and (y in Level.current_processed_layers), _layer_graphic_dependencies[layer_title], True)
-	return True
+	return _layer_graphic_dependencies.get(layer_title, [])
+
+def _clear_layer_dependencies():
+	"""Forgets the layer graphic dependencies of the level being loaded."""
+	_layer_graphic_dependencies.clear()
 
 def _register_layer_graphic_dependency(property_name):
 	"""Marks the currently processed layer as depending on the graphic from another layer.
@@ -39,13 +41,18 @@ def _get_layer_graphic_property(property_name):
 	"""Returns the specified layer graphic property. This must be done during post-processing."""
 	split = property_name.find('.')
 
-	# If there's no dot, the property is the actual graphic object
+	# If there was no dot, the property_name is the layer title
 	if split < 0:
-		return Level.current_processed_layers[property_name].graphic
+		layer_title = property_name
+	else:
+		layer_title = property_name[ : split]
 
-	layer_title = property_name[ : split]
+	# Remove the layer from the list of layer dependencies, so it is not a dependency when loading another level
+	if Level.current_processing_layer in _layer_graphic_dependencies:
+		_layer_graphic_dependencies[Level.current_processing_layer].remove(layer_title)
 
-	# Remove the layer from the list of layer dependencies
-	_layer_graphic_dependencies[Level.current_processing_layer].remove(layer_title)
+	# If there's no dot, the property is the actual graphic object
+	if split < 0:
+		return Level.current_processed_layers[layer_title].graphic
 
 	return getattr(Level.current_processed_layers[layer_title].graphic, property_name[split + 1 : ])
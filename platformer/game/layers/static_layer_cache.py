@@ -0,0 +1,108 @@
+from ctypes import byref
+from pyglet.gl import gl_info, glGenFramebuffersEXT, glBindFramebufferEXT, glFramebufferTexture2DEXT, glDeleteFramebuffersEXT, glGetIntegerv, glGetFloatv, glViewport, glClearColor, glClear, glBlendFuncSeparate, GLint, GLuint, GLfloat
+from pyglet.gl import GL_FRAMEBUFFER_EXT, GL_COLOR_ATTACHMENT0_EXT, GL_COLOR_BUFFER_BIT, GL_VIEWPORT, GL_COLOR_CLEAR_VALUE, GL_BLEND_SRC_RGB, GL_BLEND_DST_RGB, GL_BLEND_SRC_ALPHA, GL_BLEND_DST_ALPHA, GL_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA
+from pyglet.image import Texture
+
+class StaticLayerCache(object):
+	"""An offscreen framebuffer texture holding the composited contents of static layers.
+
+	Layers are drawn into the cache with the current projection, so the
+	cache must be blitted at the position of the viewport that the
+	layers were drawn through.
+
+	The cache holds premultiplied alpha, so translucent layers look the
+	same whether they are drawn from the cache or drawn directly. Groups
+	which set their own blend function while drawing, such as sprite
+	groups, only keep the correct alpha where the cache is opaque.
+
+	Attributes:
+		texture (:class:`pyglet.image.Texture`): The texture which the layers are drawn into.
+	"""
+
+	def __init__(self, width, height):
+		"""Creates a cache for a viewport of the given size.
+
+		Args:
+			width (int): The width of the viewport, in pixels.
+			height (int): The height of the viewport, in pixels.
+		"""
+		self.texture = Texture.create(width, height)
+
+		self._framebuffer = GLuint()
+		glGenFramebuffersEXT(1, byref(self._framebuffer))
+
+		glBindFramebufferEXT(GL_FRAMEBUFFER_EXT, self._framebuffer)
+		glFramebufferTexture2DEXT(GL_FRAMEBUFFER_EXT, GL_COLOR_ATTACHMENT0_EXT, self.texture.target, self.texture.id, 0)
+		glBindFramebufferEXT(GL_FRAMEBUFFER_EXT, 0)
+
+	@staticmethod
+	def is_supported():
+		"""Returns whether offscreen framebuffers are supported by the current context.
+
+		Returns:
+			True if a cache can be created, False otherwise.
+		"""
+		return gl_info.have_context() and gl_info.have_extension('GL_EXT_framebuffer_object')
+
+	def render(self, draw):
+		"""Replaces the contents of the cache.
+
+		Args:
+			draw (function): A function which draws the layers to cache.
+		"""
+		window_viewport = (GLint * 4)()
+		glGetIntegerv(GL_VIEWPORT, window_viewport)
+
+		clear_color = (GLfloat * 4)()
+		glGetFloatv(GL_COLOR_CLEAR_VALUE, clear_color)
+
+		blend_func = self._get_blend_func()
+
+		glBindFramebufferEXT(GL_FRAMEBUFFER_EXT, self._framebuffer)
+		glViewport(0, 0, self.texture.width, self.texture.height)
+		glClearColor(0, 0, 0, 0)
+		glClear(GL_COLOR_BUFFER_BIT)
+
+		# Blending the alpha channel additively leaves the colour premultiplied by the coverage
+		glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+
+		draw()
+
+		glBindFramebufferEXT(GL_FRAMEBUFFER_EXT, 0)
+		glViewport(*window_viewport)
+		glClearColor(*clear_color)
+		glBlendFuncSeparate(*blend_func)
+
+	@staticmethod
+	def _get_blend_func():
+		"""Returns the current blend function.
+
+		Returns:
+			The source and destination colour factors followed by the source and destination alpha factors, as a tuple.
+		"""
+		blend_func = []
+		for parameter in (GL_BLEND_SRC_RGB, GL_BLEND_DST_RGB, GL_BLEND_SRC_ALPHA, GL_BLEND_DST_ALPHA):
+			factor = GLint()
+			glGetIntegerv(parameter, factor)
+			blend_func.append(factor.value)
+
+		return tuple(blend_func)
+
+	def blit(self, x, y):
+		"""Draws the contents of the cache.
+
+		Args:
+			x (float): The x coordinate of the viewport that the layers were drawn through.
+			y (float): The y coordinate of the viewport that the layers were drawn through.
+		"""
+		blend_func = self._get_blend_func()
+
+		# The cached colour is already premultiplied by its alpha
+		glBlendFuncSeparate(GL_ONE, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+		self.texture.blit(x, y)
+		glBlendFuncSeparate(*blend_func)
+
+	def delete(self):
+		"""Deletes the framebuffer and its texture."""
+		glDeleteFramebuffersEXT(1, byref(self._framebuffer))
+		self.texture.delete()
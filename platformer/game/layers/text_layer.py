@@ -42,6 +42,7 @@ class TextLayer(StaticTextLayer):
 			dt (float): The number of seconds that elapsed between the last update.
 		"""
 		self.graphic.update(dt)
+		self.dirty = True
 
 
 
@@ -73,6 +74,7 @@ class FixedTextLayer(FixedStaticTextLayer):
 	def update(self, dt):
 		super(FixedTextLayer, self).update(dt)
 		self.graphic.update(dt)
+		self.dirty = True
 
 
 def recognizer(graphic):
@@ -5,7 +5,11 @@ class TileMapLayer(GraphicsLayer):
 	"""A layer which contains a :class:`game.tiles.TileMap`."""
 
 	def update(self, dt):
-		"""Sets the visible region of the map to the viewport's region."""
+		"""Sets the visible region of the map to the viewport's region.
+
+		The map's contents only move with the viewport, so the layer is
+		not made dirty.
+		"""
 		self.graphic.set_visible_region(self.viewport.x, self.viewport.y, self.viewport.width, self.viewport.height)
 
 # TODO Subclass with FixedGraphicsLayer for a fixed tile map layer
@@ -0,0 +1,19 @@
+from graphics_layer import StaticGraphicsLayer
+from ..tiles import VertexTileMap
+
+class VertexTileMapLayer(StaticGraphicsLayer):
+	"""A layer which contains a :class:`game.tiles.VertexTileMap`.
+
+	Because the tile map is baked into vertex lists, the layer never
+	needs to be updated.
+	"""
+
+
+
+def recognizer(graphic):
+	"""Recognizes whether this layer type supports the graphics object."""
+	return isinstance(graphic, VertexTileMap)
+
+def factory(**kwargs):
+	"""Returns the proper class for the given layer properties."""
+	return VertexTileMapLayer
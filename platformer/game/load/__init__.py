@@ -6,3 +6,5 @@ from player import *
 # TODO The lines below this one are fine, the ones above aren't so great
 
 from level import Level
+from level_preloader import LevelPreloader
+from level_stack import LevelStack
@@ -3,13 +3,13 @@ from game import bestiary, util
 
 class Characters():
 
-	def __init__(self, character_data, stage):
+	def __init__(self, character_data, stage, physics_world=None):
 		self.batch = pyglet.graphics.Batch()
 		self.characters = []
 
 		# Create a list of all character data
 		for name, tile in character_data.items():
-		   self.characters.append(single_character(name, tile['x'], tile['y'], stage, self.batch))
+		   self.characters.append(single_character(name, tile['x'], tile['y'], stage, self.batch, physics_world))
 
 	# Returns a list of all characters
 	def get_characters(self):
@@ -23,7 +23,8 @@ class Characters():
 
 # Loads a single character based on their bestiary name, tile coordinates, and graphics batch
 # TODO tile_x and tile_y should be kwargs
-def single_character(name, tile_x, tile_y, stage, batch=None):
+# If a physics world is given, the character's motion will be integrated by it
+def single_character(name, tile_x, tile_y, stage, batch=None, physics_world=None):
 	# Get our character data from the bestiary
 	character_data = bestiary.look_up[name].copy()
 	character_class = character_data['class']
@@ -35,4 +36,9 @@ def single_character(name, tile_x, tile_y, stage, batch=None):
 	coordinates = util.tile_to_coordinate(tile_x, tile_y)
 	character_data['x'], character_data['y'] = coordinates[0], coordinates[1]
 
-	return character_class(batch=batch, stage=stage, **character_data)
+	character = character_class(batch=batch, stage=stage, **character_data)
+
+	if physics_world is not None:
+		physics_world.register(character)
+
+	return character
@@ -0,0 +1,245 @@
+import marshal
+import mmap
+import os
+import struct
+import sys
+import pyglet.resource
+from array import array
+from json import load as json_load
+from pyglet.resource import file as open_resource_file, ResourceNotFoundException
+from tile_map import load_tile_map
+from ..settings.general_settings import LEVEL_DIRECTORY, LEVEL_FORMAT, MAP_DIRECTORY, MAP_FORMAT, COMPILED_LEVEL_DIRECTORY, COMPILED_LEVEL_FORMAT
+
+"""Compiles level configs into a binary format which can be loaded without parsing.
+
+A compiled level file begins with a header of the magic string
+``PLVL``, the format version as a uint16, and the length of the
+manifest as a uint32, all little-endian. The manifest follows as a
+:mod:`marshal` encoded dict, containing the level config, the
+location of each tile map in the file, and the modification time of
+the level config and tile map files it was compiled from. Tile maps are stored after the
+manifest as row-major uint16 tile values, already flipped so that row 0
+is the bottom of the map.
+
+Tile maps referenced by ``::tilemap::`` tags are resolved when the level
+is compiled. All other tags depend on objects which only exist while
+the game is running, so they are left for the level loader to translate.
+
+Compiled levels whose level config or tile maps have been modified since
+they were compiled are stale, and are not loaded.
+"""
+
+_HEADER = struct.Struct('<4sHI')
+_MAGIC = 'PLVL'
+_VERSION = 2
+
+_TILE_MAP_TAG = '::tilemap::'
+_TILE_VALUE_SIZE = array('H').itemsize
+
+def _get_compiled_level_name(level_title):
+	"""Returns the resource name of a compiled level file.
+
+	Args:
+		level_title (str): The title of the level.
+
+	Returns:
+		The resource name of the compiled level as a string.
+	"""
+	return COMPILED_LEVEL_DIRECTORY+'/'+level_title+'.'+COMPILED_LEVEL_FORMAT
+
+def _get_modified_time(resource_name):
+	"""Returns the modification time of a resource file.
+
+	Args:
+		resource_name (str): The name of the resource.
+
+	Returns:
+		The modification time of the resource as a float, or None if the resource does not exist or is not a file on disk.
+	"""
+	try:
+		location = pyglet.resource.location(resource_name)
+	except ResourceNotFoundException:
+		return None
+
+	# Resources in zip files have no modification time of their own
+	if not hasattr(location, 'path'):
+		return None
+
+	return os.path.getmtime(os.path.join(location.path, resource_name))
+
+def _find_tagged_values(data_value, tag, path=()):
+	"""Finds the values with a tag in level config data.
+
+	Only values tagged solely with the given tag are returned, since
+	chained tags would need to be translated while the game is running.
+
+	Args:
+		data_value: The level config data to search.
+		tag (str): The tag to search for, such as ``'::tilemap::'``.
+
+	Kwargs:
+		path (tuple): The keys and indices leading to ``data_value``.
+
+	Returns:
+		A list of ``(path, value)`` tuples for each tagged value, where ``value`` has the tag removed.
+	"""
+	if isinstance(data_value, basestring):
+		if data_value.startswith(tag) and not '::' in data_value[len(tag):]:
+			return [(path, data_value[len(tag):])]
+	elif isinstance(data_value, list):
+		return sum([_find_tagged_values(value, tag, path + (index,)) for index, value in enumerate(data_value)], [])
+	elif isinstance(data_value, dict):
+		return sum([_find_tagged_values(value, tag, path + (key,)) for key, value in data_value.iteritems()], [])
+
+	return []
+
+def _set_data_value(data, path, data_value):
+	"""Replaces a value in level config data.
+
+	Args:
+		data: The level config data to update.
+		path (tuple): The keys and indices leading to the value to replace.
+		data_value: The new value.
+	"""
+	for key in path[:-1]:
+		data = data[key]
+
+	data[path[-1]] = data_value
+
+def compile_level(level_title):
+	"""Compiles a level config and its tile maps into a binary level file.
+
+	The compiled level is written to the compiled level directory
+	alongside the level config, where it will be found by
+	:func:`load_compiled_level`. Levels must be recompiled whenever
+	their config or tile maps change, or the level config will be
+	loaded instead.
+
+	Args:
+		level_title (str): The title of the level to compile.
+
+	Returns:
+		The path of the compiled level file as a string.
+	"""
+	level_name = LEVEL_DIRECTORY+'/'+level_title+'.'+LEVEL_FORMAT
+
+	level_file = open_resource_file(level_name)
+	level_data = json_load(level_file)
+	level_file.close()
+
+	sources = {level_name: _get_modified_time(level_name)}
+
+	tile_maps = []
+	tile_data = array('H')
+
+	for path, map_name in _find_tagged_values(level_data, _TILE_MAP_TAG):
+		map_resource_name = MAP_DIRECTORY+'/'+map_name+'.'+MAP_FORMAT
+		sources[map_resource_name] = _get_modified_time(map_resource_name)
+
+		tile_map = load_tile_map(map_name)
+		rows = len(tile_map)
+		cols = len(tile_map[0])
+
+		# Offsets are relative to the start of the tile data
+		tile_maps.append((path, rows, cols, len(tile_data) * _TILE_VALUE_SIZE))
+
+		for row in tile_map:
+			tile_data.extend(row)
+
+		_set_data_value(level_data, path, None)
+
+	if sys.byteorder != 'little':
+		tile_data.byteswap()
+
+	manifest = marshal.dumps({'level': level_data, 'tile_maps': tile_maps, 'sources': sources})
+
+	# Align the tile data to its value size
+	padding = '\0' * (-(_HEADER.size + len(manifest)) % _TILE_VALUE_SIZE)
+
+	compiled_path = os.path.join(pyglet.resource.location(level_name).path, COMPILED_LEVEL_DIRECTORY)
+	if not os.path.isdir(compiled_path):
+		os.makedirs(compiled_path)
+
+	compiled_path = os.path.join(compiled_path, level_title+'.'+COMPILED_LEVEL_FORMAT)
+	with open(compiled_path, 'wb') as compiled_file:
+		compiled_file.write(_HEADER.pack(_MAGIC, _VERSION, len(manifest)))
+		compiled_file.write(manifest)
+		compiled_file.write(padding)
+		compiled_file.write(tile_data.tostring())
+
+	# Make the compiled level available as a resource
+	pyglet.resource.reindex()
+
+	return compiled_path
+
+def load_compiled_level(level_title):
+	"""Loads the config of a compiled level.
+
+	The compiled file is memory-mapped, so only the manifest is decoded
+	and each row of each tile map is copied directly into an array.
+
+	Sources which no longer exist, such as when only compiled levels
+	are distributed, are not checked for modifications.
+
+	Args:
+		level_title (str): The title of the level to load.
+
+	Returns:
+		A dict of level parameters, with tile maps as lists of ``array('H')`` rows.
+
+	Raises:
+		pyglet.resource.ResourceNotFoundException: If the level has not been compiled.
+		ValueError: If the file is not a compiled level of the current version, or its sources have been modified since it was compiled.
+	"""
+	level_file = open_resource_file(_get_compiled_level_name(level_title), 'rb')
+	try:
+		mapped_file = mmap.mmap(level_file.fileno(), 0, access=mmap.ACCESS_READ)
+	finally:
+		level_file.close()
+
+	try:
+		if len(mapped_file) < _HEADER.size:
+			raise ValueError("Compiled level '{0}' is truncated".format(level_title))
+
+		magic, version, manifest_length = _HEADER.unpack_from(mapped_file)
+
+		if magic != _MAGIC or version != _VERSION:
+			raise ValueError("Compiled level '{0}' is not a version {1} compiled level".format(level_title, _VERSION))
+
+		try:
+			manifest = marshal.loads(mapped_file[_HEADER.size:_HEADER.size+manifest_length])
+		except (EOFError, TypeError, ValueError):
+			raise ValueError("Compiled level '{0}' has a corrupt manifest".format(level_title))
+
+		for source_name, modified_time in manifest['sources'].iteritems():
+			if _get_modified_time(source_name) not in (None, modified_time):
+				raise ValueError("Compiled level '{0}' is stale, since '{1}' has been modified".format(level_title, source_name))
+
+		level_data = manifest['level']
+
+		tile_data_start = _HEADER.size + manifest_length
+		tile_data_start += -tile_data_start % _TILE_VALUE_SIZE
+
+		for path, rows, cols, offset in manifest['tile_maps']:
+			row_size = cols * _TILE_VALUE_SIZE
+			row_start = tile_data_start + offset
+			tile_map = []
+
+			if row_start + rows * row_size > len(mapped_file):
+				raise ValueError("Compiled level '{0}' is truncated".format(level_title))
+
+			for y in xrange(rows):
+				row = array('H')
+				row.fromstring(mapped_file[row_start:row_start+row_size])
+
+				if sys.byteorder != 'little':
+					row.byteswap()
+
+				tile_map.append(row)
+				row_start += row_size
+
+			_set_data_value(level_data, path, tile_map)
+	finally:
+		mapped_file.close()
+
+	return level_data
@@ -1,17 +1,29 @@
 import glob
 import os
+from collections import deque
 
 # Dictionary of tags and translation functions to apply to config data values
 _installed_translators = {}
 _installed_translators_post = {} # For post-processing
 _enabled_translators = _installed_translators # The translators that are currently enabled
 
-# List of tests to confirm that a layer is ready for translation in post-processing
-_installed_translation_readiness_tests = []
+# List of functions which return the titles of the layers that a layer depends on in post-processing
+_installed_dependency_getters = []
+
+# List of functions which reset the state kept by translators while a level is loaded
+_installed_state_resetters = []
 
 _data_value_tag_prefix = '::'
 _data_value_tag_suffix = '::'
 
+# Characters which could form a tag when a translated string is joined with the rest of a data value
+_data_value_tag_characters = frozenset(_data_value_tag_prefix + _data_value_tag_suffix)
+
+# Cached translation plans for tagged strings, as data_value: plan
+_translation_plans = {}
+_translation_plans_post = {} # For post-processing
+_enabled_translation_plans = _translation_plans # The plans for the currently enabled translators
+
 def install_translator(data_type, translator, post=False):
 	"""Adds support for translating data strings to other data types when loading
 	a level config. All string values tagged with the given data type will be
@@ -33,24 +45,46 @@ def install_translator(data_type, translator, post=False):
 	else:
 		_installed_translators[data_type] = translator
 
-def install_readiness_test(test_function):
-	"""Adds the given test function to the list of tests to determine if a layer is ready
-	for translation. The test function should accept the title of the layer to test.
+	# Cached plans may not include the new translator
+	_translation_plans.clear()
+	_translation_plans_post.clear()
+
+def install_dependency_getter(getter):
+	"""Adds the given function to the list of functions which determine the layers that
+	a layer depends on. Dependencies are processed before the layers which depend on them.
+
+	Args:
+		getter (function): The function returning the dependencies. This should accept the title
+		                   of the layer as a string argument and return a list of layer titles.
+	"""
+	global _installed_dependency_getters
+
+	_installed_dependency_getters.append(getter)
+
+def install_state_resetter(resetter):
+	"""Adds the given function to the list of functions which reset the state kept by
+	translators while a level is loaded. These are called by :func:`reset_state` once
+	a level has finished loading, or has failed to load.
 
 	Args:
-		test_function (function): The test function. This should accept the title of the
-		                          layer as a string argument.
+		resetter (function): The function resetting the state. This should accept no arguments.
 	"""
-	global _installed_translation_readiness_tests
+	global _installed_state_resetters
 
-	_installed_translation_readiness_tests.append(test_function)
+	_installed_state_resetters.append(resetter)
+
+def reset_state():
+	"""Resets the state kept by translators, so another level can be loaded."""
+	for resetter in _installed_state_resetters:
+		resetter()
 
 def enable_post_processing():
 	"""Enables post-processing translators."""
-	global _installed_translators_post, _enabled_translators
+	global _installed_translators_post, _enabled_translators, _enabled_translation_plans
 
 	_installed_translators_post = dict(_installed_translators.items() + _installed_translators_post.items())
 	_enabled_translators = _installed_translators_post
+	_enabled_translation_plans = _translation_plans_post
 	"""
 	Python 3:
 	_installed_translators = dict(_installed_translators.items() + _installed_translators_post.items())
@@ -58,9 +92,111 @@ def enable_post_processing():
 
 def disable_post_processing():
 	"""Disables post-processing translators."""
-	global _enabled_translators
+	global _enabled_translators, _enabled_translation_plans
 
 	_enabled_translators = _installed_translators
+	_enabled_translation_plans = _translation_plans
+
+def _translate_string(data_value, right_bound):
+	"""Translates the tags in a string by scanning it from right to left.
+
+	Args:
+		data_value (string): The data value string to translate.
+		right_bound (int): The index to begin scanning to the left of.
+
+	Returns:
+		The translated data value, which is of whatever type the translator returns.
+	"""
+	rightmost_tag_suffix = data_value.rfind(_data_value_tag_suffix, 0, right_bound)
+	rightmost_tag_prefix = data_value.rfind(_data_value_tag_prefix, 0, rightmost_tag_suffix)
+	while rightmost_tag_suffix != -1 and rightmost_tag_prefix != -1:
+		tag = data_value[rightmost_tag_prefix+len(_data_value_tag_prefix) : rightmost_tag_suffix]
+		if tag in _enabled_translators:
+			translated_data_value = _enabled_translators[tag](data_value[rightmost_tag_suffix+len(_data_value_tag_suffix):])
+
+			# The data value can't contain a tag anymore
+			if not isinstance(translated_data_value, basestring):
+				return translated_data_value
+			else:
+				data_value = data_value[:rightmost_tag_prefix] + translated_data_value
+		else:
+			# Skip over this occurence of the tag suffix
+			right_bound = rightmost_tag_suffix
+
+		rightmost_tag_suffix = data_value.rfind(_data_value_tag_suffix, 0, right_bound)
+		rightmost_tag_prefix = data_value.rfind(_data_value_tag_prefix, 0, rightmost_tag_suffix)
+
+	return data_value
+
+def _compile_translation_plan(data_value):
+	"""Parses a string into the chain of enabled translators to apply to it.
+
+	Each step of the plan is a tuple of the translator, the index of its
+	tag prefix, the untagged text following its tag, and the right bound
+	of the scan when the tag was found. The text passed to each translator
+	is its untagged text followed by the result of the previous step.
+	A plan with no steps means the string is a literal.
+
+	Args:
+		data_value (string): The data value string to parse.
+
+	Returns:
+		The plan as a tuple of steps.
+	"""
+	plan = []
+	right_bound = len(data_value)
+	scan_bound = right_bound # The end of the portion not replaced by a translation
+	previous_tag_prefix = None
+
+	rightmost_tag_suffix = data_value.rfind(_data_value_tag_suffix, 0, scan_bound)
+	rightmost_tag_prefix = data_value.rfind(_data_value_tag_prefix, 0, rightmost_tag_suffix)
+	while rightmost_tag_suffix != -1 and rightmost_tag_prefix != -1:
+		tag = data_value[rightmost_tag_prefix+len(_data_value_tag_prefix) : rightmost_tag_suffix]
+		if tag in _enabled_translators:
+			untagged_text = data_value[rightmost_tag_suffix+len(_data_value_tag_suffix) : previous_tag_prefix]
+			plan.append((_enabled_translators[tag], rightmost_tag_prefix, untagged_text, right_bound))
+
+			# Everything from the tag prefix onwards is replaced by the translation
+			previous_tag_prefix = rightmost_tag_prefix
+			scan_bound = rightmost_tag_prefix
+		else:
+			# Skip over this occurence of the tag suffix
+			right_bound = rightmost_tag_suffix
+			scan_bound = rightmost_tag_suffix
+
+		rightmost_tag_suffix = data_value.rfind(_data_value_tag_suffix, 0, scan_bound)
+		rightmost_tag_prefix = data_value.rfind(_data_value_tag_prefix, 0, rightmost_tag_suffix)
+
+	return tuple(plan)
+
+def _execute_translation_plan(data_value, plan):
+	"""Applies a translation plan to the string it was compiled from.
+
+	If a translator returns a string which could form a new tag, the rest
+	of the string is scanned as it would be without a plan.
+
+	Args:
+		data_value (string): The data value string the plan was compiled from.
+		plan (tuple): The plan returned by :func:`_compile_translation_plan`.
+
+	Returns:
+		The translated data value, which is of whatever type the translator returns.
+	"""
+	if not plan:
+		return data_value
+
+	translated_data_value = ''
+	for translator, tag_prefix, untagged_text, right_bound in plan:
+		translated_data_value = translator(untagged_text + translated_data_value)
+
+		# The data value can't contain a tag anymore
+		if not isinstance(translated_data_value, basestring):
+			return translated_data_value
+
+		if not _data_value_tag_characters.isdisjoint(translated_data_value):
+			return _translate_string(data_value[:tag_prefix] + translated_data_value, right_bound)
+
+	return data_value[:tag_prefix] + translated_data_value
 
 def translate(data_value, recurse=True):
 	"""Translates tagged data values to other data types as specified by the tag.
@@ -68,6 +204,9 @@ def translate(data_value, recurse=True):
 	Tags are parsed from right to left to allow chaining, which is useful in cases such as
 	'::image::::property::the.image.property'.
 
+	Each tagged string is parsed once into a plan of the translators to apply,
+	which is cached for the currently enabled translators.
+
 	Args:
 		data_value (string): The data value string to translate. If the string contains no
 							 tags, translation will not be performed.
@@ -80,32 +219,21 @@ def translate(data_value, recurse=True):
 	"""
 	# If the data value is a string, it could contain a tag
 	if isinstance(data_value, basestring):
-		# Scan from the right, looking for tags in the left portion of the value
-		right_bound = len(data_value)
+		# Strings without a tag suffix can't contain a tag
+		if not _data_value_tag_suffix in data_value:
+			return data_value
 
-		rightmost_tag_suffix = data_value.rfind(_data_value_tag_suffix, 0, right_bound)
-		rightmost_tag_prefix = data_value.rfind(_data_value_tag_prefix, 0, rightmost_tag_suffix)
-		while rightmost_tag_suffix != -1 and rightmost_tag_prefix != -1:
-			tag = data_value[rightmost_tag_prefix+len(_data_value_tag_prefix) : rightmost_tag_suffix]
-			if tag in _enabled_translators:
-				translated_data_value = _enabled_translators[tag](data_value[rightmost_tag_suffix+len(_data_value_tag_suffix):])
-
-				# The data value can't contain a tag anymore
-				if not isinstance(translated_data_value, basestring):
-					return translated_data_value
-				else:
-					data_value = data_value[:rightmost_tag_prefix] + translated_data_value
-			else:
-				# Skip over this occurence of the tag suffix
-				right_bound = rightmost_tag_suffix
+		plan = _enabled_translation_plans.get(data_value)
+		if plan is None:
+			plan = _compile_translation_plan(data_value)
+			_enabled_translation_plans[data_value] = plan
 
-			rightmost_tag_suffix = data_value.rfind(_data_value_tag_suffix, 0, right_bound)
-			rightmost_tag_prefix = data_value.rfind(_data_value_tag_prefix, 0, rightmost_tag_suffix)
+		return _execute_translation_plan(data_value, plan)
 	elif recurse:
 		if isinstance(data_value, list):
 			# Using [:] will update the contents of the list without creating a new list
 			data_value[:] = map(translate, data_value)
-		elif 'iteritems' in dir(data_value):
+		elif hasattr(data_value, 'iteritems'):
 			# Using a for loop instead of map() to keep the object at the same place in memory
 			for k, v in data_value.iteritems():
 				translated_k = translate(k)
@@ -117,12 +245,69 @@ def translate(data_value, recurse=True):
 
 	return data_value
 
-def ready_for_translation(layer_title):
-	"""Returns True if the given layer is ready for translation.
-	This can only be done during post-processing.
+def get_translation_order(layer_titles):
+	"""Returns the order to post-process layers in so that dependencies are processed first.
+
+	The dependencies of every layer are gathered into a graph up front and sorted
+	topologically. Layers are ordered as if the list was scanned repeatedly, processing
+	each layer once its dependencies have been processed, so independent layers keep
+	their order in the list.
+
+	Args:
+		layer_titles (list of str): The title of each layer, in the order they were listed.
+
+	Returns:
+		A list of the indices of the layers, in the order to process them.
+
+	Raises:
+		ValueError: If a title is listed twice, a layer depends on a missing layer,
+		            or the dependencies of some layers are circular.
 	"""
-	# Reduces the tests list to the result of `True and test1(layer_title) and test2(layer_title) and ...`
-	return reduce(lambda status,test: status and test(layer_title), _installed_translation_readiness_tests, True)
+	layer_indices = {}
+	for layer_index, layer_title in enumerate(layer_titles):
+		if layer_title in layer_indices:
+			raise ValueError("Layer '{0}' is listed more than once".format(layer_title))
+
+		layer_indices[layer_title] = layer_index
+
+	# Build the dependency graph, as the indices of the layers depending on each layer
+	dependents = [[] for layer_title in layer_titles]
+	unmet_dependencies = [0] * len(layer_titles)
+	for layer_index, layer_title in enumerate(layer_titles):
+		dependencies = set()
+		for getter in _installed_dependency_getters:
+			dependencies.update(getter(layer_title))
+
+		for dependency in dependencies:
+			if not dependency in layer_indices:
+				raise ValueError("Layer '{0}' depends on missing layer '{1}'".format(layer_title, dependency))
+
+			dependents[layer_indices[dependency]].append(layer_index)
+
+		unmet_dependencies[layer_index] = len(dependencies)
+
+	# The scan of the list that each layer would be processed in
+	scans = [0] * len(layer_titles)
+	processed = []
+
+	ready = deque(layer_index for layer_index, unmet in enumerate(unmet_dependencies) if not unmet)
+	while ready:
+		layer_index = ready.popleft()
+		processed.append(layer_index)
+
+		for dependent in dependents[layer_index]:
+			# Dependents listed before their dependency must wait for the next scan
+			scans[dependent] = max(scans[dependent], scans[layer_index] + (dependent < layer_index))
+			unmet_dependencies[dependent] -= 1
+
+			if not unmet_dependencies[dependent]:
+				ready.append(dependent)
+
+	if len(processed) != len(layer_titles):
+		circular_layers = [layer_titles[layer_index] for layer_index, unmet in enumerate(unmet_dependencies) if unmet]
+		raise ValueError("Layers {0} have circular dependencies".format(', '.join("'{0}'".format(title) for title in circular_layers)))
+
+	return sorted(processed, key=lambda layer_index: (scans[layer_index], layer_index))
 
 # Get all files not beginning with an underscore and import them
 _import_modules = glob.glob(os.path.dirname(__file__) + '/*.py')
@@ -1,5 +1,5 @@
-from game.layers.level_config_translators import _layer_dependencies_met, _register_layer_graphic_dependency, _get_layer_graphic_property
-from . import install_translator, install_readiness_test
+from game.layers.level_config_translators import _get_layer_dependencies, _clear_layer_dependencies, _register_layer_graphic_dependency, _get_layer_graphic_property
+from . import install_translator, install_dependency_getter, install_state_resetter
 
 # Add support for registering layer graphic dependencies
 install_translator('layer_graphic_property', _register_layer_graphic_dependency)
@@ -7,5 +7,8 @@ install_translator('layer_graphic_property', _register_layer_graphic_dependency)
 # Resolve layer graphic dependencies during post-processing
 install_translator('resolve_layer_graphic_dependency', _get_layer_graphic_property, post=True)
 
-# Ensure a layer's graphic dependencies are met before post-processing translation
-install_readiness_test(_layer_dependencies_met)
+# Ensure a layer's graphic dependencies are processed before the layer in post-processing
+install_dependency_getter(_get_layer_dependencies)
+
+# Forget the dependencies of a level once it has loaded, or failed to load
+install_state_resetter(_clear_layer_dependencies)
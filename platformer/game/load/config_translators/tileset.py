@@ -1,4 +1,18 @@
+from game.load.level import Level
 from game.tiles import Tileset
 from . import install_translator
+import game
 
-install_translator('tileset', Tileset.load)
+def _load_tileset(tileset_name):
+	"""Loads a tileset, packing its image into the global texture atlas if there is one.
+
+	The tileset is pinned in the resource cache until the level being loaded is released.
+	"""
+	tileset = Tileset.load(tileset_name, atlas=game.atlas)
+
+	Tileset.pin(tileset_name)
+	Level.current_tilesets.append(tileset_name)
+
+	return tileset
+
+install_translator('tileset', _load_tileset)
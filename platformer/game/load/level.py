@@ -1,8 +1,11 @@
 from pyglet.resource import file as open_resource_file
 from game.graphics import create_graphics_object
 from game import layers
+from game.tiles import Tileset
 from json import load as json_load
-from ..settings.general_settings import RESOURCE_PATH, LEVEL_DIRECTORY, LEVEL_FORMAT
+from pyglet.resource import ResourceNotFoundException
+from compiled_level import load_compiled_level
+from ..settings.general_settings import RESOURCE_PATH, LEVEL_DIRECTORY, LEVEL_FORMAT, LOAD_COMPILED_LEVELS
 import game.scripts
 
 class Level(object):
@@ -16,20 +19,54 @@ class Level(object):
 		                                if no processing is being performed. Useful for translators.
 		current_processed_layers (dict): Layers which have already been processed as layer_title: layer_object.
 		                                 The dict will be empty if processing is not currently ongoing.
+		current_tilesets (list of str): The names of the tilesets pinned in the resource cache for the level
+		                                currently being loaded. Translators add to this list.
 
 	Properties:
 		camera (:class:`viewport.Viewport`): The camera for the level.
 		layer_manager (:class:`layers.LayerManager`): The layer manager for the level's layers.
+		tilesets (list of str): The names of the tilesets the level keeps pinned in the resource cache.
 	"""
 
 	# The title of the layer currently being processed
 	current_processing_layer = None
 	# Dictionary of layers which have already been processed, as layer_title: layer_object
 	current_processed_layers = {}
+	# Names of the tilesets pinned for the level being loaded
+	current_tilesets = []
 
 	def __init__(self, level_data):
 		"""Loads a level from disk.
 
+		The static properties used while loading are cleaned up even if
+		loading fails, so more levels can be loaded afterwards.
+
+		Args:
+			level_data (dict): A dictionary of level parameters.
+		"""
+		loaded = False
+
+		try:
+			self._initialize(level_data)
+			loaded = True
+		finally:
+			# Disable post processing of level config data so more levels can be loaded
+			config_translators.disable_post_processing()
+			config_translators.reset_state()
+
+			# Tilesets pinned for a level which failed to load would never be released
+			if not loaded:
+				for tileset_name in Level.current_tilesets:
+					Tileset.unpin(tileset_name)
+
+			# Clean up the static properties once loading is finished
+			Level.current_processing_layer = None
+			Level.current_processed_layers = {}
+			Level.current_tilesets = []
+
+	def _initialize(self, level_data):
+		"""Creates the level's scripts, layers, and viewport.
+
 		Args:
 			level_data (dict): A dictionary of level parameters.
 		"""
@@ -61,38 +98,34 @@ class Level(object):
 		# Enable post processing of level config data
 		config_translators.enable_post_processing()
 
-		# Post-process the level config and create the layers
+		# Post-process the level config and create the layers, after the layers they depend on
 		initialized_layers = []
-		while len(initialized_layers) != len(level_data['layers']):
-			for layer_index, layer_config in enumerate(level_data['layers']):
-				Level.current_processing_layer = config_translators.translate(layer_config['title'])
-
-				# Skip layers that still have unmet dependencies or have already been processed
-				if not config_translators.ready_for_translation(Level.current_processing_layer) or Level.current_processing_layer in Level.current_processed_layers:
-					continue
+		layer_titles = [config_translators.translate(layer_config['title']) for layer_config in level_data['layers']]
+		for layer_index in config_translators.get_translation_order(layer_titles):
+			Level.current_processing_layer = layer_titles[layer_index]
 
-				# Translate all layer data values
-				layer_config = config_translators.translate(level_data['layers'][layer_index])
+			# Translate all layer data values
+			layer_config = config_translators.translate(level_data['layers'][layer_index])
 
-				graphic_type = layer_config['graphic']['type']
-				del layer_config['graphic']['type'] # Remove the graphic type from the graphic arguments
+			graphic_type = layer_config['graphic']['type']
+			del layer_config['graphic']['type'] # Remove the graphic type from the graphic arguments
 
-				layer_graphic = create_graphics_object(graphic_type, **layer_config['graphic'])
+			layer_graphic = create_graphics_object(graphic_type, **layer_config['graphic'])
 
-				# TODO Remove the need for this hotfix
-				if Level.current_processing_layer == 'player':
-					layer_graphic = layer_graphic.character
+			# TODO Remove the need for this hotfix
+			if Level.current_processing_layer == 'player':
+				layer_graphic = layer_graphic.character
 
-				# Add the layer title as an argument for creating the layer
-				if not 'layer' in layer_config:
-					layer_config['layer'] = {'title': self.current_processing_layer}
-				else:
-					layer_config['layer']['title'] = self.current_processing_layer
+			# Add the layer title as an argument for creating the layer
+			if not 'layer' in layer_config:
+				layer_config['layer'] = {'title': self.current_processing_layer}
+			else:
+				layer_config['layer']['title'] = self.current_processing_layer
 
-				layer = layers.create_from(layer_graphic, **layer_config['layer'])
+			layer = layers.create_from(layer_graphic, **layer_config['layer'])
 
-				initialized_layers.append(layer)
-				Level.current_processed_layers[Level.current_processing_layer] = layer
+			initialized_layers.append(layer)
+			Level.current_processed_layers[Level.current_processing_layer] = layer
 
 		# Clean ip the static properties once loading is finished
 		Level.current_processing_layer = None
@@ -104,31 +137,66 @@ class Level(object):
 
 		viewport = create_graphics_object(graphic_type, **level_data['viewport'])
 
-		# Disable post processing of level config data so more levels can be loaded
-		config_translators.disable_post_processing()
-
 		# Initialize the layer manager
 		self.layer_manager = layers.LayerManager(viewport, initialized_layers)
 
-		# Clean ip the static properties once loading is finished
-		Level.current_processed_layers = {}
+		# Keep the level's tilesets cached until the level is released
+		self.tilesets = Level.current_tilesets
+
+	def release_resources(self):
+		"""Unpins the cached resources used by the level.
+
+		The resources can then be evicted from the resource cache, so this
+		should be called once the level will no longer be used.
+		"""
+		for tileset_name in self.tilesets:
+			Tileset.unpin(tileset_name)
+
+		self.tilesets = []
 
 	@classmethod
 	def load(cls, level_title):
 		# TODO The game.level.Level class in the doc should be updated once this class is finalized
 		"""Loads a level from a given level title.
 
+		If the level has been compiled with
+		:func:`game.load.compiled_level.compile_level`, the compiled level
+		is loaded instead of the level config. Levels which have not been
+		compiled, were compiled in an older format, or were modified since
+		they were compiled are loaded from their config.
+
 		Args:
 			level_title (str): The title of the level to load.
 
 		Returns:
 			A :class:`game.level.Level` object.
 		"""
+		return cls(cls.load_data(level_title))
+
+	@staticmethod
+	def load_data(level_title):
+		"""Loads the level parameters for a given level title without creating the level.
+
+		No OpenGL calls are made, so this can be called from threads
+		other than the main thread.
+
+		Args:
+			level_title (str): The title of the level to load.
+
+		Returns:
+			A dict of level parameters.
+		"""
+		if LOAD_COMPILED_LEVELS:
+			try:
+				return load_compiled_level(level_title)
+			except (ResourceNotFoundException, ValueError):
+				pass
+
 		level_file = open_resource_file(LEVEL_DIRECTORY+'/'+level_title+'.'+LEVEL_FORMAT)
 		level_data = json_load(level_file)
 		level_file.close()
 
-		return cls(level_data)
+		return level_data
 
 # Import at bottom to resolve circular dependency
 import config_translators
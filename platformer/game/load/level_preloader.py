@@ -0,0 +1,224 @@
+import pyglet.clock
+from multiprocessing.pool import ThreadPool
+from compiled_level import _find_tagged_values, _set_data_value, _TILE_MAP_TAG
+from level import Level
+from tile_map import load_tile_map
+from game.tiles import Tileset
+from game.tiles.tileset import TilesetImage, TilesetConfig, get_tileset_config, get_tileset_image_data
+from ..settings.general_settings import LEVEL_PRELOAD_WORKERS
+
+_TILESET_TAG = '::tileset::'
+
+class PreloadedLevel(object):
+	"""The decoded resources of a level, ready to be created on the main thread.
+
+	Attributes:
+		level_title (str): The title of the level.
+		level_data (dict): The level parameters, with tile maps already loaded.
+		tilesets (dict): The decoded image and parsed config of each tileset which was not cached, as ``tileset_name: (image, config)``.
+	"""
+
+	def __init__(self, level_title, level_data, tilesets):
+		"""Creates a bundle of preloaded level resources.
+
+		Args:
+			level_title (str): The title of the level.
+			level_data (dict): The level parameters, with tile maps already loaded.
+			tilesets (dict): The decoded image and parsed config of each tileset, as ``tileset_name: (image, config)``.
+		"""
+		self.level_title = level_title
+		self.level_data = level_data
+		self.tilesets = tilesets
+
+	def create_level(self, atlas=None):
+		"""Uploads the preloaded resources and creates the level.
+
+		This must be called from the main thread, since textures and
+		vertex lists are created.
+
+		Kwargs:
+			atlas (:class:`game.texture_atlas.TextureAtlas`): An atlas to pack the tileset images into, instead of giving each its own texture.
+
+		Returns:
+			A :class:`game.load.Level` object.
+		"""
+		tileset_names = self.tilesets.keys()
+		tileset_images = [self.tilesets[tileset_name][0] for tileset_name in tileset_names]
+
+		if atlas:
+			tileset_images = atlas.add_images(tileset_images, keys=[('tileset', tileset_name) for tileset_name in tileset_names])
+		else:
+			tileset_images = [tileset_image.get_texture() for tileset_image in tileset_images]
+
+		for tileset_name, tileset_image in zip(tileset_names, tileset_images):
+			# Caching the tileset lets the tileset translator find it
+			Tileset(tileset_name, TilesetImage(tileset_image), self.tilesets[tileset_name][1], packed=bool(atlas))
+
+		return Level(self.level_data)
+
+def _preload_level(level_title):
+	"""Loads and decodes the resources for a level.
+
+	Only file reads and decoding are performed, so this is safe to run
+	on a worker thread.
+
+	Args:
+		level_title (str): The title of the level to preload.
+
+	Returns:
+		A :class:`game.load.level_preloader.PreloadedLevel` object.
+	"""
+	level_data = Level.load_data(level_title)
+
+	# Compiled levels already contain their tile maps
+	for path, map_name in _find_tagged_values(level_data, _TILE_MAP_TAG):
+		_set_data_value(level_data, path, load_tile_map(map_name))
+
+	tilesets = {}
+	for path, tileset_name in _find_tagged_values(level_data, _TILESET_TAG):
+		if not (tileset_name in tilesets or Tileset.is_cached(tileset_name)):
+			tilesets[tileset_name] = (
+				get_tileset_image_data(tileset_name),
+				TilesetConfig(get_tileset_config(tileset_name))
+			)
+
+	return PreloadedLevel(level_title, level_data, tilesets)
+
+class LevelPreloader(object):
+	"""Loads levels on worker threads so the game does not stall.
+
+	File reads, level and tile map decoding, and image decoding are
+	performed on a thread pool. Once a level's resources are ready, the
+	level is created on the main thread, where only the textures and
+	vertex lists still need to be created. The preloader checks for
+	finished levels with :mod:`pyglet.clock` while levels are pending.
+
+	If the preloader is given a texture atlas, the tileset images of
+	every level it creates are packed into the atlas.
+
+	Levels which fail to load are passed to their ``on_error`` callback
+	rather than raising from the clock. Failed levels without an
+	``on_error`` callback raise their error from :func:`get_level`.
+
+	Example:
+		>>> preloader = LevelPreloader()
+		>>> preloader.preload('level_2', on_load=start_level, on_error=show_error)
+	"""
+
+	def __init__(self, workers=LEVEL_PRELOAD_WORKERS, atlas=None):
+		"""Creates a level preloader.
+
+		Kwargs:
+			workers (int): The number of worker threads to load levels with.
+			atlas (:class:`game.texture_atlas.TextureAtlas`): An atlas to pack tileset images into.
+		"""
+		self.atlas = atlas
+		self._pool = ThreadPool(workers)
+
+		# Pending levels as level_title: (async result, on_load callback, on_error callback)
+		self._pending = {}
+		self._is_polling = False
+
+		# Levels which failed to load without an on_error callback, as level_title: exception
+		self._failed = {}
+
+	def preload(self, level_title, on_load=None, on_error=None):
+		"""Begins loading a level in the background.
+
+		Preloading a level which is already pending has no effect.
+
+		Args:
+			level_title (str): The title of the level to preload.
+
+		Kwargs:
+			on_load (function): A callback to pass the :class:`game.load.Level` object to once it has been created on the main thread.
+			on_error (function): A callback to pass the level title and the exception to if the level fails to load.
+		"""
+		if level_title in self._pending:
+			return
+
+		self._failed.pop(level_title, None)
+		self._pending[level_title] = (self._pool.apply_async(_preload_level, (level_title,)), on_load, on_error)
+
+		if not self._is_polling:
+			pyglet.clock.schedule(self._poll)
+			self._is_polling = True
+
+	def is_ready(self, level_title):
+		"""Returns whether a pending level's resources have finished loading.
+
+		Args:
+			level_title (str): The title of the pending level.
+
+		Returns:
+			True if the level is ready to be created, False otherwise.
+		"""
+		if level_title in self._failed:
+			return True
+
+		return self._pending[level_title][0].ready()
+
+	def get_level(self, level_title):
+		"""Creates a pending level, waiting for its resources if necessary.
+
+		The level's ``on_load`` and ``on_error`` callbacks are not called.
+
+		Args:
+			level_title (str): The title of the pending level.
+
+		Returns:
+			A :class:`game.load.Level` object.
+
+		Raises:
+			KeyError: If the level is not being preloaded.
+			Exception: Whatever error the level failed to load with.
+		"""
+		if level_title in self._failed:
+			raise self._failed.pop(level_title)
+
+		result, on_load, on_error = self._pending.pop(level_title)
+
+		return result.get().create_level(self.atlas)
+
+	def _poll(self, dt):
+		"""Creates any pending levels whose resources have finished loading.
+
+		Levels which fail to load are passed to their ``on_error``
+		callback, or kept for :func:`get_level` to raise, so that one
+		failed level does not stop the clock.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		for level_title in [title for title, (result, on_load, on_error) in self._pending.iteritems() if result.ready()]:
+			result, on_load, on_error = self._pending.pop(level_title)
+
+			try:
+				level = result.get().create_level(self.atlas)
+			except Exception as error:
+				if on_error:
+					on_error(level_title, error)
+				else:
+					self._failed[level_title] = error
+
+				continue
+
+			if on_load:
+				on_load(level)
+
+		if not self._pending:
+			pyglet.clock.unschedule(self._poll)
+			self._is_polling = False
+
+	def close(self):
+		"""Stops polling and shuts down the worker threads.
+
+		Levels which are still pending are discarded.
+		"""
+		pyglet.clock.unschedule(self._poll)
+		self._is_polling = False
+		self._pending = {}
+		self._failed = {}
+
+		self._pool.close()
+		self._pool.join()
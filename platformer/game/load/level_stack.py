@@ -0,0 +1,100 @@
+from pyglet.event import EventDispatcher
+
+class LevelStack(EventDispatcher):
+	"""A stack of levels, where only the level on top is running.
+
+	Pushing a level, such as a sub-level, suspends the level beneath it
+	without unloading it. Popping the sub-level resumes the level
+	beneath it instantly, without loading it again.
+
+	Callbacks can be registered for this class's ``on_level_change``
+	event, which is fired with the new top level whenever a level is
+	pushed or popped.
+
+	Example:
+		>>> level_stack = LevelStack(Level.load('demo'))
+		>>> level_stack.push(Level.load('cave'))
+		>>> level_stack.pop(release=True)
+
+	Attributes:
+		levels (list of :class:`game.load.Level`): The levels on the stack, from the bottom to the top.
+	"""
+
+	def __init__(self, level=None):
+		"""Creates a level stack.
+
+		Kwargs:
+			level (:class:`game.load.Level`): The first level on the stack.
+		"""
+		self.levels = []
+
+		if level:
+			self.levels.append(level)
+
+	@property
+	def top(self):
+		"""Gets the running level, or None if the stack is empty."""
+		return self.levels[-1] if self.levels else None
+
+	def push(self, level, compact=False):
+		"""Suspends the running level and runs a new level on top of it.
+
+		Args:
+			level (:class:`game.load.Level`): The level to run.
+
+		Kwargs:
+			compact (bool): Whether to release data from the suspended level which it can recreate once it is resumed.
+		"""
+		if self.levels:
+			self.top.layer_manager.suspend(compact=compact)
+
+		level.layer_manager.resume()
+		self.levels.append(level)
+
+		self.dispatch_event('on_level_change', level)
+
+	def pop(self, release=False):
+		"""Suspends the running level and resumes the level beneath it.
+
+		The popped level keeps its graphics, so it can be pushed again
+		without being reloaded. Levels which will not be pushed again
+		should be released, so their cached resources can be evicted.
+
+		Kwargs:
+			release (bool): Whether to release the popped level's cached resources.
+
+		Returns:
+			The popped :class:`game.load.Level` object.
+
+		Raises:
+			IndexError: If the stack is empty.
+		"""
+		level = self.levels.pop()
+		level.layer_manager.suspend()
+
+		if release:
+			level.release_resources()
+
+		if self.levels:
+			self.top.layer_manager.resume()
+
+		self.dispatch_event('on_level_change', self.top)
+
+		return level
+
+	def update(self, dt):
+		"""Updates the running level.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		if self.levels:
+			self.top.layer_manager.update(dt)
+
+	def draw(self):
+		"""Draws the running level."""
+		if self.levels:
+			self.top.layer_manager.draw()
+
+# Register level stack events
+LevelStack.register_event_type('on_level_change')
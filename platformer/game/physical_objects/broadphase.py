@@ -0,0 +1,172 @@
+class _Endpoint(object):
+	"""One end of an object's extent along the x axis.
+
+	Endpoints are sorted by ``(value, is_start)``, so that the end of
+	one object sorts before the start of another at the same coordinate.
+	Objects which only touch are therefore not considered overlapping.
+
+	Attributes:
+		obj (:class:`game.physical_objects.physical_object.PhysicalObject`): The object this endpoint belongs to.
+		is_start (bool): Whether this is the left end of the object.
+		value (int): The x coordinate of this end of the object.
+	"""
+
+	__slots__ = ('obj', 'is_start', 'value')
+
+	def __init__(self, obj, is_start):
+		self.obj = obj
+		self.is_start = is_start
+		self.value = obj.x if is_start else obj.x2
+
+	def refresh(self):
+		"""Updates the endpoint's coordinate from its object."""
+		self.value = self.obj.x if self.is_start else self.obj.x2
+
+
+
+class SweepAndPrune(object):
+	"""Broadphase which finds pairs of overlapping objects.
+
+	The start and end of every object along the x axis are kept in a
+	sorted list of endpoints. Because objects move only a short distance
+	each update, the list is almost sorted and is re-sorted with an
+	insertion sort. Each time two endpoints swap places, the pair of
+	objects they belong to either begins or stops overlapping on the
+	x axis, so the set of candidate pairs is maintained incrementally
+	rather than by testing every pair of objects.
+
+	Candidate pairs are only considered colliding if they also overlap
+	on the y axis.
+
+	Attributes:
+		objects (list of :class:`game.physical_objects.physical_object.PhysicalObject`): The objects in the broadphase.
+	"""
+
+	def __init__(self):
+		self.objects = []
+
+		self._endpoints = []
+
+		# Pairs of objects which overlap on the x axis, keyed by ordered object ids
+		self._pairs = {}
+
+	def add(self, obj):
+		"""Adds an object to the broadphase.
+
+		Args:
+			obj (:class:`game.physical_objects.physical_object.PhysicalObject`): The object to add.
+		"""
+		self.objects.append(obj)
+
+		# Inserting the start before the end pairs the object with everything it overlaps
+		self._insert(_Endpoint(obj, True))
+		self._insert(_Endpoint(obj, False))
+
+	def remove(self, obj):
+		"""Removes an object from the broadphase.
+
+		Args:
+			obj (:class:`game.physical_objects.physical_object.PhysicalObject`): The object to remove.
+		"""
+		self.objects.remove(obj)
+		self._endpoints = [endpoint for endpoint in self._endpoints if endpoint.obj is not obj]
+
+		obj_id = id(obj)
+		for key in [key for key in self._pairs if obj_id in key]:
+			del self._pairs[key]
+
+	def update(self):
+		"""Updates the candidate pairs for objects which have moved."""
+		endpoints = self._endpoints
+
+		for endpoint in endpoints:
+			endpoint.refresh()
+
+		for index in xrange(1, len(endpoints)):
+			self._sort_endpoint(index)
+
+	def get_collisions(self):
+		"""Returns the pairs of objects which overlap.
+
+		Returns:
+			A list of tuples of two :class:`game.physical_objects.physical_object.PhysicalObject` objects.
+		"""
+		return [(first, second) for first, second in self._pairs.itervalues() if first.y < second.y2 and second.y < first.y2]
+
+	def get_collisions_with(self, obj):
+		"""Returns the objects which overlap a given object.
+
+		Args:
+			obj (:class:`game.physical_objects.physical_object.PhysicalObject`): The object to find overlapping objects for.
+
+		Returns:
+			A list of :class:`game.physical_objects.physical_object.PhysicalObject` objects.
+		"""
+		colliding_objects = []
+
+		for first, second in self.get_collisions():
+			if first is obj:
+				colliding_objects.append(second)
+			elif second is obj:
+				colliding_objects.append(first)
+
+		return colliding_objects
+
+	def dispatch_collisions(self):
+		"""Notifies each pair of overlapping objects of their collision.
+
+		This is performed by calling ``handle_collision_with`` on both
+		objects of every overlapping pair.
+		"""
+		for first, second in self.get_collisions():
+			first.handle_collision_with(second)
+			second.handle_collision_with(first)
+
+	def _insert(self, endpoint):
+		"""Inserts an endpoint into its sorted position.
+
+		Args:
+			endpoint (:class:`_Endpoint`): The endpoint to insert.
+		"""
+		self._endpoints.append(endpoint)
+		self._sort_endpoint(len(self._endpoints) - 1)
+
+	def _sort_endpoint(self, index):
+		"""Moves an endpoint left until the endpoints up to it are sorted.
+
+		Args:
+			index (int): The index of the endpoint to move.
+		"""
+		endpoints = self._endpoints
+		endpoint = endpoints[index]
+		value = endpoint.value
+		is_start = endpoint.is_start
+
+		while index > 0:
+			previous = endpoints[index - 1]
+
+			if previous.value < value or (previous.value == value and previous.is_start <= is_start):
+				break
+
+			# A start passing an end begins an overlap, an end passing a start ends one
+			if is_start != previous.is_start:
+				if is_start:
+					self._add_pair(endpoint.obj, previous.obj)
+				else:
+					self._remove_pair(endpoint.obj, previous.obj)
+
+			endpoints[index] = previous
+			index -= 1
+
+		endpoints[index] = endpoint
+
+	def _add_pair(self, first, second):
+		"""Records that two objects overlap on the x axis."""
+		if first is not second:
+			key = (id(first), id(second)) if id(first) < id(second) else (id(second), id(first))
+			self._pairs[key] = (first, second)
+
+	def _remove_pair(self, first, second):
+		"""Records that two objects no longer overlap on the x axis."""
+		key = (id(first), id(second)) if id(first) < id(second) else (id(second), id(first))
+		self._pairs.pop(key, None)
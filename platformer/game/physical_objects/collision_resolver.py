@@ -1,45 +1,74 @@
 # -*- coding: utf-8 -*-
 
 from ..settings import general_settings
+from ..settings.general_settings import TILE_SIZE
+from ..tiles.collision_grid import COLLIDABLE, SLOPE, FACES_LEFT, FACES_RIGHT, CEILING, LEFTWARD_SLOPE, RIGHTWARD_SLOPE
 
 # TODO If you dash up multiple rightward slopes and jump, you hit a solid tile and jitter
 # TODO Float equality should be checked with util.floats_equal
 
 def resolve_collisions(obj):
+	# Fast objects stop at their first contact, so their move can't skip past a tile
+	if obj.continuous_collisions:
+		_move_to_first_contact(obj, obj.collision_grid)
+
 	# Don't resolve horizontal collisions if the object has no horizontal velocity
 	if obj.moving_to_x != obj.x:
 		# Handle horizontal component first in case of slopes
-		_resolve_collision_x(obj, obj.stage)
+		_resolve_collision_x(obj, obj.collision_grid)
+
+	_resolve_collision_y(obj, obj.collision_grid)
+
+def _move_to_first_contact(obj, grid):
+	"""Moves an object up to the first solid tile in the path of a long move.
 
-	_resolve_collision_y(obj, obj.stage)
+	The object's box is swept through the collision grid, and the object is
+	moved to where it first touches a solid tile. The rest of the move is
+	then resolved against the touched tile as usual, which also resolves
+	slopes and notifies the object of the collision.
+	"""
+	dx = obj.moving_to_x - obj.x
+	dy = obj.moving_to_y - obj.y
 
-def _resolve_collision_x(obj, tile_map):
+	# Moves shorter than a tile can't skip past one, and slopes are only handled by the per-axis resolution
+	if abs(dx) >= TILE_SIZE or abs(dy) >= TILE_SIZE:
+		impact = grid.sweep(obj.x, obj.y, obj.width, obj.height, dx, dy)
+
+		# Objects which are already touching or which reach their destination don't need to be moved
+		if impact and 0 < impact[0] < 1:
+			obj.x += dx * impact[0]
+			obj.y += dy * impact[0]
+
+def _resolve_collision_x(obj, grid):
 	x_range = _get_axis_range(obj, 'x', obj.moving_to_x)
 
+	# Collision checks are performed against the grid's flags, only the colliding tiles themselves are accessed
+	flags = grid.flags
+	cols = grid.cols
+
 	tile_found = False
 	for y in obj.get_y_tile_span():
 		if tile_found:
 			break
 
+		row = y * cols
+
 		for x in x_range:
-			collision_tile = tile_map[y][x]
+			cell = row + x
+			cell_flags = flags[cell]
 
-			if collision_tile and collision_tile.is_collidable:
+			if cell_flags & COLLIDABLE:
 				# TODO Implement hooks for custom tiles to determine exceptions and say whether tiles should be ignored
 				if x != 0:
-					left_tile = tile_map[y][x-1]
-
 					"""Ignore adjacent tiles connected to left-facing slopes (allows for ascending connected left-facing slopes)
 					 ◢□■
 					◢□■■
 					"""
 					# TODO This check used to end with ` and obj.y >= left_tile.y`. I should test if that was really necessary or not.
-					if left_tile and left_tile.type == 'slope' and left_tile.faces_left and obj.mid_x < collision_tile.x:
+					if flags[cell-1] & LEFTWARD_SLOPE == LEFTWARD_SLOPE and obj.mid_x < x * TILE_SIZE:
 						continue
 
 					if y != 0:
-						bottom_left = tile_map[y-1][x-1]
-
 						"""Allow ascending connected left-facing slopes by bypassing protection against entering
 						slopes which are above the bottom of the object.
 						Assuming an object 2 lines tall, it should not pass through the second figure, but should
@@ -47,24 +76,20 @@ def _resolve_collision_x(obj, tile_map):
 						1:  ◿■■    2:   ◢
 						   ◢■■■
 						"""
-						if collision_tile.type == 'slope' and bottom_left and bottom_left.type == 'slope' and not collision_tile.is_ceiling and collision_tile.faces_left and bottom_left.faces_left:
+						if cell_flags & (LEFTWARD_SLOPE | CEILING) == LEFTWARD_SLOPE and flags[cell-cols-1] & LEFTWARD_SLOPE == LEFTWARD_SLOPE:
 							continue
 
-				if x+1 < len(tile_map[0]):
-					right_tile = tile_map[y][x+1]
-
+				if x+1 < cols:
 					"""Ignore adjacent tiles connected to right-facing slopes if the object's center is over the slope
 					(allows for ascending connected right-facing slopes)
 					■□◣
 					■■□◣
 					"""
 					# TODO This check used to end with ` and obj.y >= right_tile.y`. I should test if that was really necessary or not.
-					if right_tile and right_tile.type == 'slope' and right_tile.faces_right and obj.mid_x >= collision_tile.x2:
+					if flags[cell+1] & RIGHTWARD_SLOPE == RIGHTWARD_SLOPE and obj.mid_x >= (x+1) * TILE_SIZE:
 						continue
 
 					if y != 0:
-						bottom_right = tile_map[y-1][x+1]
-
 						# Allow us to ascend continuous rightward slopes, because you can not enter a slope tile that's above your current y
 						# position unless it is facing the same direction as the tile you are currently on
 						"""Allow ascending connected right-facing slopes by bypassing protection against entering
@@ -74,10 +99,10 @@ def _resolve_collision_x(obj, tile_map):
 						1:  ■■◺    2:   ◣
 						    ■■■◣
 						"""
-						if collision_tile.type == 'slope' and bottom_right and bottom_right.type == 'slope' and not collision_tile.is_ceiling and collision_tile.faces_right and bottom_right.faces_right:
+						if cell_flags & (RIGHTWARD_SLOPE | CEILING) == RIGHTWARD_SLOPE and flags[cell-cols+1] & RIGHTWARD_SLOPE == RIGHTWARD_SLOPE:
 							continue
 
-				tile_found = collision_tile.resolve_collision_x(obj)
+				tile_found = grid.tile_at(x, y).resolve_collision_x(obj, x, y)
 
 				if tile_found:
 					break
@@ -89,54 +114,60 @@ def _resolve_collision_x(obj, tile_map):
 
 	obj.x = obj.moving_to_x
 
-def _resolve_collision_y(obj, tile_map):
+def _resolve_collision_y(obj, grid):
 	y_range = _get_axis_range(obj, 'y', obj.moving_to_y)
 
+	# Collision checks are performed against the grid's flags, only the colliding tiles themselves are accessed
+	flags = grid.flags
+	cols = grid.cols
+
 	tile_found = False
 
 	# TODO There's a bug with at least 2-tile wide objects snapping for a split second when transitioning over a peak /\ or going from a slope to the top of a solid tile
-	# TODO Make this pre-check more efficient.
-	for y in y_range:
-		# If the object is centered over a slope, always use the slope
-		# Tile that the object's center is over
-		x = obj.mid_x_tile
-		centered_tile = tile_map[y][x]
-		if centered_tile and centered_tile.is_collidable and centered_tile.type == 'slope':
-			# TODO This is blocking a 1-tile player from being able to go partially down the slope and collide with the solid tile
-			"""
-			Account for an issue where resolving the y axis after the x
-			axis could cause the object to be moved down into the side of
-			a tile. For example, an object might be moved down onto the
-			slope but overlap the full tile in this scenario:
-
-			◣■
-			"""
-			# TODO This check should really be along the x-range of the object
-			if centered_tile.faces_right and x+1 < len(tile_map[0]):
-				right_tile = tile_map[y][x+1]
-				if right_tile and right_tile.type != 'slope' and right_tile.is_collidable:
-					tile_found = right_tile.resolve_collision_y(obj)
-					if tile_found:
-						break
-			elif centered_tile.faces_left and x > 0:
-				left_tile = tile_map[y][x-1]
-				if left_tile and left_tile.type != 'slope' and left_tile.is_collidable:
-					tile_found = left_tile.resolve_collision_y(obj)
-					if tile_found:
-						break
-
-			tile_found = centered_tile.resolve_collision_y(obj)
-			if tile_found:
-				break
+	x = obj.mid_x_tile
+	if 0 <= x < cols:
+		for y in y_range:
+			# If the object is centered over a slope, always use the slope
+			# Tile that the object's center is over
+			cell = y * cols + x
+			cell_flags = flags[cell]
+			if cell_flags & (COLLIDABLE | SLOPE) == COLLIDABLE | SLOPE:
+				# TODO This is blocking a 1-tile player from being able to go partially down the slope and collide with the solid tile
+				"""
+				Account for an issue where resolving the y axis after the x
+				axis could cause the object to be moved down into the side of
+				a tile. For example, an object might be moved down onto the
+				slope but overlap the full tile in this scenario:
+
+				◣■
+				"""
+				# TODO This check should really be along the x-range of the object
+				if cell_flags & FACES_RIGHT and x+1 < cols:
+					if flags[cell+1] & (COLLIDABLE | SLOPE) == COLLIDABLE:
+						tile_found = grid.tile_at(x+1, y).resolve_collision_y(obj, x+1, y)
+						if tile_found:
+							break
+				elif cell_flags & FACES_LEFT and x > 0:
+					if flags[cell-1] & (COLLIDABLE | SLOPE) == COLLIDABLE:
+						tile_found = grid.tile_at(x-1, y).resolve_collision_y(obj, x-1, y)
+						if tile_found:
+							break
+
+				tile_found = grid.tile_at(x, y).resolve_collision_y(obj, x, y)
+				if tile_found:
+					break
 
 	for y in y_range:
 		if tile_found:
 			break
 
+		row = y * cols
+
 		for x in obj.get_x_tile_span():
-			collision_tile = tile_map[y][x]
+			cell = row + x
+			cell_flags = flags[cell]
 
-			if collision_tile and collision_tile.is_collidable:
+			if cell_flags & COLLIDABLE:
 				"""
 				Account for an issue where resolving the y axis after the x
 				axis could cause the object to be moved down into the side
@@ -146,23 +177,19 @@ def _resolve_collision_y(obj, tile_map):
 				◣■
 				"""
 				# TODO This check should really be along the x-range of the object
-				if collision_tile.type == 'slope':
-					if collision_tile.faces_right:
-						if x+1 < len(tile_map[0]):
-							right_tile = tile_map[y][x+1]
-							if right_tile and right_tile.type != 'slope' and right_tile.is_collidable:
-								tile_found = right_tile.resolve_collision_y(obj)
-								if tile_found:
-									break
-					elif collision_tile.faces_left:
-						if x > 0:
-							left_tile = tile_map[y][x-1]
-							if left_tile and left_tile.type != 'slope' and left_tile.is_collidable:
-								tile_found = left_tile.resolve_collision_y(obj)
-								if tile_found:
-									break
-
-				tile_found = collision_tile.resolve_collision_y(obj)
+				if cell_flags & SLOPE:
+					if cell_flags & FACES_RIGHT:
+						if x+1 < cols and flags[cell+1] & (COLLIDABLE | SLOPE) == COLLIDABLE:
+							tile_found = grid.tile_at(x+1, y).resolve_collision_y(obj, x+1, y)
+							if tile_found:
+								break
+					elif cell_flags & FACES_LEFT:
+						if x > 0 and flags[cell-1] & (COLLIDABLE | SLOPE) == COLLIDABLE:
+							tile_found = grid.tile_at(x-1, y).resolve_collision_y(obj, x-1, y)
+							if tile_found:
+								break
+
+				tile_found = grid.tile_at(x, y).resolve_collision_y(obj, x, y)
 
 				if tile_found:
 					break
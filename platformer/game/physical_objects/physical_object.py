@@ -1,5 +1,6 @@
 from game import util
 from game.extended_sprite import ExtendedSprite
+from game.tiles.collision_grid import CollisionGrid
 #from game import profilehooks
 from ..settings import general_settings
 from collision_resolver import resolve_collisions
@@ -8,15 +9,29 @@ from collision_resolver import resolve_collisions
 # TODO Test this class's coordinates!
 class PhysicalObject(ExtendedSprite):
 
+	# Whether to sweep through the collision grid to the first contact before resolving collisions
+	# This stops fast objects from clipping the corners of tiles, at the cost of sweeping every move
+	continuous_collisions = False
+
+	# The physics world integrating this object's motion, if any
+	physics_world = None
+	physics_index = None
+
 	def __init__(self, stage, *args, **kwargs):
 		mass = kwargs.pop('mass', 1)
 		key_handler = kwargs.pop('key_handler', None)
 		super(PhysicalObject, self).__init__(*args, **kwargs)
 
-		# @TODO It may be faster to keep a bytearray of this to check for collisions against
 		self.stage = stage
-		self.max_stage_x = len(self.stage[0])
-		self.max_stage_y = len(self.stage)
+
+		# Check for collisions against compact collision data rather than the tiles themselves
+		if isinstance(stage, CollisionGrid):
+			self.collision_grid = stage
+		else:
+			self.collision_grid = CollisionGrid.from_tiles(stage)
+
+		self.max_stage_x = self.collision_grid.cols
+		self.max_stage_y = self.collision_grid.rows
 
 		self.target_speed = 0
 
@@ -39,6 +54,27 @@ class PhysicalObject(ExtendedSprite):
 
 
 
+	def _set_x(self, x):
+		ExtendedSprite._set_x(self, x)
+
+		# The physics world keeps its own copy of the position, so it doesn't have to read it back every update
+		if self.physics_world is not None:
+			self.physics_world._set_position(self.physics_index, 'x', self.x)
+
+	x = property(lambda self: self._x, _set_x)
+
+
+
+	def _set_y(self, y):
+		ExtendedSprite._set_y(self, y)
+
+		if self.physics_world is not None:
+			self.physics_world._set_position(self.physics_index, 'y', self.y)
+
+	y = property(lambda self: self._y, _set_y)
+
+
+
 	# TODO This method could be removed
 	def move_to(self, new_x, new_y):
 		resolve_collisions(self)
@@ -118,7 +154,10 @@ class PhysicalObject(ExtendedSprite):
 		self.x = new_x
 		self.y = new_y
 
-		self.set_velocity(0, 0)
+		# Don't draw the object moving from where it was
+		self.store_previous_position()
+
+		self.set_velocities(0, 0)
 		self.in_air = True
 
 	def reset_to_tile(self, tile_x, tile_y):
@@ -148,19 +187,49 @@ class PhysicalObject(ExtendedSprite):
 
 
 	def detect_collisions(self):
-		# @TODO This method needs to check for collisions with the player (only npcs should use this)
-		# @TODO Or would it be better to have the player check for other collisions? NO, because he updates before the characters
-		"""if util.collision_detected(collision_tile, self):
-			self.handle_collision_with(collision_tile)
-			collision_tile.handle_collision_with(self)"""
+		"""Returns the objects in this object's physics world which overlap it.
+
+		Returns:
+			A list of :class:`game.physical_objects.physical_object.PhysicalObject` objects.
+		"""
+		if self.physics_world is None:
+			return []
+
+		return self.physics_world.broadphase.get_collisions_with(self)
 
 	def handle_collision_with(self, other_obj):
-		# @TODO Handle collisions with other characters
+		"""Called by the physics world when this object overlaps another object.
+
+		Args:
+			other_obj (:class:`game.physical_objects.physical_object.PhysicalObject`): The object which this object overlaps.
+		"""
 		pass
 
 
 
+	def simulate_analytically(self, dt):
+		"""Advances the object while it is too far from the viewport to be simulated.
+
+		Objects are frozen by default. Subclasses can override this to
+		complete simple motion without integrating it or resolving
+		collisions.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		pass
+
+
+
+	def has_behavior(self):
+		"""Returns True if this object's update does more than integrate its motion."""
+		return type(self).update.im_func is not PhysicalObject.update.im_func
+
 	def update(self, dt):
+		# Motion is integrated by the physics world for registered objects
+		if self.physics_world is not None:
+			return
+
 		# Limit horizontal acceleration when in air
 		if self.in_air:
 			aerial_acceleration = self.acceleration_x * 0.2
@@ -0,0 +1,329 @@
+from array import array
+from itertools import compress
+from collision_resolver import resolve_collisions
+from broadphase import SweepAndPrune
+from ..settings.general_settings import PHYSICS_SLEEP_TICKS
+
+class PhysicsWorld(object):
+	"""Integrates the motion of many physical objects in a single step.
+
+	The position and simulation state of every registered object is kept
+	in parallel arrays, indexed by the object's ``physics_index``. Objects
+	write their position into the arrays whenever they move, so the world
+	never has to read positions back from the objects. Each update, the
+	behavior of each object is updated (such as handling input), the
+	motion of every object is integrated in one pass over the arrays,
+	collisions are resolved, and only then are the objects' sprites
+	moved to their new positions. Finally, objects which overlap each
+	other are notified of their collision.
+
+	Objects which rest on the ground without moving for
+	``PHYSICS_SLEEP_TICKS`` updates are put to sleep, and are neither
+	integrated nor resolved against the stage until they wake. Their
+	behavior is still updated, so sleeping objects wake when input or
+	scripts set them in motion by giving them a velocity or target speed
+	or putting them in the air, when they're moved, or when a tile in
+	their collision grid is replaced.
+
+	When a simulation level of detail policy is set, objects far from
+	the viewport are simulated less often, accumulating the time between
+	their steps, and the furthest objects are frozen.
+
+	Attributes:
+		objects (list of :class:`game.physical_objects.PhysicalObject`): The registered objects, in index order.
+		broadphase (:class:`game.physical_objects.broadphase.SweepAndPrune`): The broadphase for finding collisions between registered objects.
+		simulation_lod (:class:`game.physical_objects.simulation_lod.SimulationLOD`): The policy for how often to simulate objects, or ``None`` to simulate every object each update.
+	"""
+
+	def __init__(self):
+		self.objects = []
+		self.broadphase = SweepAndPrune()
+		self.simulation_lod = None
+
+		self._state = {
+			'x': array('d'),
+			'y': array('d'),
+			'sleeping': array('B'),
+			'rest_ticks': array('H'),
+			'grid_changes': array('L'),
+			'step_dt': array('d'),
+			'pending_dt': array('d'),
+			'pending_ticks': array('H'),
+		}
+
+		# Objects whose update method does more than integrate their motion
+		self._behaving_objects = []
+
+	def register(self, obj):
+		"""Begins integrating the motion of an object.
+
+		Args:
+			obj (:class:`game.physical_objects.PhysicalObject`): The object to register.
+		"""
+		if obj.physics_world is self:
+			return
+
+		if obj.physics_world is not None:
+			obj.physics_world.unregister(obj)
+
+		state = self._state
+
+		state['x'].append(obj.x)
+		state['y'].append(obj.y)
+		state['sleeping'].append(False)
+		state['rest_ticks'].append(0)
+		state['grid_changes'].append(0)
+		state['step_dt'].append(0.0)
+		state['pending_dt'].append(0.0)
+		state['pending_ticks'].append(0)
+
+		obj.physics_index = len(self.objects)
+		obj.physics_world = self
+		obj.defers_sprite_updates = True
+
+		self.objects.append(obj)
+		self.broadphase.add(obj)
+
+		if obj.has_behavior():
+			self._behaving_objects.append(obj)
+
+	def unregister(self, obj):
+		"""Stops integrating the motion of an object.
+
+		Args:
+			obj (:class:`game.physical_objects.PhysicalObject`): The object to unregister.
+		"""
+		if obj.physics_world is not self:
+			return
+
+		state = self._state
+		index = obj.physics_index
+
+		obj.physics_world = None
+		obj.physics_index = None
+		obj.defers_sprite_updates = False
+
+		# Move the last object into the removed object's place
+		last_index = len(self.objects) - 1
+		if index != last_index:
+			last_obj = self.objects[last_index]
+			self.objects[index] = last_obj
+			last_obj.physics_index = index
+
+			for values in state.itervalues():
+				values[index] = values[last_index]
+
+		self.objects.pop()
+		for values in state.itervalues():
+			values.pop()
+
+		if obj in self._behaving_objects:
+			self._behaving_objects.remove(obj)
+
+		self.broadphase.remove(obj)
+
+		obj.update_sprite_position()
+
+	def is_sleeping(self, obj):
+		"""Returns whether a registered object is sleeping.
+
+		Args:
+			obj (:class:`game.physical_objects.PhysicalObject`): The registered object.
+
+		Objects which have been set in motion since they fell asleep are
+		awake, even before the next update wakes them.
+
+		Args:
+			obj (:class:`game.physical_objects.PhysicalObject`): The registered object.
+
+		Returns:
+			True if the object is sleeping, False otherwise.
+		"""
+		return bool(self._state['sleeping'][obj.physics_index]) and not _is_in_motion(obj)
+
+	def wake(self, obj):
+		"""Wakes a registered object, so its motion is integrated again.
+
+		Args:
+			obj (:class:`game.physical_objects.PhysicalObject`): The registered object.
+		"""
+		self._wake(obj.physics_index)
+
+	def _wake(self, index):
+		"""Wakes the object at an index, and restarts counting how long it has rested.
+
+		Args:
+			index (int): The physics index of the object.
+		"""
+		self._state['sleeping'][index] = False
+		self._state['rest_ticks'][index] = 0
+
+	def _set_position(self, index, name, value):
+		"""Stores a coordinate of an object which has moved, waking the object if it's sleeping.
+
+		Args:
+			index (int): The physics index of the object.
+			name (str): The name of the coordinate, either ``'x'`` or ``'y'``.
+			value (float): The new value of the coordinate.
+		"""
+		values = self._state[name]
+
+		# Scripts move sleeping objects by changing their position
+		if values[index] != value and self._state['sleeping'][index]:
+			self._wake(index)
+
+		values[index] = value
+
+	def update(self, dt):
+		"""Updates all registered objects.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		objects = self.objects
+		if not objects:
+			return
+
+		state = self._state
+		step_dt = state['step_dt']
+
+		if self.simulation_lod is None:
+			step_dt[:] = array('d', [dt]) * len(objects)
+		else:
+			self._schedule_steps(dt)
+
+		# Update object behavior, such as input handling, before integrating
+		for obj in self._behaving_objects:
+			obj_dt = step_dt[obj.physics_index]
+
+			if obj_dt:
+				obj.update(obj_dt)
+
+		x = state['x']
+		y = state['y']
+		sleeping = state['sleeping']
+		grid_changes = state['grid_changes']
+
+		# Sleeping objects wake when they're set in motion or the stage beneath them changes
+		for index in compress(xrange(len(objects)), sleeping):
+			obj = objects[index]
+
+			if _is_in_motion(obj) or obj.collision_grid.changes != grid_changes[index]:
+				self._wake(index)
+
+		# Positions before the step, to tell which objects have come to rest
+		start_x = x[:]
+		start_y = y[:]
+
+		self._integrate()
+
+		for index, obj in enumerate(objects):
+			if step_dt[index] and not sleeping[index]:
+				resolve_collisions(obj)
+
+		rest_ticks = state['rest_ticks']
+
+		# Move the sprites once collisions have been resolved
+		for index, obj in enumerate(objects):
+			if sleeping[index] or not step_dt[index]:
+				continue
+
+			obj.update_sprite_position()
+
+			# Objects which stay still on the ground for long enough are put to sleep
+			if x[index] == start_x[index] and y[index] == start_y[index] and not _is_in_motion(obj):
+				rest_ticks[index] += 1
+
+				if rest_ticks[index] >= PHYSICS_SLEEP_TICKS:
+					sleeping[index] = True
+					grid_changes[index] = obj.collision_grid.changes
+			else:
+				rest_ticks[index] = 0
+
+		self.broadphase.update()
+		self.broadphase.dispatch_collisions()
+
+	def _schedule_steps(self, dt):
+		"""Sets how far to step each object this update, according to the simulation level of detail policy.
+
+		Objects which are not stepped this update accumulate the time
+		until their next step. Frozen objects are advanced analytically
+		instead, and are never stepped.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		state = self._state
+		step_dt = state['step_dt']
+		pending_dt = state['pending_dt']
+		pending_ticks = state['pending_ticks']
+		get_update_interval = self.simulation_lod.get_update_interval
+
+		for index, obj in enumerate(self.objects):
+			interval = get_update_interval(obj)
+
+			if not interval:
+				step_dt[index] = 0.0
+				pending_dt[index] = 0.0
+				pending_ticks[index] = 0
+
+				obj.simulate_analytically(dt)
+			elif pending_ticks[index] + 1 >= interval:
+				step_dt[index] = pending_dt[index] + dt
+				pending_dt[index] = 0.0
+				pending_ticks[index] = 0
+			else:
+				step_dt[index] = 0.0
+				pending_dt[index] += dt
+				pending_ticks[index] += 1
+
+	def _integrate(self):
+		"""Integrates the velocity of every registered object which is stepped this update, and finds where it's moving to.
+
+		This performs the same integration as
+		:func:`game.physical_objects.PhysicalObject.update` for all
+		objects in a single pass, with each object's step time.
+		"""
+		state = self._state
+		x = state['x']
+		y = state['y']
+		sleeping = state['sleeping']
+		step_dt = state['step_dt']
+
+		for index, obj in enumerate(self.objects):
+			dt = step_dt[index]
+
+			if sleeping[index] or not dt:
+				continue
+
+			# Limit horizontal acceleration when in air
+			if obj.in_air:
+				horizontal_acceleration = obj.acceleration_x * 0.2
+			else:
+				horizontal_acceleration = obj.acceleration_x
+
+			target = obj.target_speed
+			vx = horizontal_acceleration*target + (1-horizontal_acceleration)*obj.velocity_x
+
+			if abs(vx) <= abs(target) + 1:
+				vx = target
+
+			vy = obj.velocity_y + obj.acceleration_y * dt
+
+			obj.velocity_x = vx
+			obj.velocity_y = vy
+			obj.moving_to_x = x[index] + vx * dt
+			obj.moving_to_y = y[index] + vy * dt
+
+
+
+def _is_in_motion(obj):
+	"""Returns whether an object has been set in motion, and so can't rest.
+
+	Args:
+		obj (:class:`game.physical_objects.PhysicalObject`): The object to check.
+
+	Returns:
+		True if the object is in the air or has a velocity or target speed, False otherwise.
+	"""
+	return bool(obj.in_air or obj.velocity_x or obj.velocity_y or obj.target_speed)
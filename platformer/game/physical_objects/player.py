@@ -6,6 +6,9 @@ import game.load
 
 class Player(HitboxPhysicalObject):
 
+	# Dashing is fast enough to skip past the corners of tiles at low simulation rates
+	continuous_collisions = True
+
 	def __init__(self, *args, **kwargs):
 		super(Player, self).__init__(*args, **kwargs)
 
@@ -1,7 +1,7 @@
-import physicalobject
+from hitbox_physical_object import HitboxPhysicalObject
 from ..settings import general_settings
 
-class SimpleAI(physicalobject.PhysicalObject):
+class SimpleAI(HitboxPhysicalObject):
 	
 	def __init__(self, speed=150, *args, **kwargs):
 		super(SimpleAI, self).__init__(*args, **kwargs)
@@ -35,13 +35,49 @@ class SimpleAI(physicalobject.PhysicalObject):
 		
 		self.destination_x = None
 	
+	def simulate_analytically(self, dt):
+		"""Continues walking to the destination without simulating physics.
+
+		The walk stops early if a solid tile is in the way. Slopes are
+		walked through, and are resolved once the object is simulated again.
+
+		Args:
+			dt (float): The number of seconds since the last update.
+		"""
+		if self.destination_x is None or not self.target_speed:
+			return
+		
+		distance = self.destination_x - self.x
+		step = self.target_speed * dt
+		arrived = abs(step) >= abs(distance)
+		
+		if arrived:
+			step = distance
+		
+		impact = self.collision_grid.sweep(self.x, self.y, self.width, self.height, step, 0)
+		
+		if impact:
+			self.x += step * impact[0]
+			
+			if step > 0:
+				self.on_right_collision()
+			else:
+				self.on_left_collision()
+		elif arrived:
+			self.x = self.destination_x
+			
+			self.destination_x = None
+			self.target_speed = 0
+		else:
+			self.x += step
+	
 	
 	
 	def update(self, dt):
 		super(SimpleAI, self).update(dt)
 		
 		if self.destination_x != None and ((self.target_speed < 0 and self.hitbox.x <= self.destination_x) or (self.target_speed > 0 and self.hitbox.x >= self.destination_x)):
-			super(SimpleAI, self).set_x(self.destination_x)
+			self.x = self.destination_x
 			
 			self.destination_x = None
 			self.target_speed = 0
\ No newline at end of file
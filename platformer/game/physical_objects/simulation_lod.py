@@ -0,0 +1,61 @@
+from ..settings.general_settings import SIMULATION_LOD_NEAR_DISTANCE, SIMULATION_LOD_FAR_DISTANCE, SIMULATION_LOD_FAR_INTERVAL
+
+class SimulationLOD(object):
+	"""Policy for how often to simulate objects, by their distance from the viewport.
+
+	Objects near the viewport are simulated every update. Objects
+	further away are simulated every few updates, with the time since
+	they were last simulated accumulated into a single step. Objects
+	beyond the far distance are frozen, and are only advanced by their
+	:func:`game.physical_objects.PhysicalObject.simulate_analytically`
+	method.
+
+	Distances are measured from the edges of the viewport to the
+	nearest edges of an object, so objects on screen are always near.
+
+	Example:
+		>>> physics_world.simulation_lod = SimulationLOD(camera)
+
+	Attributes:
+		viewport (:class:`game.bounded_box.BoundedBox`): The viewport to measure distances from.
+		near_distance (int): The distance within which objects are simulated every update, in pixels.
+		far_distance (int): The distance beyond which objects are frozen, in pixels.
+		far_interval (int): The number of updates between each simulation step of objects between the near and far distances.
+	"""
+
+	def __init__(self, viewport, near_distance=SIMULATION_LOD_NEAR_DISTANCE, far_distance=SIMULATION_LOD_FAR_DISTANCE, far_interval=SIMULATION_LOD_FAR_INTERVAL):
+		"""Creates a simulation level of detail policy.
+
+		Args:
+			viewport (:class:`game.bounded_box.BoundedBox`): The viewport to measure distances from.
+
+		Kwargs:
+			near_distance (int): The distance within which objects are simulated every update, in pixels.
+			far_distance (int): The distance beyond which objects are frozen, in pixels.
+			far_interval (int): The number of updates between each simulation step of objects between the near and far distances.
+		"""
+		self.viewport = viewport
+		self.near_distance = near_distance
+		self.far_distance = far_distance
+		self.far_interval = far_interval
+
+	def get_update_interval(self, obj):
+		"""Returns how often an object should be simulated.
+
+		Args:
+			obj (:class:`game.physical_objects.PhysicalObject`): The object to simulate.
+
+		Returns:
+			The number of updates between each simulation step of the object, or 0 if the object should be frozen.
+		"""
+		viewport = self.viewport
+
+		# Objects overlapping the viewport have a negative distance
+		distance = max(viewport.x - obj.x2, obj.x - viewport.x2, viewport.y - obj.y2, obj.y - viewport.y2)
+
+		if distance <= self.near_distance:
+			return 1
+		elif distance <= self.far_distance:
+			return self.far_interval
+
+		return 0
@@ -0,0 +1,218 @@
+from collections import OrderedDict
+from settings.general_settings import RESOURCE_CACHE_BUDGET
+
+def get_image_size(image):
+	"""Estimates the number of bytes of memory used by an image.
+
+	Textures are assumed to be stored as RGBA, while image data is
+	measured by its pixel format.
+
+	Args:
+		image (:class:`pyglet.image.AbstractImage`): The image to measure, or None.
+
+	Returns:
+		The estimated size of the image in bytes.
+	"""
+	if image is None:
+		return 0
+
+	bytes_per_pixel = len(getattr(image, 'format', 'RGBA'))
+
+	return image.width * image.height * bytes_per_pixel
+
+class ResourceCache(object):
+	"""A cache of loaded resources with a memory budget.
+
+	Each resource is cached with an estimate of its size in bytes. When
+	the total size exceeds the budget, the least recently used resources
+	are evicted until the cache fits within the budget again. Resources
+	which are pinned, such as those used by the current level, are never
+	evicted. A resource which is still referenced elsewhere stays alive
+	after being evicted, but will be loaded again the next time it is
+	requested from the cache.
+
+	Example:
+		>>> resource_cache.add(('tileset', 'forest'), tileset_data, size)
+		>>> resource_cache.pin(('tileset', 'forest'))
+		>>> resource_cache.get(('tileset', 'forest'))
+
+	Attributes:
+		budget (int): The total size of resources to keep cached, in bytes. Pinned resources can exceed the budget.
+		size (int): The total size of the cached resources, in bytes.
+		hits (int): The number of times a requested resource was cached.
+		misses (int): The number of times a requested resource was not cached.
+		evictions (int): The number of resources evicted to stay within the budget.
+	"""
+
+	def __init__(self, budget=RESOURCE_CACHE_BUDGET):
+		"""Creates an empty resource cache.
+
+		Kwargs:
+			budget (int): The total size of resources to keep cached, in bytes.
+		"""
+		self.budget = budget
+		self.size = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+		# Cached resources as key: (resource, size), from least to most recently used
+		self._resources = OrderedDict()
+
+		# The number of times each pinned resource has been pinned, as key: pin count
+		self._pins = {}
+
+	def get(self, key, default=None):
+		"""Returns a cached resource, marking it as recently used.
+
+		Args:
+			key: The key the resource was cached with.
+
+		Kwargs:
+			default: The value to return if the resource is not cached.
+
+		Returns:
+			The cached resource, or ``default`` if it is not cached.
+		"""
+		if not key in self._resources:
+			self.misses += 1
+			return default
+
+		self.hits += 1
+
+		# Move the resource to the most recently used end
+		entry = self._resources.pop(key)
+		self._resources[key] = entry
+
+		return entry[0]
+
+	def add(self, key, resource, size=0):
+		"""Caches a resource, replacing any resource cached with the same key.
+
+		Least recently used resources are evicted if the cache exceeds its
+		budget, although the added resource is never evicted by adding it.
+
+		Args:
+			key: The key to cache the resource with.
+			resource: The resource to cache.
+
+		Kwargs:
+			size (int): The size of the resource in bytes.
+		"""
+		if key in self._resources:
+			self.size -= self._resources.pop(key)[1]
+
+		self._resources[key] = (resource, size)
+		self.size += size
+
+		self._evict(key)
+
+	def pop(self, key):
+		"""Removes a resource from the cache, even if it is pinned.
+
+		Args:
+			key: The key the resource was cached with.
+
+		Returns:
+			The removed resource.
+
+		Raises:
+			KeyError: If the resource is not cached.
+		"""
+		resource, size = self._resources.pop(key)
+		self.size -= size
+		self._pins.pop(key, None)
+
+		return resource
+
+	def pin(self, key):
+		"""Prevents a cached resource from being evicted until it is unpinned.
+
+		Resources can be pinned multiple times, and are not evicted until
+		they have been unpinned as many times.
+
+		Args:
+			key: The key the resource was cached with.
+
+		Raises:
+			KeyError: If the resource is not cached.
+		"""
+		if not key in self._resources:
+			raise KeyError(key)
+
+		self._pins[key] = self._pins.get(key, 0) + 1
+
+	def unpin(self, key):
+		"""Allows a pinned resource to be evicted once it has been unpinned as many times as it was pinned.
+
+		Unpinning a resource which is not pinned has no effect.
+
+		Args:
+			key: The key the resource was cached with.
+		"""
+		if key in self._pins:
+			self._pins[key] -= 1
+
+			if not self._pins[key]:
+				del self._pins[key]
+				self._evict()
+
+	def is_pinned(self, key):
+		"""Returns whether a resource is pinned.
+
+		Args:
+			key: The key the resource was cached with.
+
+		Returns:
+			True if the resource is pinned, False otherwise.
+		"""
+		return key in self._pins
+
+	def keys(self):
+		"""Returns the keys of the cached resources, from least to most recently used.
+
+		Returns:
+			A list of keys.
+		"""
+		return self._resources.keys()
+
+	def get_hit_rate(self):
+		"""Returns the fraction of requested resources which were cached.
+
+		Returns:
+			The hit rate from 0 to 1, or 0 if no resources have been requested.
+		"""
+		requests = self.hits + self.misses
+
+		return float(self.hits) / requests if requests else 0.0
+
+	def _evict(self, keep_key=None):
+		"""Evicts the least recently used unpinned resources until the cache is within its budget.
+
+		Kwargs:
+			keep_key: The key of a resource which should not be evicted.
+		"""
+		if self.size <= self.budget:
+			return
+
+		for key in self._resources.keys():
+			if key != keep_key and not key in self._pins:
+				self.size -= self._resources.pop(key)[1]
+				self.evictions += 1
+
+				if self.size <= self.budget:
+					return
+
+	def __contains__(self, key):
+		"""Returns whether a resource is cached, without marking it as recently used.
+
+		Args:
+			key: The key the resource was cached with.
+
+		Returns:
+			True if the resource is cached, False otherwise.
+		"""
+		return key in self._resources
+
+"""The cache shared by loaded resources such as tilesets and tile image data."""
+resource_cache = ResourceCache()
@@ -1,5 +1,12 @@
 from pyglet.clock import get_fps as pyglet_get_fps
+import game
 
 def get_fps():
-	"""Returns the current frame rate as an integer in a string."""
-	return str(int(pyglet_get_fps()))
+	"""Returns the draw rate and simulation rate as integers in a string.
+
+	If no scheduler is running, only the frame rate is returned.
+	"""
+	if game.scheduler is None:
+		return str(int(pyglet_get_fps()))
+
+	return '{0} fps / {1} ups'.format(int(game.scheduler.get_draw_rate()), int(game.scheduler.get_simulation_rate()))
@@ -6,11 +6,26 @@ TILE_SIZE = 32
 TILE_SIZE_FLOAT = float(TILE_SIZE)
 GRAVITY = 9.8
 
+TILE_MAP_CHUNK_SIZE = 32 # Width and height of tile map chunks, in tiles
+TILE_MAP_CHUNK_BUDGET = 36 # Maximum number of tile map chunks to keep loaded
+TEXTURE_ATLAS_SIZE = 1024 # Width and height of texture atlases, in pixels
+RESOURCE_CACHE_BUDGET = 64 * 1024 * 1024 # Total size of cached resources such as tilesets, in bytes
+SIMULATION_LOD_NEAR_DISTANCE = 8 * TILE_SIZE # Distance from the viewport within which objects are simulated every update, in pixels
+SIMULATION_LOD_FAR_DISTANCE = 32 * TILE_SIZE # Distance from the viewport beyond which objects are frozen, in pixels
+SIMULATION_LOD_FAR_INTERVAL = 4 # Number of updates between simulation steps of objects which are neither near nor frozen
+
 RESOURCE_PATH = get_script_home() + '/resources/'
 TILESET_DIRECTORY = 'tilesets'
 LEVEL_DIRECTORY = 'levels'
 LEVEL_FORMAT = 'json'
 MAP_DIRECTORY = 'maps'
 MAP_FORMAT = 'json'
+COMPILED_LEVEL_DIRECTORY = 'compiled'
+COMPILED_LEVEL_FORMAT = 'lvl'
+LOAD_COMPILED_LEVELS = True # Whether to load compiled levels when they are available
+LEVEL_PRELOAD_WORKERS = 2 # Number of worker threads for preloading levels
 SCRIPT_DIRECTORY = 'scripts'
 SCRIPT_FORMAT = 'py'
+MAX_SIMULATION_STEPS = 5 # Maximum number of fixed simulation steps to run per frame
+MAX_SKIPPED_FRAMES = 4 # Maximum number of consecutive frames to skip drawing while the simulation catches up
+PHYSICS_SLEEP_TICKS = 30 # Number of consecutive updates a physical object must rest on the ground before it sleeps
@@ -5,9 +5,21 @@ from test_bounded_box import *
 from test_extended_sprite import *
 from test_tile_factory import *
 from test_tilesets import *
+from test_texture_atlas import *
+from test_resource_cache import *
 from test_load_tile_map import *
+from test_compiled_level import *
+from test_level_preloader import *
+from test_level_stack import *
 from test_tile_maps import *
+from test_collision_grid import *
+from test_chunked_tile_map import *
+from test_vertex_tile_map import *
+from test_physics_world import *
+from test_broadphase import *
 from test_easing import *
+from test_fixed_step_scheduler import *
+from test_benchmarks import *
 from test_animations import *
 from test_viewport import *
 from test_graphics_factory import *
@@ -0,0 +1,48 @@
+import unittest
+from pyglet.window import key
+from game.benchmarks import ScriptedKeyHandler, BenchmarkResult, run_benchmark, generate_value_map
+
+class TestBenchmarks(unittest.TestCase):
+	"""Tests the :mod:`game.benchmarks` harness."""
+
+	def test_scripted_key_handler(self):
+		"""Tests that scripted keys are pressed for their segment and the script loops."""
+		key_handler = ScriptedKeyHandler([(2, [key.RIGHT]), (1, [key.RIGHT, key.UP])])
+		pressed = []
+
+		for i in xrange(6):
+			pressed.append((key_handler[key.RIGHT], key_handler[key.UP], key_handler[key.LEFT]))
+			key_handler.advance()
+
+		self.assertEqual([(True, False, False), (True, False, False), (True, True, False)] * 2, pressed,
+			"Scripted key handler pressed the wrong keys.")
+
+	def test_percentiles(self):
+		"""Tests nearest rank percentiles of tick latencies."""
+		result = BenchmarkResult('test', {}, [float(i) for i in xrange(100, 0, -1)], [0] * 100, 0)
+
+		self.assertEqual((1.0, 50.0, 95.0, 99.0, 100.0), tuple(result.get_percentile(p) for p in (0, 50, 95, 99, 100)),
+			"Benchmark result calculated incorrect percentiles.")
+		self.assertEqual(10, result.get_ticks_over_budget(90.0),
+			"Benchmark result counted the wrong number of ticks over budget.")
+
+	def test_run_benchmark(self):
+		"""Tests that each measured tick is run with the fixed time step."""
+		time_steps = []
+		result = run_benchmark('test', {}, time_steps.append, 5, warmup_ticks=2, dt=0.5)
+
+		self.assertEqual([0.5] * 7, time_steps,
+			"Benchmark did not run each tick with the fixed time step.")
+		self.assertEqual(5, len(result.latencies),
+			"Benchmark measured warmup ticks.")
+
+	def test_generated_maps(self):
+		"""Tests that maps are generated deterministically."""
+		value_map, ground_heights = generate_value_map(30, 100, seed=5)
+
+		self.assertEqual((value_map, ground_heights), generate_value_map(30, 100, seed=5),
+			"Map generation was not deterministic.")
+		self.assertEqual((30, 100), (len(value_map), len(value_map[0])),
+			"Map generation created a map of the wrong size.")
+		self.assertTrue(all(value_map[0]),
+			"Map generation did not create ground along the bottom of the map.")
@@ -82,3 +82,52 @@ class TestBoundedBox(unittest.TestCase):
 	def test_box_equality(self):
 		"""Tests checking for the equality of BoundedBoxes."""
 		bounded_box.run_box_equality_tests(self)
+
+
+
+	def test_intersect_into(self):
+		"""Tests storing the intersection of two BoundedBoxes in an existing box."""
+		box = BoundedBox(0, 0, TILE_SIZE * 2, TILE_SIZE * 2)
+		out = BoundedBox(0, 0, 0, 0)
+
+		self.assertIs(out, box.intersect_into(BoundedBox(TILE_SIZE, -TILE_SIZE, TILE_SIZE * 2, TILE_SIZE * 2), out),
+			"Intersection was not stored in the given box.")
+		self.assertEqual(BoundedBox(TILE_SIZE, 0, TILE_SIZE, TILE_SIZE), out,
+			"Intersection was stored incorrectly.")
+		self.assertEqual((1, 0, 1, 0), (out.x_tile, out.y_tile, out.x2_tile, out.y2_tile),
+			"Tile indices of the intersection are incorrect.")
+
+		# Boxes which do not overlap leave the given box unchanged
+		self.assertIsNone(box.intersect_into(BoundedBox(TILE_SIZE * 2, 0, TILE_SIZE, TILE_SIZE), out),
+			"Boxes which only touch were considered intersecting.")
+		self.assertEqual(BoundedBox(TILE_SIZE, 0, TILE_SIZE, TILE_SIZE), out,
+			"Box was changed by an empty intersection.")
+
+		# Boxes can store the intersection in themselves
+		box.intersect_into(out, box)
+		self.assertEqual(out, box,
+			"Intersection was stored incorrectly in an intersected box.")
+
+
+
+	def test_lazy_tile_indices(self):
+		"""Tests that cached tile indices are updated when a BoundedBox is moved or resized."""
+		box = BoundedBox(0, 0, TILE_SIZE, TILE_SIZE)
+		self.assertEqual((0, 0), (box.x_tile, box.x2_tile),
+			"Box has incorrect tile indices.")
+
+		box.x = TILE_SIZE
+		self.assertEqual((1, 1), (box.x_tile, box.x2_tile),
+			"Tile indices were not updated when the box moved.")
+
+		box.width = TILE_SIZE * 2
+		self.assertEqual((1, 2), (box.x_tile, box.x2_tile),
+			"Tile indices were not updated when the box was resized.")
+
+		self.assertIs(box, box.set_bounds(0, TILE_SIZE, TILE_SIZE, TILE_SIZE),
+			"Setting the bounds of a box did not return the box.")
+		self.assertEqual((0, 1, 0, 1), (box.x_tile, box.y_tile, box.x2_tile, box.y2_tile),
+			"Tile indices were not updated when the bounds were set.")
+
+		self.assertFalse(hasattr(box, '__dict__'),
+			"Box has an instance dictionary.")
@@ -0,0 +1,84 @@
+import unittest
+from game.bounded_box import BoundedBox
+from game.physical_objects.broadphase import SweepAndPrune
+
+class _BroadphaseTestBox(BoundedBox):
+	"""Bounded box which records the objects it was notified of colliding with."""
+
+	def __init__(self, *args, **kwargs):
+		super(_BroadphaseTestBox, self).__init__(*args, **kwargs)
+		self.collided_with = []
+
+	def handle_collision_with(self, other_obj):
+		self.collided_with.append(other_obj)
+
+class TestSweepAndPrune(unittest.TestCase):
+	"""Tests the :class:`game.physical_objects.broadphase.SweepAndPrune` class."""
+
+	def setUp(self):
+		"""Sets up a broadphase with three boxes, the first two overlapping."""
+		self.first = _BroadphaseTestBox(0, 0, 10, 10)
+		self.second = _BroadphaseTestBox(5, 5, 10, 10)
+		self.third = _BroadphaseTestBox(40, 0, 10, 10)
+
+		self.broadphase = SweepAndPrune()
+		map(self.broadphase.add, [self.first, self.second, self.third])
+
+	def assert_collisions(self, expected_pairs, message):
+		"""Asserts that the broadphase reports exactly the given pairs."""
+		actual_pairs = set(frozenset(pair) for pair in self.broadphase.get_collisions())
+		self.assertEqual(set(frozenset(pair) for pair in expected_pairs), actual_pairs, message)
+
+	def test_added_objects(self):
+		"""Tests that overlapping objects are paired when added."""
+		self.assert_collisions([(self.first, self.second)],
+			"Broadphase did not pair overlapping objects when adding them.")
+
+	def test_moving_objects(self):
+		"""Tests that pairs are updated as objects move."""
+		self.third.x = 12
+		self.broadphase.update()
+
+		self.assert_collisions([(self.first, self.second), (self.second, self.third)],
+			"Broadphase did not pair objects which moved into each other.")
+
+		self.second.x = 60
+		self.broadphase.update()
+
+		self.assert_collisions([],
+			"Broadphase did not unpair objects which moved apart.")
+
+	def test_overlap_on_x_only(self):
+		"""Tests that objects overlapping only on the x axis are not paired."""
+		self.third.x = 5
+		self.third.y = 20
+		self.broadphase.update()
+
+		self.assert_collisions([(self.first, self.second)],
+			"Broadphase paired objects which only overlap on the x axis.")
+
+	def test_touching_objects(self):
+		"""Tests that objects which only touch are not paired."""
+		self.third.x = 15
+		self.broadphase.update()
+
+		self.assert_collisions([(self.first, self.second)],
+			"Broadphase paired objects which only touch.")
+
+	def test_remove(self):
+		"""Tests that removed objects are no longer paired."""
+		self.broadphase.remove(self.second)
+
+		self.assert_collisions([],
+			"Broadphase kept pairs for a removed object.")
+
+	def test_dispatch_collisions(self):
+		"""Tests that both objects of an overlapping pair are notified."""
+		self.broadphase.dispatch_collisions()
+
+		self.assertEqual([self.second], self.first.collided_with,
+			"Broadphase did not notify the first object of its collision.")
+		self.assertEqual([self.first], self.second.collided_with,
+			"Broadphase did not notify the second object of its collision.")
+		self.assertEqual([], self.third.collided_with,
+			"Broadphase notified an object which did not collide.")
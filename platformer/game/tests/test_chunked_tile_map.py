@@ -0,0 +1,150 @@
+import unittest
+from game.tiles.chunked_tile_map import ChunkedTileMap
+from game.tiles.collision_grid import OCCUPIED, COLLIDABLE, SLOPE, FACES_LEFT
+from game.tiles.collision_tile import LeftwardSlopeCollisionTile
+from game.tiles.tileset import TilesetConfig
+from game.settings.general_settings import TILE_SIZE
+
+class _ChunkTestTile(object):
+	"""Stand-in for a tile sprite, recording its visibility and deletion."""
+
+	def __init__(self, tile_value, x, y, batch=None, group=None):
+		self.tile_value = tile_value
+		self.x = x
+		self.y = y
+		self.batch = batch
+		self.group = group
+		self.visible = True
+		self.deleted = False
+
+	def delete(self):
+		self.deleted = True
+
+class _ChunkTestTileset(object):
+	"""Stand-in for a tileset, recording the tiles it creates."""
+
+	def __init__(self, config):
+		self.config = config
+		self.created_tiles = []
+
+	def create_tile(self, tile_value, **kwargs):
+		tile = _ChunkTestTile(tile_value, **kwargs)
+		self.created_tiles.append(tile)
+		return tile
+
+class TestChunkedTileMap(unittest.TestCase):
+	"""Tests the :class:`game.tiles.chunked_tile_map.ChunkedTileMap` class."""
+
+	def setUp(self):
+		"""Creates a 40x40 tile map of 4x4 chunks, where tile 2 is a slope."""
+		self.tileset = _ChunkTestTileset(TilesetConfig('{"2": {"type": "slope", "left_height": 0, "right_height": 32}}'))
+		self.value_map = [[1] * 40 for i in xrange(40)]
+		self.value_map[0][1] = 2
+		self.value_map[0][2] = 0
+
+		self.tile_map = ChunkedTileMap(self.value_map, self.tileset, chunk_size=4, chunk_budget=20)
+
+	def get_chunk_tiles(self, chunk_x, chunk_y):
+		"""Returns the tiles created for a chunk."""
+		return self.tile_map._chunks.get((chunk_x, chunk_y), [])
+
+	def test_no_tiles_created_initially(self):
+		"""Tests that no tiles are created before the visible region is set."""
+		self.assertEqual([], self.tileset.created_tiles,
+			"Chunked tile map created tiles before being made visible.")
+
+	def test_collision_grid(self):
+		"""Tests that collision data is created from the tileset config."""
+		grid = self.tile_map.collision_grid
+
+		self.assertEqual(OCCUPIED | COLLIDABLE, grid.get_flags(0, 0),
+			"Chunked tile map flagged a basic tile incorrectly.")
+		self.assertEqual(OCCUPIED | COLLIDABLE | SLOPE | FACES_LEFT, grid.get_flags(1, 0),
+			"Chunked tile map flagged a slope tile incorrectly.")
+		self.assertEqual(0, grid.get_flags(2, 0),
+			"Chunked tile map flagged an empty tile incorrectly.")
+
+		tile = grid.tile_at(1, 0)
+		self.assertIsInstance(tile, LeftwardSlopeCollisionTile,
+			"Collision grid did not create a slope collision tile.")
+		self.assertEqual((0, 32), (tile.left_height, tile.right_height),
+			"Collision grid created a slope collision tile with incorrect heights.")
+		self.assertIsNone(grid.tile_at(2, 0),
+			"Collision grid created a collision tile for an empty cell.")
+		self.assertEqual([], self.tileset.created_tiles,
+			"Chunked tile map created tiles for its collision grid.")
+
+	def test_visible_region(self):
+		"""Tests that only chunks near the visible region are loaded."""
+		self.tile_map.set_visible_region(0, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+
+		self.assertEqual(set([(0, 0), (1, 0), (0, 1), (1, 1)]), set(self.tile_map._chunks),
+			"Chunked tile map did not load the chunks near the visible region.")
+		self.assertTrue(all(tile.visible for tile in self.get_chunk_tiles(0, 0)),
+			"Chunked tile map did not show the chunk in the visible region.")
+		self.assertFalse(any(tile.visible for tile in self.get_chunk_tiles(1, 1)),
+			"Chunked tile map showed a chunk outside the visible region.")
+
+		self.assertEqual(15, len(self.get_chunk_tiles(0, 0)),
+			"Chunked tile map created tiles for empty cells.")
+
+		# Scroll right by one chunk
+		self.tile_map.set_visible_region(4 * TILE_SIZE, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+
+		self.assertFalse(any(tile.visible for tile in self.get_chunk_tiles(0, 0)),
+			"Chunked tile map did not hide a chunk which left the visible region.")
+		self.assertTrue(all(tile.visible for tile in self.get_chunk_tiles(1, 0)),
+			"Chunked tile map did not show a chunk which entered the visible region.")
+
+	def test_compact(self):
+		"""Tests that compacting deletes only the chunks which are not visible."""
+		self.tile_map.set_visible_region(0, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+		hidden_tiles = self.get_chunk_tiles(1, 1)
+
+		self.tile_map.compact()
+
+		self.assertEqual([(0, 0)], list(self.tile_map._chunks),
+			"Compacting the chunked tile map did not delete only the chunks outside the visible region.")
+		self.assertTrue(all(tile.deleted for tile in hidden_tiles),
+			"Compacting the chunked tile map did not delete the tiles of hidden chunks.")
+
+	def test_chunk_budget(self):
+		"""Tests that the least recently visible chunks are deleted when over budget."""
+		self.tile_map.set_visible_region(0, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+		first_chunk_tiles = self.get_chunk_tiles(0, 0)
+
+		# Scroll far enough away that the first chunks are over budget
+		self.tile_map.set_visible_region(20 * TILE_SIZE, 20 * TILE_SIZE, 4 * TILE_SIZE, 4 * TILE_SIZE)
+		self.tile_map.set_visible_region(32 * TILE_SIZE, 32 * TILE_SIZE, 4 * TILE_SIZE, 4 * TILE_SIZE)
+
+		self.assertLessEqual(len(self.tile_map._chunks), 20,
+			"Chunked tile map loaded more chunks than its budget.")
+		self.assertNotIn((0, 0), self.tile_map._chunks,
+			"Chunked tile map did not unload the least recently visible chunk.")
+		self.assertTrue(all(tile.deleted for tile in first_chunk_tiles),
+			"Chunked tile map did not delete the tiles of an unloaded chunk.")
+
+	def test_batch_and_group(self):
+		"""Tests that loaded tiles use the map's batch and group."""
+		self.tile_map.set_visible_region(0, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+
+		batch = object()
+		group = object()
+		self.tile_map.batch = batch
+		self.tile_map.group = group
+
+		self.assertTrue(all(tile.batch is batch and tile.group is group for tile in self.get_chunk_tiles(0, 0)),
+			"Chunked tile map did not move its loaded tiles to the new batch and group.")
+
+		self.tile_map.set_visible_region(20 * TILE_SIZE, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+
+		self.assertTrue(all(tile.batch is batch and tile.group is group for tile in self.get_chunk_tiles(5, 0)),
+			"Chunked tile map did not create new tiles in its batch and group.")
+
+	def test_region_outside_map(self):
+		"""Tests that no chunks are visible when the region is outside the map."""
+		self.tile_map.set_visible_region(0, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+		self.tile_map.set_visible_region(-10 * TILE_SIZE, 0, 4 * TILE_SIZE, 4 * TILE_SIZE)
+
+		self.assertFalse(any(tile.visible for tile in self.get_chunk_tiles(0, 0)),
+			"Chunked tile map showed a chunk when the region was outside the map.")
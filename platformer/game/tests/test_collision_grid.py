@@ -0,0 +1,293 @@
+import math
+import unittest
+from game.tiles.collision_grid import CollisionGrid, OCCUPIED, COLLIDABLE, SLOPE, FACES_LEFT, CEILING
+from game.physical_objects.collision_resolver import resolve_collisions
+from game.physical_objects.physical_object import PhysicalObject
+from game.settings.general_settings import TILE_SIZE
+from game.tiles import collision_tile
+from game.tiles.collision_tile import custom_collision_tile_types, get_collision_tile, get_slope_height_profile, CollisionTile, LeftwardSlopeCollisionTile
+from game.tiles.tile_factory import create_tile
+from game.tiles.tileset import TilesetConfig
+from util import custom_tile_types
+from util.image import dummy_image
+
+class _FallingObject(object):
+	"""A minimal physical object falling onto a tile."""
+
+	in_air = True
+
+	def __init__(self, mid_x, y, moving_to_y):
+		self.mid_x = mid_x
+		self.y = y
+		self.moving_to_y = moving_to_y
+
+	def on_bottom_collision(self, *args):
+		pass
+
+class _GridTestTile(object):
+	"""Stand-in for a tile, providing only its collision tile."""
+
+	def __init__(self, tile_entry):
+		self.collision_tile = get_collision_tile(tile_entry)
+
+class _GridTestTileset(object):
+	"""Stand-in for a tileset, which creates tiles with dummy images."""
+
+	def __init__(self, config_data):
+		self.config = TilesetConfig(config_data)
+
+	def create_tile(self, tile_value, *args, **kwargs):
+		kwargs = dict(kwargs.items() + self.config.get_tile_entry(tile_value).items())
+
+		return create_tile(img=dummy_image(TILE_SIZE, TILE_SIZE), *args, **kwargs)
+
+class TestCollisionGrid(unittest.TestCase):
+	"""Tests the :class:`game.tiles.collision_grid.CollisionGrid` class."""
+
+	def setUp(self):
+		self.tiles = [
+			[_GridTestTile({}),	None,	get_collision_tile({'is_collidable': False})],
+			[
+				_GridTestTile({'type': 'slope', 'left_height': 0, 'right_height': 32}),
+				get_collision_tile({'type': 'slope', 'left_height': 32, 'right_height': 0, 'is_ceiling': True}),
+				None,
+			],
+		]
+
+		self.grid = CollisionGrid.from_tiles(self.tiles)
+
+	def test_grid_dimensions(self):
+		"""Tests that the grid has the dimensions of its tiles."""
+		self.assertEqual(2, self.grid.rows,
+			"Collision grid has incorrect number of rows.")
+		self.assertEqual(3, self.grid.cols,
+			"Collision grid has incorrect number of columns.")
+		self.assertEqual(6, len(self.grid.flags),
+			"Collision grid has incorrect number of cells.")
+
+	def test_grid_flags(self):
+		"""Tests that each cell of the grid is flagged correctly."""
+		self.assertEqual(OCCUPIED | COLLIDABLE, self.grid.get_flags(0, 0),
+			"Collision grid flagged a basic tile incorrectly.")
+		self.assertEqual(0, self.grid.get_flags(1, 0),
+			"Collision grid flagged an empty tile incorrectly.")
+		self.assertEqual(OCCUPIED, self.grid.get_flags(2, 0),
+			"Collision grid flagged a non-collidable tile incorrectly.")
+		self.assertEqual(OCCUPIED | COLLIDABLE | SLOPE | FACES_LEFT, self.grid.get_flags(0, 1),
+			"Collision grid flagged a leftward slope tile incorrectly.")
+		self.assertEqual(OCCUPIED | COLLIDABLE | SLOPE | FACES_LEFT | CEILING, self.grid.get_flags(1, 1),
+			"Collision grid flagged a leftward ceiling slope tile incorrectly.")
+
+	def test_grid_slope_heights(self):
+		"""Tests that slope heights are stored for slope tiles only."""
+		self.assertEqual((0, 0), (self.grid.left_heights[0], self.grid.right_heights[0]),
+			"Collision grid stored slope heights for a basic tile.")
+		self.assertEqual((0, 32), (self.grid.left_heights[3], self.grid.right_heights[3]),
+			"Collision grid stored incorrect heights for a leftward slope tile.")
+		self.assertEqual((32, 0), (self.grid.left_heights[4], self.grid.right_heights[4]),
+			"Collision grid stored incorrect heights for a ceiling slope tile.")
+
+	def test_grid_collision_tiles(self):
+		"""Tests that cells store shared collision tiles."""
+		self.assertIs(self.tiles[0][0].collision_tile, self.grid.tile_at(0, 0),
+			"Collision grid did not store the tile's collision tile.")
+		self.assertIs(self.tiles[0][2], self.grid.tile_at(2, 0),
+			"Collision grid did not store a collision tile directly.")
+		self.assertIsNone(self.grid.tile_at(1, 0),
+			"Collision grid stored a collision tile for an empty cell.")
+		self.assertEqual(5, len(self.grid.collision_tiles),
+			"Collision grid did not store each distinct collision tile once.")
+
+	def test_set_tile(self):
+		"""Tests replacing tiles in the grid."""
+		tile = get_collision_tile({'type': 'slope', 'left_height': 0, 'right_height': 16})
+		self.grid.set_tile(1, 0, tile)
+
+		self.assertIs(tile, self.grid.tile_at(1, 0),
+			"Collision grid did not store the new tile.")
+		self.assertEqual(OCCUPIED | COLLIDABLE | SLOPE | FACES_LEFT, self.grid.get_flags(1, 0),
+			"Collision grid did not update flags for the new tile.")
+		self.assertEqual(16, self.grid.right_heights[1],
+			"Collision grid did not update slope heights for the new tile.")
+
+		self.grid.set_tile(1, 0, None)
+
+		self.assertIsNone(self.grid.tile_at(1, 0),
+			"Collision grid did not remove the tile.")
+		self.assertEqual(0, self.grid.get_flags(1, 0),
+			"Collision grid did not clear flags for the removed tile.")
+		self.assertEqual(0, self.grid.right_heights[1],
+			"Collision grid did not clear slope heights for the removed tile.")
+
+	def test_sweep(self):
+		"""Tests sweeping a box through the grid to its first collision."""
+		solid = get_collision_tile({})
+		slope = get_collision_tile({'type': 'slope', 'left_height': 0, 'right_height': 32})
+
+		# A floor with a single block on it, and a slope beside the block
+		grid = CollisionGrid(6, 8)
+		for x in xrange(8):
+			grid.set_tile(x, 0, solid)
+		grid.set_tile(5, 1, solid)
+		grid.set_tile(4, 1, slope)
+
+		self.assertEqual((0.5, 0, 1), grid.sweep(32, 96, 32, 32, 0, -128),
+			"Falling box did not land on the floor.")
+		self.assertEqual((0.25, -1, 0), grid.sweep(64, 32, 32, 32, 256, 0),
+			"Box moving right did not collide with the side of the block.")
+		self.assertIsNone(grid.sweep(32, 64, 32, 32, -32, 0),
+			"Box collided while moving through empty cells.")
+
+		# Boxes already resting on the floor collide immediately when moving down
+		self.assertEqual((0.0, 0, 1), grid.sweep(32, 32, 32, 32, 64, -4),
+			"Box resting on the floor did not collide with it.")
+
+		# Fast diagonal moves can't skip the corner of the block
+		impact = grid.sweep(96, 96, 32, 32, 96, -96)
+		self.assertEqual((0, 1), impact[1:],
+			"Box moving diagonally passed through the corner of the block.")
+		self.assertAlmostEqual(1 / 3.0, impact[0],
+			msg="Box moving diagonally collided at the wrong time.")
+
+		# Slopes are resolved by their tiles rather than by sweeping
+		self.assertIsNone(grid.sweep(96, 32, 32, 32, 16, 0),
+			"Box collided with a slope.")
+
+class TestCollisionTiles(unittest.TestCase):
+	"""Tests the :mod:`game.tiles.collision_tile` module."""
+
+	def test_shared_collision_tiles(self):
+		"""Tests that collision tiles are shared between identical config entries."""
+		tile = get_collision_tile({'type': 'slope', 'left_height': 0, 'right_height': 32})
+
+		self.assertIsInstance(tile, LeftwardSlopeCollisionTile,
+			"Collision tile factory created the wrong slope collision tile.")
+		self.assertIs(tile, get_collision_tile({'right_height': 32, 'left_height': 0, 'type': 'slope'}),
+			"Collision tile was not shared between identical config entries.")
+		self.assertIsNot(tile, get_collision_tile({'type': 'slope', 'left_height': 0, 'right_height': 16}),
+			"Collision tile was shared between different config entries.")
+
+	def test_unregistered_types(self):
+		"""Tests that tile types without collision behavior act as basic tiles."""
+		custom_tile_types.register_custom()
+		tile = get_collision_tile({'type': 'custom', 'faces': 'up', 'is_collidable': False})
+
+		self.assertIs(CollisionTile, type(tile),
+			"Unregistered tile type did not create a basic collision tile.")
+		self.assertFalse(tile.is_collidable,
+			"Unregistered tile type ignored its collidability.")
+
+		with self.assertRaises(ValueError):
+			get_collision_tile({'type': 'unknown'})
+
+	def test_tiles_resolving_own_collisions(self):
+		"""Tests that collisions with custom tiles which resolve their own collisions are resolved by the tiles."""
+		custom_tile_types.register_bouncy()
+		tile = custom_tile_types.BouncyTile(dummy_image(TILE_SIZE, TILE_SIZE))
+		grid = CollisionGrid.from_tiles([[tile], [None], [None]])
+
+		self.assertEqual(OCCUPIED | COLLIDABLE, grid.get_flags(0, 0),
+			"Collision grid flagged a tile resolving its own collisions incorrectly.")
+
+		obj = PhysicalObject(grid, dummy_image(TILE_SIZE, TILE_SIZE), y=2*TILE_SIZE)
+		obj.velocity_y = -4.0 * TILE_SIZE
+		obj.moving_to_x = obj.x
+		obj.moving_to_y = TILE_SIZE / 2
+		resolve_collisions(obj)
+
+		self.assertEqual((TILE_SIZE, 4.0 * TILE_SIZE), (obj.moving_to_y, obj.velocity_y),
+			"Collision with a tile resolving its own collisions was not resolved by the tile.")
+
+		# Value maps have no tiles to resolve collisions, so a collision tile factory is needed
+		tileset = _GridTestTileset('{"1": {"type": "bouncy"}}')
+
+		with self.assertRaises(ValueError):
+			CollisionGrid.from_value_map([[1]], tileset)
+
+		custom_collision_tile_types['bouncy'] = lambda **kwargs: CollisionTile()
+		try:
+			self.assertIs(CollisionTile, type(CollisionGrid.from_value_map([[1]], tileset).tile_at(0, 0)),
+				"Collision grid did not use the collision tile factory of a tile resolving its own collisions.")
+		finally:
+			del custom_collision_tile_types['bouncy']
+
+	def test_unhashable_entries(self):
+		"""Tests that collision tiles are shared between config entries containing lists and dicts."""
+		tile = get_collision_tile({'type': 'custom', 'points': [0, 32], 'flags': {'a': [1]}})
+
+		self.assertIs(tile, get_collision_tile({'flags': {'a': [1]}, 'points': [0, 32], 'type': 'custom'}),
+			"Collision tile was not shared between identical config entries containing lists and dicts.")
+		self.assertIsNot(tile, get_collision_tile({'type': 'custom', 'points': [0, 16], 'flags': {'a': [1]}}),
+			"Collision tile was shared between config entries with different lists.")
+
+	def test_registering_types(self):
+		"""Tests that shared collision tiles are recreated once a tile type is registered."""
+		custom_tile_types.register_custom()
+		self.assertIs(CollisionTile, type(get_collision_tile({'type': 'custom'})),
+			"Tile type without collision behavior did not create a basic collision tile.")
+
+		custom_collision_tile_types['custom'] = lambda **kwargs: LeftwardSlopeCollisionTile(0, 32)
+		try:
+			self.assertIsInstance(get_collision_tile({'type': 'custom'}), LeftwardSlopeCollisionTile,
+				"Collision tile was not recreated once its tile type was registered.")
+		finally:
+			del custom_collision_tile_types['custom']
+
+		self.assertIs(CollisionTile, type(get_collision_tile({'type': 'custom'})),
+			"Collision tile was not recreated once its tile type was removed.")
+
+	def test_no_instance_dict(self):
+		"""Tests that collision tiles do not carry per-instance dictionaries."""
+		self.assertFalse(hasattr(get_collision_tile({}), '__dict__'),
+			"Basic collision tile has an instance dictionary.")
+		self.assertFalse(hasattr(get_collision_tile({'type': 'slope', 'left_height': 32, 'right_height': 0}), '__dict__'),
+			"Slope collision tile has an instance dictionary.")
+
+	def test_slope_height_profiles(self):
+		"""Tests that slope heights are precomputed for each column of pixels and shared between slopes."""
+		heights, steps, stepped_heights = profile = get_slope_height_profile(0, 16)
+
+		self.assertEqual((TILE_SIZE, TILE_SIZE, TILE_SIZE), (len(heights), len(steps), len(stepped_heights)),
+			"Slope height profile does not have a height for each column.")
+		self.assertEqual([0, 1, 1, 2, 2], list(heights[:5]),
+			"Slope height profile has incorrect heights.")
+
+		tile = get_collision_tile({'type': 'slope', 'left_height': 0, 'right_height': 16})
+		self.assertIs(profile, tile.height_profile,
+			"Slope collision tile did not share its height profile.")
+
+		# Objects land on the height of the slope beneath their center
+		obj = _FallingObject(mid_x=32 + 8, y=48, moving_to_y=30)
+		self.assertTrue(tile.resolve_collision_y(obj, 1, 1),
+			"Falling object did not collide with a slope.")
+		self.assertEqual(32 + 4, obj.moving_to_y,
+			"Object landed at the wrong height on a slope.")
+
+		obj = _FallingObject(mid_x=32 + 7.5, y=48, moving_to_y=30)
+		tile.resolve_collision_y(obj, 1, 1)
+		self.assertEqual(32 + 4, obj.moving_to_y,
+			"Object between pixels landed at the wrong height on a slope.")
+
+	def test_slope_heights(self):
+		"""Tests that slopes whose rise does not divide the tile size land objects at the heights of the line between their ends, rounded up."""
+		for left_height, right_height in ((0, 17), (17, 32), (32, 15), (23, 0)):
+			tile = get_collision_tile({'type': 'slope', 'left_height': left_height, 'right_height': right_height})
+
+			for eighth in xrange(-8, 8 * TILE_SIZE + 9):
+				position_on_tile = eighth / 8.0
+				fraction = min(max(position_on_tile / TILE_SIZE, 0), 1)
+
+				obj = _FallingObject(mid_x=TILE_SIZE + position_on_tile, y=3 * TILE_SIZE, moving_to_y=TILE_SIZE)
+				tile.resolve_collision_y(obj, 1, 1)
+
+				self.assertEqual(TILE_SIZE + math.ceil((1-fraction)*left_height + fraction*right_height), obj.moving_to_y,
+					"Object landed at the wrong height {0} pixels across a {1}-{2} slope.".format(position_on_tile, left_height, right_height))
+
+	def test_tileset_config_slope_heights(self):
+		"""Tests that slope heights are precomputed when tileset configs are loaded."""
+		collision_tile._slope_height_profiles.pop((5, 27), None)
+
+		TilesetConfig('{"1": {"type": "slope", "left_height": 5, "right_height": 27}}')
+
+		self.assertIn((5, 27), collision_tile._slope_height_profiles,
+			"Slope heights were not precomputed when the tileset config was loaded.")
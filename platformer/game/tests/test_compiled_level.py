@@ -0,0 +1,73 @@
+import os
+import unittest
+from game.load.compiled_level import compile_level, load_compiled_level, _HEADER, _MAGIC, _VERSION
+from game.load.level import Level
+from game.load.tile_map import load_tile_map
+from pyglet.resource import ResourceNotFoundException
+from util import resource
+
+class TestCompiledLevel(unittest.TestCase):
+	"""Tests compiling levels and loading compiled levels."""
+
+	@classmethod
+	def setUpClass(cls):
+		resource.setUp()
+
+	@classmethod
+	def tearDownClass(cls):
+		resource.tearDown()
+
+	def setUp(self):
+		self.compiled_path = compile_level('test')
+
+	def tearDown(self):
+		os.remove(self.compiled_path)
+		os.rmdir(os.path.dirname(self.compiled_path))
+
+	def test_tile_maps(self):
+		"""Tests that tile maps are resolved and flipped when compiled."""
+		level_data = load_compiled_level('test')
+
+		for layer_index, map_name in [(0, 'test3'), (1, 'test2')]:
+			value_map = level_data['layers'][layer_index]['graphic']['value_map']
+
+			self.assertEqual(load_tile_map(map_name), map(list, value_map),
+				"Compiled level did not store the tile map for layer {0}.".format(layer_index))
+
+	def test_level_config(self):
+		"""Tests that tags which can not be compiled are left for translation."""
+		level_data = load_compiled_level('test')
+
+		self.assertEqual('Test Level', level_data['title'],
+			"Compiled level did not store the level config.")
+		self.assertEqual('::tileset::test', level_data['layers'][0]['graphic']['tileset'],
+			"Compiled level did not leave a runtime tag for translation.")
+
+	def test_invalid_compiled_level(self):
+		"""Tests loading a compiled level which is missing or from another format."""
+		with open(self.compiled_path, 'r+b') as compiled_file:
+			compiled_file.write('JSON')
+
+		self.assertRaises(ValueError, load_compiled_level, 'test')
+		self.assertRaises(ResourceNotFoundException, load_compiled_level, 'missing')
+
+	def test_corrupt_manifest(self):
+		"""Tests that compiled levels with a truncated manifest can not be loaded."""
+		with open(self.compiled_path, 'r+b') as compiled_file:
+			compiled_file.write(_HEADER.pack(_MAGIC, _VERSION, 1))
+
+		self.assertRaises(ValueError, load_compiled_level, 'test')
+
+	def test_stale_compiled_level(self):
+		"""Tests that compiled levels are not loaded once their sources are modified."""
+		source_path = os.path.join(os.path.dirname(os.path.dirname(self.compiled_path)), 'levels', 'test.json')
+		source_times = os.stat(source_path)
+
+		os.utime(source_path, (source_times.st_atime, source_times.st_mtime + 10))
+		try:
+			self.assertRaises(ValueError, load_compiled_level, 'test')
+
+			self.assertEqual('::tilemap::test3', Level.load_data('test')['layers'][0]['graphic']['value_map'],
+				"Level config was not loaded in place of a stale compiled level.")
+		finally:
+			os.utime(source_path, (source_times.st_atime, source_times.st_mtime))
@@ -78,3 +78,16 @@ class TestExtendedSprite(unittest.TestCase):
 	def test_bounding(self):
 		"""Tests bounding an ExtendedSprite within another ExtendedSprite."""
 		bounded_box.run_bounding_tests(self)
+
+	def test_interpolation(self):
+		"""Tests that interpolation draws the sprite between positions without moving it."""
+		sprite = self.create_box(0, 0, 32, 32)
+		sprite.store_previous_position()
+		sprite.set_position(64, 32)
+
+		sprite.interpolate(0.5)
+
+		self.assertEqual((64, 32), sprite.position,
+			"Interpolation moved the sprite.")
+		self.assertEqual((32, 16), tuple(sprite._vertex_list.vertices[:2]),
+			"Sprite was not drawn halfway between its positions.")
@@ -0,0 +1,150 @@
+import unittest
+from pyglet import app
+from pyglet.clock import Clock
+from game.fixed_step_scheduler import FixedStepScheduler
+from game.frame_skipping_event_loop import FrameSkippingEventLoop
+
+class TestFixedStepScheduler(unittest.TestCase):
+	"""Tests the :class:`game.fixed_step_scheduler.FixedStepScheduler` class."""
+
+	def setUp(self):
+		"""Creates a scheduler which records its time steps."""
+		self.time_steps = []
+		self.scheduler = FixedStepScheduler(self.time_steps.append, step=0.25, max_steps=4)
+
+	def test_fixed_steps(self):
+		"""Tests that the simulation is only updated with the fixed time step."""
+		self.assertEqual(0, self.scheduler.tick(0.125),
+			"Scheduler ran a step before a full step accumulated.")
+		self.assertEqual(0.5, self.scheduler.alpha,
+			"Scheduler reported an incorrect fraction of a step.")
+
+		self.assertEqual(1, self.scheduler.tick(0.125),
+			"Scheduler did not run a step once a full step accumulated.")
+		self.assertEqual(0.0, self.scheduler.alpha,
+			"Scheduler reported an incorrect fraction of a step.")
+
+		self.assertEqual(2, self.scheduler.tick(0.625),
+			"Scheduler did not catch up with multiple steps.")
+		self.assertEqual(0.5, self.scheduler.alpha,
+			"Scheduler reported an incorrect fraction of a step.")
+
+		self.assertEqual([0.25] * 3, self.time_steps,
+			"Scheduler updated the simulation with a variable time step.")
+
+	def test_max_steps(self):
+		"""Tests that time which can not be caught up on is dropped."""
+		self.scheduler.max_skipped_frames = 0
+
+		self.assertEqual(4, self.scheduler.tick(10.125),
+			"Scheduler ran more than the maximum number of steps.")
+		self.assertEqual(0.5, self.scheduler.alpha,
+			"Scheduler did not keep the fraction of a step after dropping time.")
+
+		self.assertEqual(0, self.scheduler.tick(0.0),
+			"Scheduler continued catching up on dropped time.")
+
+		self.assertEqual(9.0, self.scheduler.dropped_time,
+			"Scheduler did not count the dropped time.")
+
+	def test_frame_skipping(self):
+		"""Tests that frames are skipped while the simulation catches up."""
+		self.scheduler.max_skipped_frames = 1
+
+		self.assertEqual(4, self.scheduler.tick(1.5),
+			"Scheduler ran more than the maximum number of steps.")
+		self.assertFalse(self.scheduler.should_draw,
+			"Scheduler did not skip a frame while behind.")
+
+		self.assertEqual(2, self.scheduler.tick(0.0),
+			"Scheduler did not catch up after skipping a frame.")
+		self.assertTrue(self.scheduler.should_draw,
+			"Scheduler skipped a frame after catching up.")
+
+		self.scheduler.tick(1.5)
+		self.scheduler.tick(1.5)
+		self.assertTrue(self.scheduler.should_draw,
+			"Scheduler skipped more than the maximum number of frames in a row.")
+
+		self.assertEqual((4, 3, 2, 1.0), (self.scheduler.ticks, self.scheduler.late_ticks, self.scheduler.dropped_frames, self.scheduler.dropped_time),
+			"Scheduler counted ticks, late ticks, dropped frames, or dropped time incorrectly.")
+
+	def test_rates(self):
+		"""Tests that the simulation and draw rates are measured over recent ticks."""
+		scheduler = FixedStepScheduler(lambda dt: None, step=0.125, rate_window=1.0)
+
+		for i in xrange(8):
+			scheduler.tick(0.25)
+
+		self.assertEqual((8.0, 4.0), (scheduler.get_simulation_rate(), scheduler.get_draw_rate()),
+			"Scheduler measured incorrect rates.")
+
+class RecordingWindow(object):
+	"""Stand-in for :class:`pyglet.window.Window` which records how many times it was drawn."""
+
+	def __init__(self):
+		self.invalid = True
+		self._legacy_invalid = False
+		self.draws = 0
+
+	def switch_to(self):
+		pass
+
+	def dispatch_event(self, event_type):
+		if event_type == 'on_draw':
+			self.draws += 1
+
+	def flip(self):
+		pass
+
+class TestFrameSkippingEventLoop(unittest.TestCase):
+	"""Tests the :class:`game.frame_skipping_event_loop.FrameSkippingEventLoop` class."""
+
+	def setUp(self):
+		"""Creates an event loop with a manually advanced clock and a window to draw."""
+		self.time = 0.0
+		self.scheduler = FixedStepScheduler(lambda dt: None, step=0.25, max_steps=1, max_skipped_frames=1)
+
+		self.event_loop = FrameSkippingEventLoop(self.scheduler)
+		self.event_loop.clock = Clock(time_function=lambda: self.time)
+		self.event_loop.clock.schedule_interval(self.scheduler.tick, 0.25)
+
+		self.window = RecordingWindow()
+		app.windows.add(self.window)
+
+	def tearDown(self):
+		app.windows.remove(self.window)
+
+	def test_drawing_after_ticks(self):
+		"""Tests that windows are only drawn after a tick which was not skipped."""
+		self.time = 0.25
+		self.event_loop.idle()
+		self.assertEqual(1, self.window.draws,
+			"Window was not drawn after a tick.")
+
+		# Events can run the loop between ticks
+		self.assertGreater(self.event_loop.idle(), 0.0,
+			"Event loop did not sleep until the next tick.")
+		self.assertEqual(1, self.window.draws,
+			"Window was drawn without a tick.")
+
+		# Falling behind skips the next frame
+		self.time = 1.0
+		self.event_loop.idle()
+		self.assertEqual(1, self.window.draws,
+			"Window was drawn on a skipped frame.")
+
+	def test_invalid_windows(self):
+		"""Tests that invalidated windows are redrawn while frames are skipped."""
+		self.time = 1.0
+		self.event_loop.idle()
+		self.assertFalse(self.scheduler.should_draw,
+			"Scheduler did not skip a frame while behind.")
+
+		self.window._legacy_invalid = True
+		self.event_loop.idle()
+
+		self.assertEqual(1, self.window.draws,
+			"Invalidated window was not redrawn while frames were skipped.")
+		self.assertFalse(self.window._legacy_invalid,
+			"Redrawn window was not marked as valid.")
@@ -1,8 +1,250 @@
 import unittest
+from pyglet.gl import glEnable, glBlendFunc, glMatrixMode, glPushMatrix, glPopMatrix, glLoadIdentity, glOrtho, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_PROJECTION
+from pyglet.sprite import Sprite
+from game.layers import LayerManager, create_from
+from game.layers.static_layer_cache import StaticLayerCache
+from game.physical_objects.physical_object import PhysicalObject
+from game.physical_objects.simulation_lod import SimulationLOD
+from game.settings.general_settings import FRAME_LENGTH
+from game.viewport import Camera
+from util.image import dummy_image
+
+class RecordingLayerCache(object):
+	"""Stand-in for :class:`game.layers.static_layer_cache.StaticLayerCache` which records its use."""
+
+	def __init__(self):
+		self.renders = 0
+		self.blits = 0
+
+	def render(self, draw):
+		self.renders += 1
+
+	def blit(self, x, y):
+		self.blits += 1
 
-# TODO Write layer manager tests
 class TestLayerManager(unittest.TestCase):
 
 	def setUp(self):
-		pass
+		"""Creates a layer manager with a static background, the camera target, and an NPC."""
+		self.target = PhysicalObject([[0]], dummy_image(32, 32))
+		self.npc = PhysicalObject([[0]], dummy_image(32, 32))
+		self.viewport = Camera(target=self.target, x=0, y=0, width=100, height=100)
+
+		self.background = create_from(dummy_image(100, 100), title='background', static=True, fixed=True)
+		self.player = create_from(self.target, title='player')
+		self.npcs = create_from(self.npc, title='npcs')
+
+		self.layer_manager = LayerManager(self.viewport, [self.background, self.player, self.npcs], cache_static_layers=False)
+
+	def test_dirty_layers(self):
+		"""Tests that updated layers report whether they changed."""
+		self.layer_manager.update(0)
+
+		self.assertTrue(self.player.dirty,
+			"Camera target layer was not dirty after an update.")
+		self.assertTrue(self.npcs.dirty,
+			"Graphics layer was not dirty after an update.")
+
+		# Drawing clears layers which are not updated
+		self.background.dirty = False
+		self.assertEqual(self.layer_manager._drawing_queue[:1], self.layer_manager._get_static_run(),
+			"Static run did not end at the first dirty layer.")
+
+		self.background.dirty = True
+		self.assertEqual([], self.layer_manager._get_static_run(),
+			"Static run included a dirty layer.")
+
+	def test_static_layer_cache(self):
+		"""Tests that unchanged static layers are cached and drawn from the cache."""
+		cache = RecordingLayerCache()
+		self.layer_manager._static_layer_cache = cache
+		self.layer_manager.update(0)
+		self.background.dirty = False
+
+		self.assertEqual(0, self.layer_manager._draw_static_layer_cache(),
+			"Static layers were drawn from the cache before they were unchanged for a frame.")
+		self.assertEqual(1, self.layer_manager._draw_static_layer_cache(),
+			"Unchanged static layers were not drawn from the cache.")
+		self.assertEqual(1, self.layer_manager._draw_static_layer_cache(),
+			"Unchanged static layers were not drawn from the cache.")
+		self.assertEqual((1, 2), (cache.renders, cache.blits),
+			"Unchanged static layers were not cached exactly once.")
+
+		# Fixed layers remain cached while the viewport moves
+		self.viewport.x += 10
+		self.assertEqual(1, self.layer_manager._draw_static_layer_cache(),
+			"Fixed static layers were not drawn from the cache after the viewport moved.")
+
+		self.background.dirty = True
+		self.layer_manager.update(0)
+		self.assertEqual(0, self.layer_manager._draw_static_layer_cache(),
+			"Dirty layers were drawn from the cache.")
+
+	def test_batch_coalescing(self):
+		"""Tests that batches on either side of a deleted layer are merged."""
+		transition = create_from(dummy_image(100, 100), title='transition', static=True)
+		heading = create_from(Sprite(dummy_image(10, 10)), title='heading', static=True)
+		self.layer_manager.manage_layer(transition)
+		self.layer_manager.manage_layer(heading)
+
+		drawing_queue = self.layer_manager._drawing_queue
+		self.assertEqual(4, len(drawing_queue),
+			"Self-drawing layer did not split the drawing queue into separate batches.")
+
+		transition.delete()
+
+		self.assertEqual(2, len(drawing_queue),
+			"Batches on either side of a deleted layer were not merged.")
+		self.assertTrue(heading.batch is self.player.batch is self.npcs.batch is drawing_queue[1],
+			"The smaller batch was not merged into the larger batch.")
+		self.assertFalse('transition' in self.layer_manager.layers,
+			"Deleted layer is still managed.")
+
+		heading.delete()
+
+		self.assertEqual(2, len(drawing_queue),
+			"Deleting a batched layer removed a batch which still has layers.")
+
+	def test_group_reuse(self):
+		"""Tests that ordered groups are reused once the topmost layers are deleted."""
+		heading = create_from(Sprite(dummy_image(10, 10)), title='heading', static=True)
+		self.layer_manager.manage_layer(heading)
+		heading_order = heading.group.order
+
+		heading.delete()
+
+		heading = create_from(Sprite(dummy_image(10, 10)), title='heading', static=True)
+		self.layer_manager.manage_layer(heading)
+
+		self.assertEqual(heading_order, heading.group.order,
+			"Depth of a deleted topmost layer was not reused.")
+		self.assertTrue(heading.group is self.layer_manager._groups[heading_order],
+			"Ordered group was not reused.")
+
+	def test_draw_calls(self):
+		"""Tests counting draw calls for each drawing queue entry."""
+		background, batch = self.layer_manager._drawing_queue
+
+		self.assertEqual(1, self.layer_manager._get_draw_calls(background),
+			"Self-drawing layer did not count as one draw call.")
+		self.assertEqual(2, self.layer_manager._get_draw_calls(batch),
+			"Batch did not count a draw call for each layer's group.")
+
+	def test_hidden_layers(self):
+		"""Tests that hidden layers are not drawn, and are shown at their original depth."""
+		background, batch = self.layer_manager._drawing_queue
+		npcs_group = self.npcs.group
+
+		self.layer_manager.hide_layer('npcs')
+		self.layer_manager.hide_layer('background')
+
+		self.assertFalse(self.npcs.batch is batch,
+			"Hidden layer was not removed from its batch.")
+		self.assertEqual(1, self.layer_manager._get_draw_calls(batch),
+			"Hidden layer is still drawn by its batch.")
+		self.assertEqual([batch], self.layer_manager._get_drawn_entries(self.layer_manager._drawing_queue),
+			"Hidden self-drawing layer is still drawn.")
+
+		self.layer_manager.show_layer('npcs')
+		self.layer_manager.show_layer('background')
+
+		self.assertTrue(self.npcs.batch is batch,
+			"Shown layer was not returned to its batch.")
+		self.assertTrue(self.npcs.group is npcs_group,
+			"Shown layer was not returned to its original depth.")
+		self.assertEqual([background, batch], self.layer_manager._get_drawn_entries(self.layer_manager._drawing_queue),
+			"Shown self-drawing layer is not drawn.")
+
+	def test_suspended_layers(self):
+		"""Tests that suspended layers are neither drawn nor updated."""
+		batch = self.layer_manager._drawing_queue[1]
+		npc_velocity_y = self.npc.velocity_y
+
+		self.layer_manager.suspend_layer('npcs')
+		self.layer_manager.update(0.1)
+
+		self.assertEqual(npc_velocity_y, self.npc.velocity_y,
+			"Suspended layer was updated.")
+		self.assertFalse(self.npcs.batch is batch,
+			"Suspended layer was not removed from its batch.")
+
+		# Hidden layers stay hidden after being resumed
+		self.layer_manager.hide_layer('npcs')
+		self.layer_manager.resume_layer('npcs')
+		self.layer_manager.update(0.1)
+
+		self.assertNotEqual(npc_velocity_y, self.npc.velocity_y,
+			"Resumed layer was not updated.")
+		self.assertFalse(self.npcs.batch is batch,
+			"Hidden layer was drawn after being resumed.")
+
+	def test_interpolation(self):
+		"""Tests that only objects moved by the last update are drawn between their positions."""
+		physics_world = self.layer_manager.physics_world
+		physics_world.register(self.npc)
+
+		# The NPC walks, so it's drawn between its positions
+		self.npc.set_velocities(8 / FRAME_LENGTH, 0)
+		self.layer_manager.store_previous_positions()
+		self.layer_manager.update(FRAME_LENGTH)
+		self.layer_manager.interpolate(0.5)
+
+		self.assertEqual((self.npc._previous_x + self.npc.x) / 2, self.npc._vertex_list.vertices[0],
+			"Moving object was not drawn between its positions.")
+
+		# Frozen objects aren't stepped, so they're drawn at their positions without being interpolated
+		physics_world.simulation_lod = SimulationLOD(self.viewport, near_distance=-1000, far_distance=-1000)
+		interpolations = []
+		self.npc.interpolate = interpolations.append
+
+		self.layer_manager.store_previous_positions()
+		self.layer_manager.update(FRAME_LENGTH)
+		self.layer_manager.interpolate(0.5)
+
+		self.assertEqual([], interpolations,
+			"Frozen object was interpolated.")
+		self.assertEqual(self.npc.x, self.npc._vertex_list.vertices[0],
+			"Object which stopped moving was not drawn at its position.")
+
+@unittest.skipUnless(StaticLayerCache.is_supported(), "Offscreen framebuffers are not supported.")
+class TestStaticLayerCache(unittest.TestCase):
+	"""Tests the :class:`game.layers.static_layer_cache.StaticLayerCache` class."""
+
+	def setUp(self):
+		glEnable(GL_BLEND)
+		glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+		# Draw in pixel coordinates of the cache textures
+		glMatrixMode(GL_PROJECTION)
+		glPushMatrix()
+		glLoadIdentity()
+		glOrtho(0, 4, 0, 4, -1, 1)
+
+		self.caches = []
+
+	def tearDown(self):
+		glMatrixMode(GL_PROJECTION)
+		glPopMatrix()
+
+		map(lambda cache: cache.delete(), self.caches)
+
+	def _render(self, draw):
+		"""Renders a function into a new cache, returning the colour of its first pixel."""
+		cache = StaticLayerCache(4, 4)
+		cache.render(draw)
+		self.caches.append(cache)
+
+		return cache, map(ord, cache.texture.get_image_data().get_data('RGBA', 4 * 4)[:4])
+
+	def test_translucent_layer(self):
+		"""Tests that translucent layers look the same whether they are drawn from the cache or directly."""
+		background = dummy_image(4, 4, (0, 0, 255, 255))
+		translucent = dummy_image(4, 4, (255, 0, 0, 128))
+
+		layer_cache, _ = self._render(lambda: translucent.blit(0, 0))
+		_, cached_color = self._render(lambda: (background.blit(0, 0), layer_cache.blit(0, 0)))
+		_, uncached_color = self._render(lambda: (background.blit(0, 0), translucent.blit(0, 0)))
 
+		for cached, uncached in zip(cached_color, uncached_color):
+			self.assertAlmostEqual(uncached, cached, delta=2,
+				msg="Translucent layer drawn from the cache does not match the layer drawn directly.")
@@ -0,0 +1,85 @@
+import unittest
+from pyglet.resource import ResourceNotFoundException
+from game.load.level_preloader import LevelPreloader, _preload_level
+from game.load.tile_map import load_tile_map
+from game.tiles import Tileset
+from util import resource
+
+class TestLevelPreloader(unittest.TestCase):
+	"""Tests preloading levels on worker threads."""
+
+	@classmethod
+	def setUpClass(cls):
+		resource.setUp()
+
+	@classmethod
+	def tearDownClass(cls):
+		resource.tearDown()
+
+	def setUp(self):
+		Tileset.flush_cache()
+
+	def assert_preloaded(self, preloaded_level):
+		"""Asserts that the test level's resources were decoded."""
+		self.assertEqual(load_tile_map('test3'), preloaded_level.level_data['layers'][0]['graphic']['value_map'],
+			"Level preloader did not load the level's tile maps.")
+		self.assertEqual('::tileset::test', preloaded_level.level_data['layers'][0]['graphic']['tileset'],
+			"Level preloader translated a tag on a worker thread.")
+
+		self.assertEqual(['test'], preloaded_level.tilesets.keys(),
+			"Level preloader did not decode each tileset once.")
+
+		tileset_image, tileset_config = preloaded_level.tilesets['test']
+		self.assertEqual((64, 64), (tileset_image.width, tileset_image.height),
+			"Level preloader did not decode the tileset image.")
+		self.assertEqual({'type': 'custom', 'faces': 'down'}, tileset_config.get_tile_entry(6),
+			"Level preloader did not parse the tileset config.")
+
+	def test_preload_level(self):
+		"""Tests decoding a level's resources."""
+		self.assert_preloaded(_preload_level('test'))
+
+	def test_preload_level_on_worker(self):
+		"""Tests decoding a level's resources on a worker thread."""
+		preloader = LevelPreloader(workers=1)
+		preloader.preload('test')
+
+		result, on_load, on_error = preloader._pending['test']
+		self.assert_preloaded(result.get(5))
+		self.assertTrue(preloader.is_ready('test'),
+			"Level preloader did not report a finished level as ready.")
+
+		preloader.close()
+
+	def test_cached_tilesets(self):
+		"""Tests that cached tilesets are not decoded again."""
+		Tileset._cache_tileset('test', None, None)
+
+		self.assertEqual({}, _preload_level('test').tilesets,
+			"Level preloader decoded a cached tileset.")
+
+	def test_preload_failure(self):
+		"""Tests that levels which fail to load are reported instead of raising from the clock."""
+		errors = []
+		preloader = LevelPreloader(workers=1)
+		preloader.preload('missing', on_load=self.fail, on_error=lambda level_title, error: errors.append(level_title))
+		preloader.preload('missing 2')
+
+		for level_title in ('missing', 'missing 2'):
+			preloader._pending[level_title][0].wait(5)
+
+		preloader._poll(0)
+
+		self.assertEqual(['missing'], errors,
+			"Level preloader did not pass a failed level to its error callback.")
+		self.assertEqual({}, preloader._pending,
+			"Level preloader kept failed levels pending.")
+		self.assertFalse(preloader._is_polling,
+			"Level preloader kept polling after every level finished.")
+
+		self.assertTrue(preloader.is_ready('missing 2'),
+			"Level preloader did not report a failed level as ready.")
+		with self.assertRaises(ResourceNotFoundException):
+			preloader.get_level('missing 2')
+
+		preloader.close()
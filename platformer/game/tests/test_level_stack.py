@@ -0,0 +1,75 @@
+import unittest
+from game.layers import LayerManager, create_from
+from game.load.level_stack import LevelStack
+from game.physical_objects.physical_object import PhysicalObject
+from game.viewport import Camera
+from util.image import dummy_image
+
+class _StackTestLevel(object):
+	"""Stand-in for a level, with a layer manager for a single falling object."""
+
+	def __init__(self):
+		self.player = PhysicalObject([[0]], dummy_image(32, 32))
+		viewport = Camera(target=self.player, x=0, y=0, width=100, height=100)
+		self.layer_manager = LayerManager(viewport, [create_from(self.player, title='player')], cache_static_layers=False)
+		self.released = False
+
+	def release_resources(self):
+		self.released = True
+
+class TestLevelStack(unittest.TestCase):
+	"""Tests the :class:`game.load.level_stack.LevelStack` class."""
+
+	def setUp(self):
+		self.level = _StackTestLevel()
+		self.sub_level = _StackTestLevel()
+		self.level_stack = LevelStack(self.level)
+
+		self.changed_levels = []
+		self.level_stack.set_handler('on_level_change', self.changed_levels.append)
+
+	def test_push_and_pop(self):
+		"""Tests that pushed levels suspend the level beneath them until they are popped."""
+		self.level_stack.push(self.sub_level)
+
+		self.assertTrue(self.level_stack.top is self.sub_level,
+			"Pushed level is not running.")
+		self.assertTrue(self.level.layer_manager.suspended,
+			"Level beneath a pushed level was not suspended.")
+
+		self.assertTrue(self.level_stack.pop() is self.sub_level,
+			"Popping did not return the sub-level.")
+		self.assertTrue(self.level_stack.top is self.level,
+			"Level beneath a popped level is not running.")
+		self.assertFalse(self.level.layer_manager.suspended,
+			"Level beneath a popped level was not resumed.")
+		self.assertTrue(self.sub_level.layer_manager.suspended,
+			"Popped level was not suspended.")
+
+		self.assertEqual([self.sub_level, self.level], self.changed_levels,
+			"Level change events were not fired with the new top level.")
+
+	def test_pop_release(self):
+		"""Tests that popped levels are only released when requested."""
+		self.level_stack.push(self.sub_level)
+		self.level_stack.pop()
+
+		self.assertFalse(self.sub_level.released,
+			"Popped level was released without being requested.")
+
+		self.level_stack.push(self.sub_level)
+		self.level_stack.pop(release=True)
+
+		self.assertTrue(self.sub_level.released,
+			"Popped level was not released when requested.")
+
+	def test_only_top_level_updates(self):
+		"""Tests that suspended levels are not updated."""
+		self.level_stack.push(self.sub_level)
+		self.level_stack.update(0.1)
+		self.level.layer_manager.update(0.1)
+
+		self.assertEqual(0, self.level.player.velocity_y,
+			"Suspended level was updated.")
+		self.assertNotEqual(0, self.sub_level.player.velocity_y,
+			"Running level was not updated.")
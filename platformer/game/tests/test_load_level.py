@@ -1,9 +1,12 @@
 import unittest
-from ..load.config_translators import install_translator, translate, enable_post_processing, disable_post_processing
+from ..load.config_translators import install_translator, install_dependency_getter, translate, enable_post_processing, disable_post_processing, get_translation_order
 from ..load.level import Level
+from ..layers.level_config_translators import _get_layer_dependencies
 from util import custom_tile_types, resource
-from util.tileset import get_testing_tileset
+from util.tileset import get_testing_tileset, get_testing_tileset_config
 from game.bounded_box import BoundedBox
+from game.resource_cache import resource_cache
+from game.tiles import Tileset
 
 class TestLoadLevel(unittest.TestCase):
 	"""Tests loading a level from a config file."""
@@ -12,6 +15,9 @@ class TestLoadLevel(unittest.TestCase):
 	def setUpClass(cls):
 		resource.setUp()
 
+		# The testing tileset uses the custom tile types
+		custom_tile_types.register_all()
+
 	@classmethod
 	def tearDownClass(cls):
 		resource.tearDown()
@@ -238,6 +244,73 @@ class TestLoadLevel(unittest.TestCase):
 
 		disable_post_processing()
 
+	def test_level_config_translation_plans(self):
+		"""Tests that cached translation plans give the same results as scanning each string."""
+		translated_values = []
+
+		install_translator('test_plan', lambda x: translated_values.append(x) or x+'_plan')
+		install_translator('test_plan_tag', lambda x: '::test_plan::'+x)
+		install_translator('test_plan_object', lambda x: [x])
+
+		# Translators are called again when a cached plan is executed
+		for i in xrange(2):
+			data_value = translate('left::test_plan::::unregistered::right')
+
+			self.assertEqual(data_value, 'left::unregistered::right_plan',
+				"Cached translation plan gave a different value.")
+
+		self.assertEqual(translated_values, ['::unregistered::right', '::unregistered::right'],
+			"Cached translation plan did not call the translator each time.")
+
+		# Translated strings which contain tags are translated as well
+		for i in xrange(2):
+			data_value = translate('::test_plan_tag::value')
+
+			self.assertEqual(data_value, 'value_plan',
+				"Tag returned by a translator was not translated.")
+
+		# Plans for installed translators are used after installing another translator
+		translate('::test_plan_later::value')
+		install_translator('test_plan_later', lambda x: x+'_later')
+
+		self.assertEqual(translate('::test_plan_later::value'), 'value_later',
+			"Cached translation plan was used after installing a translator.")
+
+		self.assertEqual(translate('::test_plan_object::::test_plan::value'), ['value_plan'],
+			"Cached translation plan did not return a non-string value.")
+
+	def test_level_translation_order(self):
+		"""Tests that layers are ordered after the layers they depend on."""
+		dependencies = {}
+		install_dependency_getter(lambda layer_title: dependencies.get(layer_title, []))
+
+		self.assertEqual(get_translation_order(['a', 'b', 'c']), [0, 1, 2],
+			"Layers without dependencies were reordered.")
+
+		# Layers wait for their dependencies, as if the list was scanned repeatedly
+		dependencies['b'] = ['d']
+		dependencies['a'] = ['b', 'c']
+		self.assertEqual(get_translation_order(['a', 'b', 'c', 'd', 'e']), [2, 3, 4, 1, 0],
+			"Layers were not ordered after their dependencies.")
+
+		dependencies['d'] = ['c']
+		self.assertEqual(get_translation_order(['c', 'd', 'b', 'a', 'e']), [0, 1, 2, 3, 4],
+			"Layers listed after their dependencies were reordered.")
+
+		# Circular dependencies can not be ordered
+		dependencies['c'] = ['a']
+		with self.assertRaises(ValueError):
+			get_translation_order(['a', 'b', 'c', 'd', 'e'])
+
+		dependencies.clear()
+		dependencies['a'] = ['missing']
+		with self.assertRaises(ValueError):
+			get_translation_order(['a', 'b'])
+
+		dependencies.clear()
+		with self.assertRaises(ValueError):
+			get_translation_order(['a', 'b', 'a'])
+
 	def test_level_loader(self):
 		"""Tests the level loader to assure that values are loaded correctly."""
 
@@ -335,3 +408,104 @@ class TestLoadLevel(unittest.TestCase):
 
 		# TODO Test script loading
 		# TODO Test loading a level from a file
+
+	def test_level_tileset_pinning(self):
+		"""Tests that tilesets loaded for a level stay cached until the level is released."""
+		Tileset('pinned test', None, get_testing_tileset_config())
+		cache_key = ('tileset', 'pinned test')
+
+		tileset = translate('::tileset::pinned test')
+
+		self.assertEqual('pinned test', tileset.name,
+			"Tileset translator did not load the tileset.")
+		self.assertTrue(resource_cache.is_pinned(cache_key),
+			"Tileset translator did not pin the tileset.")
+		self.assertEqual(['pinned test'], Level.current_tilesets,
+			"Tileset translator did not record the tileset for the level being loaded.")
+
+		# Hand the tileset over to a level, as the level loader does
+		level = Level.__new__(Level)
+		level.tilesets = Level.current_tilesets
+		Level.current_tilesets = []
+
+		level.release_resources()
+
+		self.assertFalse(resource_cache.is_pinned(cache_key),
+			"Releasing a level did not unpin its tilesets.")
+		self.assertEqual([], level.tilesets,
+			"Releasing a level did not forget its tilesets.")
+
+		# Releasing twice must not unpin tilesets pinned by other levels
+		resource_cache.pin(cache_key)
+		level.release_resources()
+
+		self.assertTrue(resource_cache.is_pinned(cache_key),
+			"Releasing a level twice unpinned a tileset pinned elsewhere.")
+
+		resource_cache.unpin(cache_key)
+		Tileset.empty_tileset_cache('pinned test')
+
+	def test_level_loader_failure(self):
+		"""Tests that a level which fails to load does not prevent more levels from loading."""
+		install_translator('testing_tileset', lambda x: get_testing_tileset(2,2))
+		install_translator('testing_tilemap', lambda x: [[0,3,2],[2,3,0]])
+		Tileset('pinned test', None, get_testing_tileset_config())
+
+		# The stage and player layers depend on each other
+		level_data = {
+			'title': 'circular level',
+			'viewport': {
+				'type': 'camera',
+				'x': 0,
+				'y': 0,
+				'width': 100,
+				'height': 100,
+			},
+			'layers': [
+				{
+					'title': 'stage',
+					'graphic': {
+						'type': 'vertex tile map',
+						'tileset': '::tileset::pinned test',
+						'value_map': '::testing_tilemap::',
+						'batch': '::layer_graphic_property::player.batch',
+					},
+				},
+				{
+					'title': 'player',
+					'graphic': {
+						'type': 'player',
+						'stage': '::layer_graphic_property::stage.collision_grid',
+						'player_data': {
+							'x': 0,
+							'y': 0,
+						},
+					},
+				},
+			],
+		}
+
+		with self.assertRaises(ValueError):
+			Level(level_data)
+
+		self.assertFalse(resource_cache.is_pinned(('tileset', 'pinned test')),
+			"Tileset pinned by a level which failed to load was not unpinned.")
+		self.assertEqual([], _get_layer_dependencies('stage'),
+			"Layer dependencies of a level which failed to load were kept.")
+		self.assertEqual((None, {}, []), (Level.current_processing_layer, Level.current_processed_layers, Level.current_tilesets),
+			"Static properties were not cleaned up after a level failed to load.")
+		self.assertEqual('::resolve_layer_graphic_dependency::player', translate('::resolve_layer_graphic_dependency::player'),
+			"Post-processing was left enabled after a level failed to load.")
+
+		# Break the circular dependency and load the level again
+		del level_data['layers'][0]['graphic']['batch']
+		level_data['layers'][0]['graphic']['tileset'] = '::testing_tileset::'
+		level_data['viewport']['target'] = '::layer_graphic_property::player'
+
+		level = Level(level_data)
+		layers = level.layer_manager.layers
+
+		self.assertIs(layers['stage'].graphic.collision_grid, layers['player'].graphic.stage,
+			"Level loader failed to load a level after another level failed to load.")
+
+		Tileset.empty_tileset_cache('pinned test')
@@ -0,0 +1,179 @@
+import unittest
+from game.physical_objects.physical_object import PhysicalObject
+from game.physical_objects.simpleai import SimpleAI
+from game.physical_objects.physics_world import PhysicsWorld
+from game.physical_objects.simulation_lod import SimulationLOD
+from game.bounded_box import BoundedBox
+from game.settings.general_settings import FRAME_LENGTH, PHYSICS_SLEEP_TICKS, TILE_SIZE
+from game.tiles.collision_grid import CollisionGrid
+from game.tiles.collision_tile import get_collision_tile
+from util.image import dummy_image
+
+class TestPhysicsWorld(unittest.TestCase):
+	"""Tests the :class:`game.physical_objects.physics_world.PhysicsWorld` class."""
+
+	def setUp(self):
+		"""Sets up an empty stage and a physics world for testing."""
+		self.stage = [[None] * 20 for i in xrange(20)]
+		self.world = PhysicsWorld()
+
+	def create_floor(self):
+		"""Replaces the testing stage with a collision grid with a solid floor."""
+		self.stage = CollisionGrid(20, 20)
+		for x in xrange(20):
+			self.stage.set_tile(x, 0, get_collision_tile({}))
+
+	def create_object(self, cls=PhysicalObject, x=TILE_SIZE, y=10*TILE_SIZE):
+		"""Creates a physical object on the testing stage."""
+		return cls(stage=self.stage, img=dummy_image(TILE_SIZE, TILE_SIZE), x=x, y=y)
+
+	def test_integration_matches_object_update(self):
+		"""Tests that the world moves objects as updating them individually would."""
+		expected = [self.create_object(SimpleAI), self.create_object(y=12*TILE_SIZE)]
+		actual = [self.create_object(SimpleAI), self.create_object(y=12*TILE_SIZE)]
+
+		map(self.world.register, actual)
+
+		expected[0].go_to_x(8*TILE_SIZE)
+		actual[0].go_to_x(8*TILE_SIZE)
+
+		for i in xrange(10):
+			for obj in expected:
+				obj.update(FRAME_LENGTH)
+
+			self.world.update(FRAME_LENGTH)
+
+		for expected_obj, actual_obj in zip(expected, actual):
+			self.assertEqual((expected_obj.x, expected_obj.y), (actual_obj.x, actual_obj.y),
+				"Physics world moved an object to the wrong position.")
+			self.assertEqual(expected_obj.get_velocities(), actual_obj.get_velocities(),
+				"Physics world integrated an object's velocity incorrectly.")
+			self.assertEqual((actual_obj.x, actual_obj.y), actual_obj.position,
+				"Physics world did not update an object's sprite position.")
+
+	def test_unregister(self):
+		"""Tests that unregistering an object keeps its kinematic attributes."""
+		first = self.create_object()
+		second = self.create_object()
+
+		self.world.register(first)
+		self.world.register(second)
+
+		first.set_velocities(5, -3)
+		self.world.unregister(first)
+
+		self.assertIsNone(first.physics_world,
+			"Unregistered object still refers to the physics world.")
+		self.assertEqual((5, -3), first.get_velocities(),
+			"Unregistered object lost its velocities.")
+		self.assertEqual([second], self.world.objects,
+			"Physics world did not remove the unregistered object.")
+		self.assertEqual(0, second.physics_index,
+			"Physics world did not reindex the remaining object.")
+
+	def test_sleeping(self):
+		"""Tests that objects resting on the ground sleep until they are set in motion."""
+		self.create_floor()
+
+		obj = self.create_object(SimpleAI, y=TILE_SIZE)
+		self.world.register(obj)
+
+		# The object lands on the ground, then rests until it falls asleep
+		for i in xrange(PHYSICS_SLEEP_TICKS):
+			self.assertFalse(self.world.is_sleeping(obj),
+				"Object fell asleep before resting for long enough.")
+			self.world.update(FRAME_LENGTH)
+
+		self.assertTrue(self.world.is_sleeping(obj),
+			"Object resting on the ground did not fall asleep.")
+		self.assertEqual((TILE_SIZE, TILE_SIZE), (obj.x, obj.y),
+			"Sleeping object moved.")
+
+		# Scripted movement wakes the object
+		obj.go_to_x(4*TILE_SIZE)
+		self.assertFalse(self.world.is_sleeping(obj),
+			"Scripted movement did not wake a sleeping object.")
+
+		self.world.update(FRAME_LENGTH)
+		self.assertGreater(obj.x, TILE_SIZE,
+			"Woken object was not moved.")
+
+		# Replacing a tile in the stage wakes the object
+		self.world.unregister(obj)
+		obj.reset_to(TILE_SIZE, TILE_SIZE)
+		self.world.register(obj)
+
+		for i in xrange(PHYSICS_SLEEP_TICKS):
+			self.world.update(FRAME_LENGTH)
+
+		self.assertTrue(self.world.is_sleeping(obj),
+			"Object resting on the ground did not fall asleep.")
+
+		self.stage.set_tile(1, 0, None)
+		self.world.update(FRAME_LENGTH)
+
+		self.assertFalse(self.world.is_sleeping(obj),
+			"Replacing the tile beneath a sleeping object did not wake it.")
+		self.assertLess(obj.y, TILE_SIZE,
+			"Object did not fall after the tile beneath it was removed.")
+
+	def test_moving_objects(self):
+		"""Tests that moving a registered object updates the world's copy of its position and wakes it."""
+		self.create_floor()
+
+		obj = self.create_object(SimpleAI, y=TILE_SIZE)
+		self.world.register(obj)
+
+		for i in xrange(PHYSICS_SLEEP_TICKS):
+			self.world.update(FRAME_LENGTH)
+
+		obj.mid_x += TILE_SIZE
+
+		self.assertFalse(self.world.is_sleeping(obj),
+			"Moving a sleeping object did not wake it.")
+		self.assertEqual((obj.x, obj.y), (self.world._state['x'][obj.physics_index], self.world._state['y'][obj.physics_index]),
+			"Physics world did not store the position of a moved object.")
+
+		obj.position = (3*TILE_SIZE, 2*TILE_SIZE)
+
+		self.assertEqual((3*TILE_SIZE, 2*TILE_SIZE), (self.world._state['x'][obj.physics_index], self.world._state['y'][obj.physics_index]),
+			"Physics world did not store the position of a moved object.")
+
+	def test_simulation_lod(self):
+		"""Tests that objects are simulated less often the further they are from the viewport."""
+		self.create_floor()
+		self.world.simulation_lod = SimulationLOD(BoundedBox(0, 0, 2*TILE_SIZE, 2*TILE_SIZE), near_distance=TILE_SIZE, far_distance=4*TILE_SIZE, far_interval=4)
+
+		near = self.create_object(SimpleAI, x=TILE_SIZE, y=TILE_SIZE)
+		far = self.create_object(SimpleAI, x=4*TILE_SIZE, y=TILE_SIZE)
+		frozen = self.create_object(SimpleAI, x=10*TILE_SIZE, y=TILE_SIZE)
+
+		map(self.world.register, [near, far, frozen])
+		near.go_to_x(0)
+		far.go_to_x(5*TILE_SIZE)
+		frozen.go_to_x(12*TILE_SIZE)
+
+		for i in xrange(3):
+			self.world.update(FRAME_LENGTH)
+
+		self.assertLess(near.x, TILE_SIZE,
+			"Object near the viewport was not simulated every update.")
+		self.assertEqual(4*TILE_SIZE, far.x,
+			"Object far from the viewport was simulated before its next step.")
+
+		# The time since the last step is accumulated into a single step
+		self.world.update(FRAME_LENGTH)
+		self.assertAlmostEqual(4*TILE_SIZE + far.speed * 4 * FRAME_LENGTH, far.x,
+			msg="Object far from the viewport did not accumulate the time between its steps.")
+
+		# Frozen objects are only advanced analytically
+		self.assertGreater(frozen.x, 10*TILE_SIZE,
+			"Frozen object did not continue walking to its destination.")
+
+		for i in xrange(60):
+			self.world.update(FRAME_LENGTH)
+
+		self.assertEqual((12*TILE_SIZE, TILE_SIZE), (frozen.x, frozen.y),
+			"Frozen object did not reach its destination.")
+		self.assertIsNone(frozen.destination_x,
+			"Frozen object did not finish walking to its destination.")
@@ -0,0 +1,96 @@
+import unittest
+from game.resource_cache import ResourceCache, get_image_size
+from util.image import dummy_image
+
+class TestResourceCache(unittest.TestCase):
+	"""Tests the :class:`game.resource_cache.ResourceCache` class."""
+
+	def setUp(self):
+		"""Creates a cache with room for three 10 byte resources."""
+		self.cache = ResourceCache(budget=30)
+
+	def test_statistics(self):
+		"""Tests that cache hits, misses, and sizes are recorded."""
+		self.cache.add('a', 'resource a', 10)
+		self.cache.add('b', 'resource b', 5)
+
+		self.assertEqual('resource a', self.cache.get('a'),
+			"Cache did not return a cached resource.")
+		self.assertIsNone(self.cache.get('c'),
+			"Cache returned a resource which was not cached.")
+
+		self.assertEqual((1, 1), (self.cache.hits, self.cache.misses),
+			"Cache did not record hits and misses.")
+		self.assertEqual(0.5, self.cache.get_hit_rate(),
+			"Cache reported an incorrect hit rate.")
+		self.assertEqual(15, self.cache.size,
+			"Cache reported an incorrect size.")
+
+		# Replacing and removing resources updates the size
+		self.cache.add('b', 'new resource b', 15)
+		self.assertEqual(25, self.cache.size,
+			"Cache did not update its size when a resource was replaced.")
+
+		self.assertEqual('resource a', self.cache.pop('a'),
+			"Cache did not return a removed resource.")
+		self.assertEqual(15, self.cache.size,
+			"Cache did not update its size when a resource was removed.")
+
+	def test_lru_eviction(self):
+		"""Tests that the least recently used resources are evicted once the budget is exceeded."""
+		for key in ['a', 'b', 'c']:
+			self.cache.add(key, key, 10)
+
+		# Using a makes b the least recently used resource
+		self.cache.get('a')
+		self.cache.add('d', 'd', 10)
+
+		self.assertEqual(['c', 'a', 'd'], self.cache.keys(),
+			"Cache did not evict the least recently used resource.")
+		self.assertEqual(1, self.cache.evictions,
+			"Cache did not record an eviction.")
+
+		# Resources larger than the budget are kept until another resource is added
+		self.cache.add('e', 'e', 50)
+
+		self.assertEqual(['e'], self.cache.keys(),
+			"Cache evicted a resource as it was added.")
+
+	def test_pinning(self):
+		"""Tests that pinned resources are not evicted until unpinned."""
+		for key in ['a', 'b', 'c']:
+			self.cache.add(key, key, 10)
+
+		self.cache.pin('a')
+		self.cache.pin('a')
+		self.cache.add('d', 'd', 10)
+
+		self.assertEqual(['a', 'c', 'd'], self.cache.keys(),
+			"Cache evicted a pinned resource.")
+
+		# The cache can exceed its budget while resources are pinned
+		self.cache.pin('c')
+		self.cache.pin('d')
+		self.cache.add('e', 'e', 10)
+
+		self.assertEqual(40, self.cache.size,
+			"Cache evicted a pinned resource to stay within its budget.")
+
+		# Unpinning evicts resources which are over the budget
+		self.cache.unpin('a')
+		self.assertTrue(self.cache.is_pinned('a'),
+			"Resource was unpinned before being unpinned as many times as it was pinned.")
+
+		self.cache.unpin('a')
+		self.assertEqual(['c', 'd', 'e'], self.cache.keys(),
+			"Cache did not evict an unpinned resource once it exceeded its budget.")
+
+		with self.assertRaises(KeyError):
+			self.cache.pin('a')
+
+	def test_image_size(self):
+		"""Tests estimating the size of images."""
+		self.assertEqual(8 * 4 * 4, get_image_size(dummy_image(8, 4)),
+			"Incorrect size estimated for an image.")
+		self.assertEqual(0, get_image_size(None),
+			"Incorrect size estimated for a missing image.")
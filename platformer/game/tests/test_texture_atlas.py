@@ -0,0 +1,69 @@
+import unittest
+from game.animation import BasicAnimation
+from game.texture_atlas import TextureAtlas
+from game.tiles.tileset import TilesetImage
+from pyglet.image import TextureRegion
+from util.image import dummy_image
+
+class TestTextureAtlas(unittest.TestCase):
+	"""Tests packing images into a texture atlas."""
+
+	def setUp(self):
+		self.atlas = TextureAtlas(texture_size=256)
+
+	def test_add(self):
+		"""Tests that images are packed into shared atlas textures."""
+		first_region = self.atlas.add(dummy_image(32, 64))
+		second_region = self.atlas.add(dummy_image(64, 32))
+
+		self.assertIsInstance(first_region, TextureRegion,
+			"Image was not packed into an atlas texture.")
+		self.assertEqual((64, 32), (second_region.width, second_region.height),
+			"Packed image region has the wrong size.")
+		self.assertEqual(first_region.owner.id, second_region.owner.id,
+			"Images were not packed into the same atlas texture.")
+		self.assertEqual(1, len(self.atlas.textures),
+			"Atlas did not create exactly one texture.")
+
+		# Images larger than the atlas textures are given their own texture
+		large_texture = self.atlas.add(dummy_image(512, 32))
+
+		self.assertEqual(512, large_texture.width,
+			"Image larger than the atlas was not given its own texture.")
+		self.assertEqual(1, len(self.atlas.textures),
+			"Image larger than the atlas was packed into the atlas.")
+
+	def test_add_with_key(self):
+		"""Tests that images added with the same key are only packed once."""
+		region = self.atlas.add(dummy_image(32, 32), key='image')
+
+		self.assertTrue('image' in self.atlas,
+			"Atlas did not record the key of an added image.")
+		self.assertIs(region, self.atlas.add(dummy_image(32, 32), key='image'),
+			"Image with the same key was packed again.")
+
+	def test_add_images(self):
+		"""Tests that several images are packed and returned in their original order."""
+		sizes = [(16, 16), (32, 64), (64, 32)]
+		regions = self.atlas.add_images([dummy_image(width, height) for width, height in sizes])
+
+		self.assertEqual(sizes, [(region.width, region.height) for region in regions],
+			"Packed image regions were not returned in order.")
+
+	def test_add_images_with_keys(self):
+		"""Tests that images added together with keys are only packed once."""
+		first_regions = self.atlas.add_images([dummy_image(16, 16), dummy_image(32, 32)], keys=['small', 'large'])
+		second_regions = self.atlas.add_images([dummy_image(32, 32), dummy_image(16, 16)], keys=['large', 'small'])
+
+		self.assertEqual(first_regions[::-1], second_regions,
+			"Images with the same keys were packed again.")
+
+	def test_packed_tileset_and_animation(self):
+		"""Tests that tilesets and animations can be drawn from packed images."""
+		tileset_image = TilesetImage(self.atlas.add(dummy_image(64, 64)))
+		animation = BasicAnimation.from_image(dummy_image(64, 32), 1, 2, [1, 1], atlas=self.atlas)
+
+		self.assertEqual(tileset_image.texture.id, animation.frames[0].image.owner.id,
+			"Tileset and animation frames do not share an atlas texture.")
+		self.assertEqual(tileset_image.get_tile_image(1).owner.id, animation.frames[1].image.owner.id,
+			"Tiles and animation frames do not share an atlas texture.")
@@ -1,4 +1,5 @@
 import unittest
+from game.resource_cache import resource_cache, get_image_size
 from game.settings.general_settings import TILE_SIZE
 from game.tiles.tileset import TilesetConfig, TilesetImage, Tileset, tileset_loaders
 from ..util import resource
@@ -32,6 +33,21 @@ class TestTileset(unittest.TestCase):
 		self.assertIs(tileset2.config, tileset_config2, "Tileset config cache was not updated.")
 		self.assertIs(tileset2.image, tileset_image2, "Tileset image cache was not updated.")
 
+	def test_packed_tileset_cache_size(self):
+		"""Tests that tilesets packed into a texture atlas are not counted against the cache budget."""
+		tileset_image = get_testing_tileset_image(2, 2)
+		tileset_config = get_testing_tileset_config()
+
+		Tileset('test', tileset_image, tileset_config)
+		unpacked_size = resource_cache.size
+
+		Tileset('test', tileset_image, tileset_config, packed=True)
+
+		self.assertEqual(unpacked_size - get_image_size(tileset_image.texture), resource_cache.size,
+			"Packed tileset was counted against the cache budget.")
+
+		Tileset.empty_tileset_cache('test')
+
 
 
 	def test_tileset_tile_creation(self):
@@ -0,0 +1,80 @@
+import unittest
+from game.tiles.vertex_tile_map import VertexTileMap
+from game.tiles.tileset import TilesetConfig
+from game.settings.general_settings import TILE_SIZE
+from pyglet.graphics import Batch, Group
+
+class _VertexTestTexture(object):
+	"""Stand-in for a tileset texture."""
+
+	id = 1
+	target = 0
+
+class _VertexTestTilesetImage(object):
+	"""Stand-in for a tileset image, where each tile's texture coordinates are its tile value."""
+
+	texture = _VertexTestTexture()
+
+	def get_tile_tex_coords(self, tile_value):
+		return (tile_value,) * 12
+
+class _VertexTestTileset(object):
+	"""Stand-in for a tileset."""
+
+	def __init__(self):
+		self.image = _VertexTestTilesetImage()
+		self.config = TilesetConfig()
+
+class TestVertexTileMap(unittest.TestCase):
+	"""Tests the :class:`game.tiles.vertex_tile_map.VertexTileMap` class."""
+
+	def setUp(self):
+		"""Creates a 3x3 tile map of 2x2 chunks."""
+		self.value_map = [
+			[1, 0, 2],
+			[0, 3, 0],
+			[4, 0, 0],
+		]
+
+		self.batch = Batch()
+		self.tile_map = VertexTileMap(self.value_map, _VertexTestTileset(), batch=self.batch, chunk_size=2)
+
+	def test_vertex_lists(self):
+		"""Tests that each non-empty chunk is baked into a vertex list."""
+		vertex_lists = self.tile_map._vertex_lists
+
+		self.assertEqual(3, len(vertex_lists),
+			"Vertex tile map did not create a vertex list for each non-empty chunk.")
+		self.assertEqual([8, 4, 4], [vertex_list.get_size() for vertex_list in vertex_lists],
+			"Vertex tile map created vertices for empty tiles.")
+
+		# The bottom left chunk contains tiles 1 and 3
+		self.assertEqual([
+			0, 0, TILE_SIZE, 0, TILE_SIZE, TILE_SIZE, 0, TILE_SIZE,
+			TILE_SIZE, TILE_SIZE, 2*TILE_SIZE, TILE_SIZE, 2*TILE_SIZE, 2*TILE_SIZE, TILE_SIZE, 2*TILE_SIZE,
+		], list(vertex_lists[0].vertices),
+			"Vertex tile map positioned its tiles incorrectly.")
+		self.assertEqual([1] * 12 + [3] * 12, list(vertex_lists[0].tex_coords),
+			"Vertex tile map used incorrect texture coordinates.")
+
+	def test_collision_grid(self):
+		"""Tests that the collision grid covers the map."""
+		self.assertEqual((3, 3), (self.tile_map.collision_grid.rows, self.tile_map.collision_grid.cols),
+			"Vertex tile map has incorrect collision grid dimensions.")
+
+	def test_graphics_attributes(self):
+		"""Tests moving the map to a new batch and group."""
+		batch = Batch()
+		group = Group()
+
+		self.tile_map.batch = batch
+		self.tile_map.group = group
+
+		self.assertIs(batch, self.tile_map.batch,
+			"Vertex tile map did not set its batch.")
+		self.assertIs(group, self.tile_map.group,
+			"Vertex tile map did not set its group.")
+		self.assertEqual(3, len(self.tile_map._vertex_lists),
+			"Vertex tile map lost vertex lists when migrating.")
+		self.assertTrue(all(vertex_list.domain in batch.group_map[self.tile_map._texture_group].values() for vertex_list in self.tile_map._vertex_lists),
+			"Vertex tile map did not migrate its vertex lists.")
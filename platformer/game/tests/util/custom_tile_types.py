@@ -14,6 +14,9 @@ is invalid or not set.
 A 'custom2' tile type can be registered. This type has no factory method
 and merely uses its class object as its factory callback.
 
+A 'bouncy' tile type can be registered. Its ``BouncyTile`` class
+resolves its own collisions, bouncing objects which fall onto it.
+
 ``setUp`` and ``tearDown`` should be called during the setup and teardown
 of tests to establish a fresh custom tile environment and then restore it
 to its original condition when the tests are finished.
@@ -54,10 +57,15 @@ def register_custom2():
 	"""Registers a class callback for the 'custom2' tile type."""
 	custom_tile_types['custom2'] = Custom2Tile
 
+def register_bouncy():
+	"""Registers a class callback for the 'bouncy' tile type."""
+	custom_tile_types['bouncy'] = BouncyTile
+
 def register_all():
 	"""Registers callbacks for all custom tile types."""
 	register_custom()
 	register_custom2()
+	register_bouncy()
 
 
 
@@ -93,6 +101,25 @@ class Custom2Tile(Tile):
 
 
 
+class BouncyTile(Tile):
+	"""Custom tile subclass which resolves its own collisions.
+
+	Objects falling onto the tile are bounced back up at the speed they fell.
+	"""
+
+	type = 'bouncy'
+
+	def resolve_collision_y(self, obj):
+		if obj.moving_to_y < obj.y:
+			obj.moving_to_y = self.y2
+			obj.velocity_y = -obj.velocity_y
+
+			return True
+
+		return super(BouncyTile, self).resolve_collision_y(obj)
+
+
+
 # Custom tile type factory methods
 
 def custom_tile_factory(*args, **kwargs):
@@ -0,0 +1,103 @@
+from pyglet.image.atlas import TextureBin
+from settings.general_settings import TEXTURE_ATLAS_SIZE
+
+class TextureAtlas(object):
+	"""Packs images into a few large textures.
+
+	Graphics drawn from images in the same atlas texture share a texture
+	binding, so their vertex lists can be drawn by the same batch group
+	rather than splitting the batch for every image. Tilesets and
+	animation frames which are packed into an atlas keep working as
+	before, since their tile and frame images become regions of the
+	atlas texture.
+
+	Images which are larger than the atlas textures are given their own
+	texture instead.
+
+	Example:
+		>>> atlas = TextureAtlas()
+		>>> tileset = Tileset.load('forest', atlas=atlas)
+		>>> animation = BasicAnimation.from_image(image, 1, 4, durations, atlas=atlas)
+
+	Attributes:
+		texture_size (int): The width and height of each atlas texture.
+	"""
+
+	def __init__(self, texture_size=TEXTURE_ATLAS_SIZE):
+		"""Creates an empty texture atlas.
+
+		Kwargs:
+			texture_size (int): The width and height of each atlas texture.
+		"""
+		self.texture_size = texture_size
+
+		self._bin = TextureBin(texture_size, texture_size)
+
+		# Packed images which can be shared, as key: texture region
+		self._regions = {}
+
+	@property
+	def textures(self):
+		"""Gets the atlas textures which images have been packed into."""
+		return [atlas.texture for atlas in self._bin.atlases]
+
+	def add(self, image, key=None):
+		"""Packs an image into the atlas.
+
+		Args:
+			image (:class:`pyglet.image.AbstractImage`): The image to pack. Textures are read back before packing.
+
+		Kwargs:
+			key: A key identifying the image, such as its resource name. Adding an image with the key of an image which was already added returns the existing region.
+
+		Returns:
+			A :class:`pyglet.image.TextureRegion` of an atlas texture, or a :class:`pyglet.image.Texture` if the image is too large for the atlas.
+		"""
+		if key is not None and key in self._regions:
+			return self._regions[key]
+
+		if image.width > self.texture_size or image.height > self.texture_size:
+			region = image.get_texture()
+		else:
+			region = self._bin.add(image.get_image_data())
+
+		if key is not None:
+			self._regions[key] = region
+
+		return region
+
+	def add_images(self, images, keys=None):
+		"""Packs several images into the atlas.
+
+		The images are packed from tallest to shortest, which wastes less
+		space in the atlas textures than packing them in any order.
+
+		Args:
+			images (list of :class:`pyglet.image.AbstractImage`): The images to pack.
+
+		Kwargs:
+			keys (list): A key identifying each image, in the same order as ``images``. Images with the key of an image which was already added are not packed again.
+
+		Returns:
+			A list of the region of each image, in the same order as ``images``.
+		"""
+		if keys is None:
+			keys = [None] * len(images)
+
+		regions = [None] * len(images)
+
+		for index in sorted(xrange(len(images)), key=lambda index: -images[index].height):
+			regions[index] = self.add(images[index], key=keys[index])
+
+		return regions
+
+	def __contains__(self, key):
+		"""Returns whether an image with the given key has been added to the atlas.
+
+		Args:
+			key: The key the image was added with.
+
+		Returns:
+			True if an image was added with the key, False otherwise.
+		"""
+		return key in self._regions
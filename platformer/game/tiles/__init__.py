@@ -1,5 +1,8 @@
 from tile_map import TileMap
+from chunked_tile_map import ChunkedTileMap
 from texture_tile_map import TextureTileMap
+from vertex_tile_map import VertexTileMap
+from collision_grid import CollisionGrid
 
 # Must be imported after tile maps to prevent an ImportError
 from tileset import Tileset
@@ -0,0 +1,234 @@
+from collections import OrderedDict
+from tile_map import TileMap
+from collision_grid import CollisionGrid
+from game.settings.general_settings import TILE_SIZE, TILE_MAP_CHUNK_SIZE, TILE_MAP_CHUNK_BUDGET
+
+class ChunkedTileMap(TileMap):
+	"""A grid of tiles which only creates the tiles near its visible region.
+
+	The map is divided into square chunks of tiles. Tile objects are
+	created for a chunk when it comes near the visible region, and the
+	least recently visible chunks are deleted once more chunks than the
+	budget allows have been loaded. This keeps the cost of loading and
+	drawing large maps proportional to the size of the visible region.
+
+	Collision data is created for the entire map up front, without
+	creating any tile objects.
+
+	Attributes:
+		rows (int): The number of rows of tiles in the map.
+		cols (int): The number of columns of tiles in the map.
+		collision_grid (:class:`game.tiles.collision_grid.CollisionGrid`): Collision data for the tiles on the map.
+		chunk_size (int): The width and height of each chunk, in tiles.
+		chunk_budget (int): The maximum number of chunks to keep loaded.
+	"""
+
+	def __init__(self, value_map, tileset, batch=None, group=None, chunk_size=TILE_MAP_CHUNK_SIZE, chunk_budget=TILE_MAP_CHUNK_BUDGET):
+		"""Creates a new chunked tile map.
+
+		No chunks are loaded until the visible region is set.
+
+		Args:
+			value_map (2d list of int): A 2d list of the tile values for each tile in the tile map.
+			tileset (:class:`game.tiles.tileset.Tileset`): The tileset to use for the map.
+
+		Kwargs:
+			batch (:class:`pyglet.graphics.Batch`): A graphics batch to add each tile to.
+			group (:class:`pyglet.graphics.Group`): A graphics group to add each tile to.
+			chunk_size (int): The width and height of each chunk, in tiles.
+			chunk_budget (int): The maximum number of chunks to keep loaded.
+		"""
+		self.chunk_size = chunk_size
+		self.chunk_budget = chunk_budget
+
+		self._value_map = value_map
+		self._tileset = tileset
+
+		# Loaded chunks as (chunk_x, chunk_y): list of tiles, from least to most recently visible
+		self._chunks = OrderedDict()
+		self._visible_chunks = set()
+
+		super(ChunkedTileMap, self).__init__(value_map, tileset, batch=batch, group=group)
+
+		# Nothing is visible until the visible region is set
+		self._visible_region = None
+
+	def _create_tile_map(self, value_map, tileset):
+		"""Creates the collision grid for the map.
+
+		Args:
+			value_map (2d list of int): A 2d list of the tile values for each tile in the tile map.
+			tileset (:class:`game.tiles.tileset.Tileset`): The tileset to use for the map.
+		"""
+		self.collision_grid = CollisionGrid.from_value_map(value_map, tileset)
+
+	def _load_chunk(self, chunk_x, chunk_y):
+		"""Creates the tiles in a chunk.
+
+		Args:
+			chunk_x (int): The x index of the chunk.
+			chunk_y (int): The y index of the chunk.
+
+		Returns:
+			A list of the :class:`game.tiles.tile.Tile` objects in the chunk.
+		"""
+		chunk_tiles = []
+
+		start_x = chunk_x * self.chunk_size
+		start_y = chunk_y * self.chunk_size
+
+		for y in xrange(start_y, min(start_y + self.chunk_size, self.rows)):
+			row = self._value_map[y]
+			for x in xrange(start_x, min(start_x + self.chunk_size, self.cols)):
+				tile_value = row[x]
+
+				if tile_value != 0: # Ignore empty tiles
+					chunk_tiles.append(self._tileset.create_tile(tile_value, x=x * TILE_SIZE, y=y * TILE_SIZE, batch=self._batch, group=self._group))
+
+		self._chunks[(chunk_x, chunk_y)] = chunk_tiles
+
+		return chunk_tiles
+
+	def _unload_chunk(self, chunk):
+		"""Deletes the tiles in a chunk.
+
+		Args:
+			chunk (tuple of int): The indices of the chunk as ``(chunk_x, chunk_y)``.
+		"""
+		map(lambda tile: tile.delete(), self._chunks.pop(chunk))
+		self._visible_chunks.discard(chunk)
+
+	def _get_chunk_range(self, region):
+		"""Returns the indices of the chunks which a region covers.
+
+		Args:
+			region (:class:`game.bounded_box.BoundedBox`): The region to get the chunks of.
+
+		Returns:
+			A tuple of the first and last x and y chunk indices as ``(min_x, min_y, max_x, max_y)``.
+		"""
+		return (
+			region.x_tile / self.chunk_size,	region.y_tile / self.chunk_size,
+			region.x2_tile / self.chunk_size,	region.y2_tile / self.chunk_size,
+		)
+
+	def set_visible_region(self, x, y, width, height):
+		"""Sets the visible region of the tile map.
+
+		Chunks in the region are made visible, and chunks adjacent to
+		the region are loaded ahead of time but kept invisible. If more
+		chunks than the budget allows are loaded, the least recently
+		visible chunks are deleted.
+
+		Args:
+			x (int): The x coordinate to draw the region from.
+			y (int): The y coordinate to draw the region from.
+			width (int): The width of the region to draw.
+			height (int): The height of the region to draw.
+		"""
+		region = self._bound_region(x, y, width, height)
+
+		# Do nothing if the requested region is the current visible region
+		if region is not None and self._visible_region is not None and region == self._visible_region:
+			return
+
+		self._set_visible_box(region)
+
+		# Nothing is visible if the region is outside of the tile map
+		if region is None:
+			for chunk in self._visible_chunks:
+				map(lambda tile: tile.__setattr__('visible', False), self._chunks[chunk])
+
+			self._visible_chunks = set()
+			return
+
+		min_x, min_y, max_x, max_y = self._get_chunk_range(region)
+		max_chunk_x = (self.cols - 1) / self.chunk_size
+		max_chunk_y = (self.rows - 1) / self.chunk_size
+
+		nearby_chunks = set()
+		visible_chunks = set()
+
+		# Load the chunks in the region and the chunks surrounding them
+		for chunk_y in xrange(max(min_y - 1, 0), min(max_y + 1, max_chunk_y) + 1):
+			for chunk_x in xrange(max(min_x - 1, 0), min(max_x + 1, max_chunk_x) + 1):
+				chunk = (chunk_x, chunk_y)
+				nearby_chunks.add(chunk)
+				is_visible = min_x <= chunk_x <= max_x and min_y <= chunk_y <= max_y
+
+				if chunk in self._chunks:
+					# Mark the chunk as the most recently used
+					chunk_tiles = self._chunks.pop(chunk)
+					self._chunks[chunk] = chunk_tiles
+				else:
+					chunk_tiles = self._load_chunk(chunk_x, chunk_y)
+
+					# Newly loaded chunks begin visible
+					if is_visible:
+						self._visible_chunks.add(chunk)
+					else:
+						map(lambda tile: tile.__setattr__('visible', False), chunk_tiles)
+
+				if is_visible:
+					visible_chunks.add(chunk)
+
+		# Update the visibility of chunks which entered or left the region
+		for chunk in visible_chunks.difference(self._visible_chunks):
+			map(lambda tile: tile.__setattr__('visible', True), self._chunks[chunk])
+
+		for chunk in self._visible_chunks.difference(visible_chunks):
+			if chunk in self._chunks:
+				map(lambda tile: tile.__setattr__('visible', False), self._chunks[chunk])
+
+		self._visible_chunks = visible_chunks
+
+		# Delete the least recently used chunks which are over budget
+		while len(self._chunks) > self.chunk_budget:
+			chunk = next(iter(self._chunks))
+
+			# Never delete chunks near the visible region, even if the budget is too small for them
+			if chunk in nearby_chunks:
+				break
+
+			self._unload_chunk(chunk)
+
+	def compact(self):
+		"""Deletes all loaded chunks which are not visible.
+
+		Chunks near the visible region are loaded again once the
+		visible region changes.
+		"""
+		map(self._unload_chunk, [chunk for chunk in self._chunks if not chunk in self._visible_chunks])
+
+	def delete(self):
+		"""Deletes all loaded chunks."""
+		map(self._unload_chunk, self._chunks.keys())
+		self._visible_region = None
+
+
+
+	@property
+	def batch(self):
+		"""Gets batch."""
+		return self._batch
+
+	@batch.setter
+	def batch(self, batch):
+		"""Sets the graphics batch for each loaded tile in the map."""
+		for chunk_tiles in self._chunks.itervalues():
+			map(lambda tile: tile.__setattr__('batch', batch), chunk_tiles)
+
+		self._batch = batch
+
+	@property
+	def group(self):
+		"""Gets group."""
+		return self._group
+
+	@group.setter
+	def group(self, group):
+		"""Sets the graphics group for each loaded tile in the map."""
+		for chunk_tiles in self._chunks.itervalues():
+			map(lambda tile: tile.__setattr__('group', group), chunk_tiles)
+
+		self._group = group
@@ -0,0 +1,314 @@
+import math
+from array import array
+from collision_tile import custom_collision_tile_types, get_collision_tile
+from custom_tile_loader import custom_tile_types
+from collision_tile import OCCUPIED, COLLIDABLE, SLOPE, FACES_LEFT, FACES_RIGHT, CEILING, LEFTWARD_SLOPE, RIGHTWARD_SLOPE
+from ..settings.general_settings import TILE_SIZE, TILE_SIZE_FLOAT
+from ..util import floats_equal
+
+# Distance within which a box is considered to be touching a cell rather than overlapping it, in pixels
+_TOUCHING_DISTANCE = 1e-6
+
+def _get_overlapped_cells(start, length):
+	"""Returns the indices of the first and last cells overlapped by a span along one axis.
+
+	Cells which the span only touches are not included.
+
+	Args:
+		start (float): The start of the span, in pixels.
+		length (float): The length of the span, in pixels.
+
+	Returns:
+		A tuple of the first and last cell indices, which may be outside of the grid.
+	"""
+	first = int(math.floor((start + _TOUCHING_DISTANCE) / TILE_SIZE_FLOAT))
+	last = int(math.ceil((start + length - _TOUCHING_DISTANCE) / TILE_SIZE_FLOAT)) - 1
+
+	return (first, last)
+
+def _get_value_collision_tile(tile_value, tileset):
+	"""Returns the shared collision tile for a tile value, without a tile object to resolve collisions.
+
+	Args:
+		tile_value (int): The integer value of a tile in the tileset.
+		tileset (:class:`game.tiles.tileset.Tileset`): The tileset the tile value is from.
+
+	Returns:
+		A :class:`game.tiles.collision_tile.CollisionTile` object.
+
+	Raises:
+		ValueError: If the tile's type resolves its own collisions but has no collision tile factory.
+	"""
+	tile_entry = tileset.config.get_tile_entry(tile_value)
+	tile_type = tile_entry.get('type')
+
+	# Custom tiles which resolve their own collisions would otherwise silently collide as basic tiles
+	if tile_type in custom_tile_types and not tile_type in custom_collision_tile_types:
+		tile = tileset.create_tile(tile_value)
+		resolves_own_collisions = tile.resolves_own_collisions()
+		tile.delete()
+
+		if resolves_own_collisions:
+			raise ValueError("Tile type '{0}' resolves its own collisions, so it needs a collision tile factory in custom_collision_tile_types".format(tile_type))
+
+	return get_collision_tile(tile_entry)
+
+class CollisionGrid(object):
+	"""Compact collision data for a grid of tiles.
+
+	Each cell of the grid is represented by a single byte of flags
+	describing the tile in that cell, which allows collision checks
+	to be performed without any attribute lookups on tile objects.
+	Slope heights are stored alongside the flags. The grid is stored
+	row-major, with the index of a cell being ``y * cols + x``.
+
+	Once the grid has determined that a collision is possible, the
+	collision is resolved by the cell's
+	:class:`game.tiles.collision_tile.CollisionTile`. Collision tiles
+	are shared, so each cell only stores the index of its collision tile.
+
+	Attributes:
+		rows (int): The number of rows of cells in the grid.
+		cols (int): The number of columns of cells in the grid.
+		flags (array of int): The collision flags for each cell in the grid.
+		left_heights (array of int): The height of the left end of the slope in each cell, or 0 for non-slopes.
+		right_heights (array of int): The height of the right end of the slope in each cell, or 0 for non-slopes.
+		cells (array of int): The index of each cell's collision tile in ``collision_tiles``.
+		collision_tiles (list of :class:`game.tiles.collision_tile.CollisionTile`): The collision tiles used by the grid. The first entry is ``None``, for empty cells.
+		changes (int): The number of times a tile in the grid has been replaced.
+	"""
+
+	def __init__(self, rows, cols):
+		"""Creates an empty collision grid.
+
+		Args:
+			rows (int): The number of rows of cells in the grid.
+			cols (int): The number of columns of cells in the grid.
+		"""
+		self.rows = rows
+		self.cols = cols
+
+		self.flags = array('B', [0]) * (rows * cols)
+		self.left_heights = array('H', [0]) * (rows * cols)
+		self.right_heights = array('H', [0]) * (rows * cols)
+		self.cells = array('H', [0]) * (rows * cols)
+
+		self.collision_tiles = [None]
+		self._collision_tile_indices = {None: 0}
+
+		self.changes = 0
+
+	@classmethod
+	def from_tiles(cls, tiles):
+		"""Creates a collision grid from a 2d list of tiles.
+
+		Args:
+			tiles (2d list of :class:`game.tiles.tile.Tile`): 2d list of tiles or collision tiles. Empty tiles are represented as ``None``.
+
+		Returns:
+			A :class:`game.tiles.collision_grid.CollisionGrid` object.
+		"""
+		grid = cls(len(tiles), len(tiles[0]))
+
+		for y in xrange(grid.rows):
+			row = tiles[y]
+			for x in xrange(grid.cols):
+				if row[x]:
+					grid._set_cell(y * grid.cols + x, row[x])
+
+		return grid
+
+	@classmethod
+	def from_value_map(cls, value_map, tileset):
+		"""Creates a collision grid from a 2d list of tile values.
+
+		Collision tiles are taken from the tileset's config, so no
+		tile objects need to be created. Custom tile types whose tiles
+		resolve their own collisions must have a collision tile factory
+		in :data:`game.tiles.collision_tile.custom_collision_tile_types`.
+
+		Args:
+			value_map (2d list of int): A 2d list of the tile values for each tile in the grid.
+			tileset (:class:`game.tiles.tileset.Tileset`): The tileset the tile values are from.
+
+		Returns:
+			A :class:`game.tiles.collision_grid.CollisionGrid` object.
+
+		Raises:
+			ValueError: If a tile type resolves its own collisions but has no collision tile factory.
+		"""
+		grid = cls(len(value_map), len(value_map[0]))
+
+		# Tile values repeat heavily, so look up the collision tile for each value once
+		collision_tiles = {}
+
+		for y in xrange(grid.rows):
+			row = value_map[y]
+			for x in xrange(grid.cols):
+				tile_value = row[x]
+
+				if tile_value != 0: # Ignore empty tiles
+					if not tile_value in collision_tiles:
+						collision_tiles[tile_value] = _get_value_collision_tile(tile_value, tileset)
+
+					grid._set_cell(y * grid.cols + x, collision_tiles[tile_value])
+
+		return grid
+
+	def _set_cell(self, index, tile):
+		"""Sets the collision data of a cell from a tile.
+
+		Args:
+			index (int): The index of the cell in the grid.
+			tile (:class:`game.tiles.collision_tile.CollisionTile`): The tile or collision tile in the cell, or ``None`` for an empty cell.
+		"""
+		# Tiles with an appearance share the collision tile for their behavior
+		collision_tile = getattr(tile, 'collision_tile', tile) or None
+
+		if not collision_tile in self._collision_tile_indices:
+			self._collision_tile_indices[collision_tile] = len(self.collision_tiles)
+			self.collision_tiles.append(collision_tile)
+
+		self.cells[index] = self._collision_tile_indices[collision_tile]
+
+		if collision_tile is None:
+			self.flags[index] = 0
+			self.left_heights[index] = 0
+			self.right_heights[index] = 0
+		else:
+			self.flags[index] = collision_tile.flags
+			self.left_heights[index] = collision_tile.left_height
+			self.right_heights[index] = collision_tile.right_height
+
+	def set_tile(self, x, y, tile):
+		"""Replaces the tile in a cell of the grid.
+
+		Args:
+			x (int): The x index of the cell.
+			y (int): The y index of the cell.
+			tile (:class:`game.tiles.collision_tile.CollisionTile`): The new tile or collision tile for the cell, or ``None`` to empty the cell.
+		"""
+		self._set_cell(y * self.cols + x, tile)
+		self.changes += 1
+
+	def get_flags(self, x, y):
+		"""Returns the collision flags for a cell of the grid.
+
+		Args:
+			x (int): The x index of the cell.
+			y (int): The y index of the cell.
+
+		Returns:
+			The collision flags of the cell as an int.
+		"""
+		return self.flags[y * self.cols + x]
+
+	def tile_at(self, x, y):
+		"""Returns the collision tile in a cell of the grid.
+
+		Args:
+			x (int): The x index of the cell.
+			y (int): The y index of the cell.
+
+		Returns:
+			A :class:`game.tiles.collision_tile.CollisionTile` object, or ``None`` if the cell is empty.
+		"""
+		return self.collision_tiles[self.cells[y * self.cols + x]]
+
+	def sweep(self, x, y, width, height, dx, dy):
+		"""Finds the first solid cell that a moving box collides with.
+
+		The box is swept through the grid one column or row at a time, in
+		the order that its leading edges cross into them, so the cost is
+		proportional to the number of cells crossed rather than the length
+		of the move. Only the cells entered by the leading edges are
+		checked, so cells which the box already overlaps are ignored.
+
+		Slopes are not treated as solid, since their collisions depend on
+		the height of the slope under the box.
+
+		Args:
+			x (float): The x coordinate of the box's bottom left corner.
+			y (float): The y coordinate of the box's bottom left corner.
+			width (float): The width of the box.
+			height (float): The height of the box.
+			dx (float): The distance the box moves along the x-axis.
+			dy (float): The distance the box moves along the y-axis.
+
+		Returns:
+			A tuple of the time of impact from 0 to 1 as a fraction of the move, and the x and y components of the contact normal, or None if the box does not collide with a solid cell.
+		"""
+		flags = self.flags
+		cols = self.cols
+		rows = self.rows
+		infinity = float('inf')
+
+		# Time at which the leading edge crosses into the next column, and the time taken to cross each column
+		if dx > 0:
+			step_x = 1
+			next_col = int(math.ceil((x + width) / TILE_SIZE_FLOAT))
+			time_x = (next_col * TILE_SIZE - x - width) / float(dx)
+			step_time_x = TILE_SIZE / float(dx)
+		elif dx < 0:
+			step_x = -1
+			next_col = int(math.floor(x / TILE_SIZE_FLOAT)) - 1
+			time_x = ((next_col + 1) * TILE_SIZE - x) / float(dx)
+			step_time_x = -TILE_SIZE / float(dx)
+		else:
+			time_x = infinity
+
+		# Time at which the leading edge crosses into the next row, and the time taken to cross each row
+		if dy > 0:
+			step_y = 1
+			next_row = int(math.ceil((y + height) / TILE_SIZE_FLOAT))
+			time_y = (next_row * TILE_SIZE - y - height) / float(dy)
+			step_time_y = TILE_SIZE / float(dy)
+		elif dy < 0:
+			step_y = -1
+			next_row = int(math.floor(y / TILE_SIZE_FLOAT)) - 1
+			time_y = ((next_row + 1) * TILE_SIZE - y) / float(dy)
+			step_time_y = -TILE_SIZE / float(dy)
+		else:
+			time_y = infinity
+
+		while True:
+			# Nothing can be collided with past the edge of the grid
+			if time_x != infinity and (next_col >= cols if step_x > 0 else next_col < 0):
+				time_x = infinity
+			if time_y != infinity and (next_row >= rows if step_y > 0 else next_row < 0):
+				time_y = infinity
+
+			if time_y <= time_x:
+				if time_y > 1:
+					return None
+
+				first_col, last_col = _get_overlapped_cells(x + dx * time_y, width)
+
+				# A column entered at the same time as the row is entered diagonally
+				if time_x != infinity and floats_equal(time_x, time_y):
+					if step_x > 0:
+						last_col = next_col
+					else:
+						first_col = next_col
+
+				if 0 <= next_row < rows:
+					row = next_row * cols
+					for col in xrange(max(0, first_col), min(cols, last_col + 1)):
+						if flags[row + col] & (COLLIDABLE | SLOPE) == COLLIDABLE:
+							return (max(0.0, time_y), 0, -step_y)
+
+				next_row += step_y
+				time_y += step_time_y
+			else:
+				if time_x > 1:
+					return None
+
+				first_row, last_row = _get_overlapped_cells(y + dy * time_x, height)
+
+				if 0 <= next_col < cols:
+					for row in xrange(max(0, first_row), min(rows, last_row + 1)):
+						if flags[row * cols + next_col] & (COLLIDABLE | SLOPE) == COLLIDABLE:
+							return (max(0.0, time_x), -step_x, 0)
+
+				next_col += step_x
+				time_x += step_time_x
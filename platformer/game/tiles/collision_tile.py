@@ -0,0 +1,517 @@
+# -*- coding: utf-8 -*-
+
+import math
+from array import array
+from struct import pack, unpack
+from ..settings.general_settings import TILE_SIZE
+from ..util import floats_equal
+
+# Per-cell collision flags
+OCCUPIED    = 1 << 0 # The cell contains a tile
+COLLIDABLE  = 1 << 1 # The tile can be collided with
+SLOPE       = 1 << 2 # The tile is a slope
+FACES_LEFT  = 1 << 3 # The tile's slope faces left (◢)
+FACES_RIGHT = 1 << 4 # The tile's slope faces right (◣)
+CEILING     = 1 << 5 # The tile's slope is intended for use as a ceiling
+
+# Common flag combinations
+LEFTWARD_SLOPE  = SLOPE | FACES_LEFT
+RIGHTWARD_SLOPE = SLOPE | FACES_RIGHT
+
+class CollisionTile(object):
+	"""The collision behavior of a tile, independent of its appearance.
+
+	Collision tiles have no position of their own. A single instance is
+	shared by every cell with the same behavior, and the indices of the
+	cell being collided with are passed when resolving a collision.
+
+	Collision tiles should be created with :func:`get_collision_tile`
+	so that instances are shared.
+
+	Attributes:
+		type (str): The type of tile.
+		is_collidable (bool): Whether the tile can be collided with.
+		flags (int): The collision flags for cells containing this tile.
+	"""
+
+	__slots__ = ('is_collidable', 'flags')
+
+	type = 'basic'
+	faces_left = False
+	faces_right = False
+	is_ceiling = False
+	left_height = 0
+	right_height = 0
+
+	def __init__(self, is_collidable=True):
+		"""Creates a new collision tile.
+
+		Kwargs:
+			is_collidable (bool): Whether the tile can be collided with.
+		"""
+		self.is_collidable = is_collidable
+		self.flags = self._get_flags()
+
+	def _get_flags(self):
+		"""Returns the collision flags for cells containing this tile."""
+		if self.is_collidable:
+			return OCCUPIED | COLLIDABLE
+
+		return OCCUPIED
+
+	def resolve_collision_x(self, obj, tile_x, tile_y):
+		"""Resolves a collision with a physical object on the x-axis.
+
+		Args:
+			obj (:class:`game.physical_objects.physical_object.PhysicalObject`): The physical object to resolve a collision with.
+			tile_x (int): The x index of the cell being collided with.
+			tile_y (int): The y index of the cell being collided with.
+
+		Returns:
+			True if a collision occurred, False otherwise.
+		"""
+		x = tile_x * TILE_SIZE
+
+		# If the object is moving left
+		if obj.moving_to_x < obj.x:
+			obj.moving_to_x = x + TILE_SIZE
+			obj.on_left_collision(self)
+
+			return True
+		# If the object is moving right
+		else:
+			obj.moving_to_x = x - obj.width
+			obj.on_right_collision(self)
+
+			return True
+
+	def resolve_collision_y(self, obj, tile_x, tile_y):
+		"""Resolves a collision with a physical object on the y-axis.
+
+		Args:
+			obj (:class:`game.physical_objects.physical_object.PhysicalObject`): The physical object to resolve a collision with.
+			tile_x (int): The x index of the cell being collided with.
+			tile_y (int): The y index of the cell being collided with.
+
+		Returns:
+			True if a collision occurred, False otherwise.
+		"""
+		y = tile_y * TILE_SIZE
+		y2 = y + TILE_SIZE
+
+		# If the object is moving down through the tile
+		if obj.moving_to_y < obj.y:
+			# Move it on top of the tile
+			obj.moving_to_y = y2
+			obj.on_bottom_collision(self)
+
+			return True
+		# If the object is moving up from below the tile
+		elif obj.moving_to_y < y2:
+			# Move it under the tile
+			obj.moving_to_y = y - obj.height
+			obj.on_top_collision(self)
+
+			return True
+
+		return False
+
+
+
+class TileCollisionAdapter(CollisionTile):
+	"""The collision behavior of a tile which resolves its own collisions.
+
+	Custom :class:`game.tiles.tile.Tile` subclasses can override
+	``resolve_collision_x`` and ``resolve_collision_y``. Since collision
+	grids only resolve collisions through collision tiles, each of those
+	tiles is given its own adapter, which passes collisions on to the
+	tile. Cells containing the tile are flagged in the same way as the
+	tile's shared collision tile.
+
+	Attributes:
+		tile (:class:`game.tiles.tile.Tile`): The tile which resolves its own collisions.
+		collision_tile (:class:`game.tiles.collision_tile.CollisionTile`): The shared collision tile for the tile's behavior.
+	"""
+
+	__slots__ = ('tile', 'collision_tile')
+
+	def __init__(self, tile, collision_tile):
+		"""Creates a new collision tile adapter.
+
+		Args:
+			tile (:class:`game.tiles.tile.Tile`): The tile which resolves its own collisions.
+			collision_tile (:class:`game.tiles.collision_tile.CollisionTile`): The shared collision tile for the tile's behavior.
+		"""
+		self.tile = tile
+		self.collision_tile = collision_tile
+
+		super(TileCollisionAdapter, self).__init__(collision_tile.is_collidable)
+
+	type = property(lambda self: self.tile.type)
+	left_height = property(lambda self: self.collision_tile.left_height)
+	right_height = property(lambda self: self.collision_tile.right_height)
+
+	def _get_flags(self):
+		"""Returns the collision flags for cells containing this tile."""
+		return self.collision_tile.flags
+
+	def resolve_collision_x(self, obj, tile_x, tile_y):
+		return self.tile.resolve_collision_x(obj)
+
+	def resolve_collision_y(self, obj, tile_x, tile_y):
+		return self.tile.resolve_collision_y(obj)
+
+
+
+# TODO Float equality should be checked with util.floats_equal
+class _SlopeCollisionTile(CollisionTile):
+	"""The collision behavior of a sloped tile.
+
+	Attributes:
+		left_height (int): The height of the left end of the slope.
+		right_height (int): The height of the right end of the slope.
+		faces_left (bool): Whether the face of the slopes faces left.
+		faces_right (bool): Whether the face of the slopes faces right.
+		is_ceiling (bool): Whether this slope is intended for use as a ceiling tile.
+		height_profile (tuple): The height of the slope across each column of pixels in the tile, as returned by :func:`get_slope_height_profile`.
+	"""
+
+	__slots__ = ('left_height', 'right_height', 'height_profile')
+
+	type = 'slope'
+
+	def __init__(self, left_height, right_height, is_collidable=True):
+		"""Creates a new slope collision tile.
+
+		Args:
+			left_height (int): The height of the left end of the slope.
+			right_height (int): The height of the right end of the slope.
+
+		Kwargs:
+			is_collidable (bool): Whether the tile can be collided with.
+		"""
+		self.left_height = int(left_height)
+		self.right_height = int(right_height)
+		self.height_profile = get_slope_height_profile(self.left_height, self.right_height)
+
+		super(_SlopeCollisionTile, self).__init__(is_collidable)
+
+	def _get_flags(self):
+		"""Returns the collision flags for cells containing this tile."""
+		flags = super(_SlopeCollisionTile, self)._get_flags() | SLOPE
+
+		if self.faces_left:
+			flags |= FACES_LEFT
+		if self.faces_right:
+			flags |= FACES_RIGHT
+		if self.is_ceiling:
+			flags |= CEILING
+
+		return flags
+
+	def resolve_collision_y(self, obj, tile_x, tile_y):
+		x = tile_x * TILE_SIZE
+		y = tile_y * TILE_SIZE
+
+		# If the object is moving down
+		if obj.moving_to_y < obj.y:
+			# TODO Clean up this method!
+			# Position on the tile, from the center of this object
+			position_on_tile = obj.mid_x - x
+
+			if position_on_tile <= 0:
+				slope_y = self.left_height
+			elif position_on_tile >= TILE_SIZE:
+				slope_y = self.right_height
+			else:
+				# The height changes by at most a pixel across each column, once past the column's step
+				column = int(position_on_tile)
+				heights, steps, stepped_heights = self.height_profile
+
+				if position_on_tile - column > steps[column]:
+					slope_y = stepped_heights[column]
+				else:
+					slope_y = heights[column]
+
+			slope_y += y
+
+			# TODO Determine whether the player is falling above the slope or just came from another connected slope, and set in_air accordingly
+			# TODO A constant value is not the right way to determine if we fell onto the slope or not
+			#if obj.y - 5 > slope_y:
+				## TODO Set is_falling somehow, not just in_air
+				#obj.in_air = True
+
+			# If we're on the ground or we're colliding with the slope, register the collision
+			if not obj.in_air or obj.moving_to_y < slope_y or floats_equal(obj.moving_to_y, slope_y):
+				obj.moving_to_y = slope_y
+				# TODO Is this even necessary? Think of how often it's called
+				obj.on_bottom_collision()
+
+				# TODO If facing right and there's a tile to our right that we're overlapping, resolve that collision? Same for leftward facing slopes. But then if we resolve that, we'd have to resolve this again! There has to be a better way.
+
+				return True
+		# TODO A constant value is not a good way of handling this
+		elif obj.y2 - y < 5:
+			# @TODO This check is no good and allows you to move through slopes from below diagonally
+			# Collide with the bottoms of slope tiles
+			# A threshold of 5 pixels ensures that we don't collide with other tiles on a multi-tile slope when jumping
+			obj.moving_to_y = y - obj.height
+			obj.on_top_collision(self)
+
+			return True
+
+		return False
+
+
+
+class LeftwardSlopeCollisionTile(_SlopeCollisionTile):
+	"""The collision behavior of a sloped floor tile which faces to the left (◢)."""
+
+	__slots__ = ()
+
+	faces_left = True
+
+	def resolve_collision_x(self, obj, tile_x, tile_y):
+		x = tile_x * TILE_SIZE
+		x2 = x + TILE_SIZE
+		y = tile_y * TILE_SIZE
+
+		# If the object is moving left
+		# TODO Comment this better
+		# TODO Clean up this mess, probably by writing utility methods to make this more readable
+		if obj.x >= x2 and obj.y < y + self.right_height and obj.moving_to_x < obj.x:
+			obj.moving_to_x = x2
+			return True
+		if obj.x2 <= x and obj.y < y and obj.y2 >= y and obj.moving_to_x > obj.x:
+			obj.moving_to_x = x - obj.width
+			return True
+
+		return False
+
+
+
+class RightwardSlopeCollisionTile(_SlopeCollisionTile):
+	"""The collision behavior of a sloped floor tile which faces to the right (◣)."""
+
+	__slots__ = ()
+
+	faces_right = True
+
+	def resolve_collision_x(self, obj, tile_x, tile_y):
+		x = tile_x * TILE_SIZE
+		x2 = x + TILE_SIZE
+		y = tile_y * TILE_SIZE
+
+		# TODO Comment this better
+		# TODO Clean up this mess, probably by writing utility methods to make this more readable
+		if obj.x2 <= x and obj.y < y + self.left_height and obj.moving_to_x > obj.x:
+			obj.moving_to_x = x - obj.width
+			return True
+		if obj.x >= x2 and obj.y < y and obj.y2 >= y and obj.moving_to_x < obj.x:
+			obj.moving_to_x = x2
+			return True
+
+		return False
+
+
+
+# TODO Implement this
+class _CeilingSlopeCollisionTile(_SlopeCollisionTile):
+	"""The collision behavior of a sloped ceiling tile."""
+
+	__slots__ = ()
+
+	is_ceiling = True
+
+
+
+# TODO Implement this
+class LeftwardCeilingSlopeCollisionTile(_CeilingSlopeCollisionTile):
+	"""The collision behavior of a sloped ceiling tile which faces to the left (◥)."""
+
+	__slots__ = ()
+
+	faces_left = True
+
+
+
+# TODO Implement this
+class RightwardCeilingSlopeCollisionTile(_CeilingSlopeCollisionTile):
+	"""The collision behavior of a sloped ceiling tile which faces to the left (◤)."""
+
+	__slots__ = ()
+
+	faces_right = True
+
+
+
+
+
+# Slope height profiles, keyed by their left and right heights
+_slope_height_profiles = {}
+
+def _get_previous_float(value):
+	"""Returns the largest float which is less than a positive float.
+
+	Args:
+		value (float): The positive float.
+
+	Returns:
+		The previous float.
+	"""
+	return unpack('<d', pack('<q', unpack('<q', pack('<d', value))[0] - 1))[0]
+
+def get_slope_height_profile(left_height, right_height):
+	"""Returns the height of a slope across each column of pixels in a tile.
+
+	The height of the slope at a position on the tile is the height of
+	the straight line between its ends, rounded up to a whole pixel.
+	Since slopes rise by at most a pixel across each column, the height
+	within a column is its height at the left edge until a step, and a
+	pixel higher or lower past the step. Profiles are computed once and
+	shared by every slope with the same heights, which happens when
+	tileset configs are loaded, so slope collisions only need to look
+	up a height.
+
+	Args:
+		left_height (int): The height of the left end of the slope.
+		right_height (int): The height of the right end of the slope.
+
+	Returns:
+		A tuple of ``(heights, steps, stepped_heights)`` with an entry for each of the ``TILE_SIZE`` columns. ``heights`` is an ``array('h')`` of the height at the left edge of each column, ``steps`` is an ``array('d')`` of how far across each column, from 0 to 1, the height changes once exceeded, and ``stepped_heights`` is an ``array('h')`` of the height past each step.
+	"""
+	key = (left_height, right_height)
+
+	if not key in _slope_height_profiles:
+		heights = array('h')
+		steps = array('d')
+		stepped_heights = array('h')
+		rise = float(right_height - left_height) / TILE_SIZE
+
+		for column in xrange(TILE_SIZE):
+			position_on_tile = float(column) / TILE_SIZE
+			line_height = (1-position_on_tile)*left_height + position_on_tile*right_height
+			height = int(math.ceil(line_height))
+
+			heights.append(height)
+
+			if rise > 0:
+				# Rising slopes step up once the line is past the next whole pixel
+				steps.append((height - line_height) / rise)
+				stepped_heights.append(height + 1)
+			elif rise < 0:
+				# Falling slopes step down once the line reaches the pixel below, so their steps are just before it
+				steps.append(_get_previous_float((line_height - (height - 1)) / -rise))
+				stepped_heights.append(height - 1)
+			else:
+				steps.append(1.0)
+				stepped_heights.append(height)
+
+		_slope_height_profiles[key] = (heights, steps, stepped_heights)
+
+	return _slope_height_profiles[key]
+
+def slope_collision_tile_factory(left_height, right_height, is_ceiling=False, is_collidable=True, **kwargs):
+	"""Creates the appropriate slope collision tile for the given tile arguments.
+
+	Args:
+		left_height (int): The height of the left end of the slope.
+		right_height (int): The height of the right end of the slope.
+
+	Kwargs:
+		is_ceiling (bool): Whether this slope is intended for use as a ceiling tile.
+		is_collidable (bool): Whether the tile can be collided with.
+
+	Returns:
+		A slope collision tile object.
+	"""
+	# Slopes face the same directions as those created by the slope tile factory
+	if is_ceiling:
+		if left_height > right_height:
+			return LeftwardCeilingSlopeCollisionTile(left_height, right_height, is_collidable)
+		else:
+			return RightwardCeilingSlopeCollisionTile(left_height, right_height, is_collidable)
+	else:
+		if left_height < right_height:
+			return LeftwardSlopeCollisionTile(left_height, right_height, is_collidable)
+		else:
+			return RightwardSlopeCollisionTile(left_height, right_height, is_collidable)
+
+class _CollisionTileTypes(dict):
+	"""Dictionary of collision tile types which forgets the shared collision tiles whenever a type is registered or removed."""
+
+	def __setitem__(self, tile_type, factory):
+		super(_CollisionTileTypes, self).__setitem__(tile_type, factory)
+		_collision_tiles.clear()
+
+	def __delitem__(self, tile_type):
+		super(_CollisionTileTypes, self).__delitem__(tile_type)
+		_collision_tiles.clear()
+
+	def update(self, *args, **kwargs):
+		super(_CollisionTileTypes, self).update(*args, **kwargs)
+		_collision_tiles.clear()
+
+"""Dictionary of custom collision tile types and their factory methods.
+
+The keys should be the name of the tile type, and the value should be
+a callback method for returning the appropriate collision tile object
+from the tile's config entry, in the same way as
+:data:`game.tiles.custom_tile_loader.custom_tile_types`. Basic tiles and
+tile types which only have a custom tile factory behave as basic tiles,
+unless their tiles resolve their own collisions. Those tiles resolve
+collisions through a :class:`TileCollisionAdapter`, and can't be used in
+collision grids created from value maps without a collision tile factory.
+"""
+custom_collision_tile_types = _CollisionTileTypes({
+	'slope': slope_collision_tile_factory,
+})
+
+# Shared collision tiles, keyed by their config entries
+_collision_tiles = {}
+
+def _get_hashable_value(value):
+	"""Returns a hashable equivalent of a tile config value.
+
+	Args:
+		value: The tile config value, which may contain lists and dicts.
+
+	Returns:
+		The value, with lists and dicts converted to tuples.
+	"""
+	if isinstance(value, dict):
+		return (dict, tuple(sorted((key, _get_hashable_value(item)) for key, item in value.iteritems())))
+	elif isinstance(value, (list, tuple)):
+		return (list, tuple(_get_hashable_value(item) for item in value))
+
+	return value
+
+def get_collision_tile(tile_entry):
+	"""Returns the shared collision tile for a tile config entry.
+
+	Args:
+		tile_entry (dict): The tileset config entry for the tile, as returned by :func:`game.tiles.tileset.TilesetConfig.get_tile_entry`.
+
+	Returns:
+		A :class:`game.tiles.collision_tile.CollisionTile` object.
+
+	Raises:
+		ValueError: If the tile type has neither a collision tile factory nor a custom tile factory.
+	"""
+	key = _get_hashable_value(tile_entry)
+
+	if not key in _collision_tiles:
+		# Imported here, since the custom tile factories create tiles which import this module
+		from custom_tile_loader import custom_tile_types
+
+		kwargs = dict(tile_entry)
+		tile_type = kwargs.pop('type', None)
+
+		if tile_type in custom_collision_tile_types:
+			_collision_tiles[key] = custom_collision_tile_types[tile_type](**kwargs)
+		elif tile_type in (None, 'basic') or tile_type in custom_tile_types:
+			_collision_tiles[key] = CollisionTile(kwargs.get('is_collidable', True))
+		else:
+			raise ValueError("Unknown tile type '{0}'".format(tile_type))
+
+	return _collision_tiles[key]
@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
 
-import math
 from tile import Tile
-from ..util import floats_equal
+from collision_tile import get_collision_tile
 
-# TODO Float equality should be checked with util.floats_equal
 class _SlopeTile(Tile):
 	"""A sloped tile for use in maps.
 
@@ -28,53 +26,20 @@ class _SlopeTile(Tile):
 			left_height (int): The height of the left end of the slope.
 			right_height (int): The height of the right end of the slope.
 		"""
-		super(_SlopeTile, self).__init__(*args, **kwargs)
-
 		self.left_height = int(left_height)
 		self.right_height = int(right_height)
 
-	def resolve_collision_y(self, obj):
-		# If the object is moving down
-		if obj.moving_to_y < obj.y:
-			# TODO Clean up this method!
-			# Position on the tile, from the center of this object (0 is left, 1 is right)
-			position_on_tile = float(obj.mid_x - self.x) / self.width
-
-			if position_on_tile <= 0:
-				slope_y = self.left_height
-			elif position_on_tile >= 1:
-				slope_y = self.right_height
-			else:
-				slope_y = math.ceil((1-position_on_tile)*self.left_height + position_on_tile*self.right_height)
-
-			slope_y += self.y
-
-			# TODO Determine whether the player is falling above the slope or just came from another connected slope, and set in_air accordingly
-			# TODO A constant value is not the right way to determine if we fell onto the slope or not
-			#if obj.y - 5 > slope_y:
-				## TODO Set is_falling somehow, not just in_air
-				#obj.in_air = True
-
-			# If we're on the ground or we're colliding with the slope, register the collision
-			if not obj.in_air or obj.moving_to_y < slope_y or floats_equal(obj.moving_to_y, slope_y):
-				obj.moving_to_y = slope_y
-				# TODO Is this even necessary? Think of how often it's called
-				obj.on_bottom_collision()
-
-				# TODO If facing right and there's a tile to our right that we're overlapping, resolve that collision? Same for leftward facing slopes. But then if we resolve that, we'd have to resolve this again! There has to be a better way.
-
-				return True
-		# TODO A constant value is not a good way of handling this
-		elif obj.y2 - self.y < 5:
-			# @TODO This check is no good and allows you to move through slopes from below diagonally
-			# Collide with the bottoms of slope tiles
-			# A threshold of 5 pixels ensures that we don't collide with other tiles on a multi-tile slope when jumping
-			obj.moving_to_y = self.y - obj.height
-			obj.on_top_collision(self)
-
-			return True
+		super(_SlopeTile, self).__init__(*args, **kwargs)
 
-		return False
+	def _get_collision_tile(self):
+		"""Returns the shared collision tile for this tile's behavior."""
+		return get_collision_tile({
+			'type': self.type,
+			'left_height': self.left_height,
+			'right_height': self.right_height,
+			'is_ceiling': self.is_ceiling,
+			'is_collidable': self.is_collidable,
+		})
 
 
 
@@ -83,21 +48,6 @@ class LeftwardSlopeTile(_SlopeTile):
 
 	faces_left = True
 
-	# TODO Probably don't need tile_map kwarg
-	def resolve_collision_x(self, obj):
-		# If the object is moving left
-		# TODO Comment this better
-		# TODO self.y + self.right_height could be cached, but needs to be updated if self.y is ever changed
-		# TODO Clean up this mess, probably by writing utility methods to make this more readable
-		if obj.x >= self.x2 and obj.y < self.y + self.right_height and obj.moving_to_x < obj.x:
-			obj.moving_to_x = self.x2
-			return True
-		if obj.x2 <= self.x and obj.y < self.y and obj.y2 >= self.y and obj.moving_to_x > obj.x:
-			obj.moving_to_x = self.x - obj.width
-			return True
-
-		return False
-
 
 
 class RightwardSlopeTile(_SlopeTile):
@@ -105,19 +55,6 @@ class RightwardSlopeTile(_SlopeTile):
 
 	faces_right = True
 
-	def resolve_collision_x(self, obj, tile_map=None):
-		# TODO Comment this better
-		# TODO self.y + self.right_height could be cached, but needs to be updated if self.y is ever changed
-		# TODO Clean up this mess, probably by writing utility methods to make this more readable
-		if obj.x2 <= self.x and obj.y < self.y + self.left_height and obj.moving_to_x > obj.x:
-			obj.moving_to_x = self.x - obj.width
-			return True
-		if obj.x >= self.x2 and obj.y < self.y and obj.y2 >= self.y and obj.moving_to_x < obj.x:
-			obj.moving_to_x = self.x2
-			return True
-
-		return False
-
 
 
 # TODO Implement this
@@ -1,5 +1,6 @@
 from game import util
 from game.bounded_box import BoundedBox
+from collision_grid import CollisionGrid
 from pyglet.image import Texture
 from ..settings.general_settings import TILE_SIZE
 
@@ -10,6 +11,7 @@ class TextureTileMap(object):
 		tiles (2d list of :class:`game.tiles.tile.Tile`): A 2d list of the tiles on the map. Empty tiles are represented as ``None``.
 		rows (int): The number of rows of tiles in the map.
 		cols (int): The number of columns of tiles in the map.
+		collision_grid (:class:`game.tiles.collision_grid.CollisionGrid`): Collision data for the tiles on the map.
 		texture (:class:`pyglet.image.Texture`): A texture containing the entire tile map image.
 	"""
 
@@ -23,6 +25,7 @@ class TextureTileMap(object):
 		self.rows = len(value_map)
 		self.cols = len(value_map[0])
 		self.tiles = None
+		self.collision_grid = None
 		self.texture = None
 
 		# The maximum dimensions of this tile map
@@ -30,11 +33,14 @@ class TextureTileMap(object):
 			0, 0, self.cols * TILE_SIZE, self.rows * TILE_SIZE
 		)
 
+		# Reused for each requested region, so that drawing regions doesn't allocate boxes
+		self._region = BoundedBox(0, 0, 0, 0)
+
 		# Create the map from the given tile values and tileset
 		self._create_tile_map(value_map, tileset)
 
 	def _create_tile_map(self, value_map, tileset):
-		"""Creates a 2d list of tile objects and a texture for the entire tile map.
+		"""Creates a 2d list of tile objects, their collision grid, and a texture for the entire tile map.
 
 		Args:
 			value_map (2d list of int): A 2d list of the tile values for each tile in the tile map.
@@ -60,6 +66,9 @@ class TextureTileMap(object):
 					self.texture.blit_into(tileset.image.get_tile_image_data(tile_value), coords[0], coords[1], 0)
 					#tileset.image.get_tile_image_data(tile_value).blit_to_texture(self.texture.target, self.texture.level, coords[0], coords[1], 0)
 
+		# Keep compact collision data for the map
+		self.collision_grid = CollisionGrid.from_tiles(self.tiles)
+
 	def blit(self, x, y):
 		"""Draws the entire tile map with its anchor point (usually the bottom left corner) at the given coordinates.
 
@@ -83,8 +92,8 @@ class TextureTileMap(object):
 		Returns:
 			A :class:`game.extended_texture.ExtendedTextureRegion` object.
 		"""
-		region = BoundedBox(x - self.texture.anchor_x, y - self.texture.anchor_y, width, height)
-		region = region.get_intersection(self._max_dimensions)
+		region = self._region.set_bounds(x - self.texture.anchor_x, y - self.texture.anchor_y, width, height)
+		region = region.intersect_into(self._max_dimensions, region)
 
 		return self.texture.get_region(
 			region.x, region.y, region.width, region.height
@@ -1,4 +1,5 @@
 from game.extended_sprite import ExtendedSprite
+from collision_tile import get_collision_tile, TileCollisionAdapter
 
 # TODO Does this really need to subclass Sprite? Does this really need access to the image?
 # TODO Possibly have a large tiling tile class which can be used to draw large regions of repeated tiles with a single tile object
@@ -6,9 +7,17 @@ from game.extended_sprite import ExtendedSprite
 class Tile(ExtendedSprite):
 	"""A tile for use in maps.
 
+	The collision behavior of a tile is provided by a shared
+	:class:`game.tiles.collision_tile.CollisionTile`, so that collision
+	data does not depend on the tile's sprite. Subclasses which override
+	:func:`resolve_collision_x` or :func:`resolve_collision_y` are given
+	their own :class:`game.tiles.collision_tile.TileCollisionAdapter`
+	instead, so collision grids still resolve collisions through them.
+
 	Attributes:
 		is_collidable (bool): Whether the tile can be collided with.
 		type (str): The type of tile.
+		collision_tile (:class:`game.tiles.collision_tile.CollisionTile`): The collision behavior of the tile.
 	"""
 
 	type = 'basic'
@@ -23,6 +32,23 @@ class Tile(ExtendedSprite):
 
 		super(Tile, self).__init__(*args, **kwargs)
 
+		# The shared collision tile for this tile's behavior
+		self._shared_collision_tile = self._get_collision_tile()
+		self.collision_tile = self._shared_collision_tile
+
+		if self.resolves_own_collisions():
+			self.collision_tile = TileCollisionAdapter(self, self._shared_collision_tile)
+
+	@classmethod
+	def resolves_own_collisions(cls):
+		"""Returns True if this tile type overrides how collisions with it are resolved."""
+		return (cls.resolve_collision_x.im_func is not Tile.resolve_collision_x.im_func
+			or cls.resolve_collision_y.im_func is not Tile.resolve_collision_y.im_func)
+
+	def _get_collision_tile(self):
+		"""Returns the shared collision tile for this tile's behavior."""
+		return get_collision_tile({'is_collidable': self.is_collidable})
+
 	def resolve_collision_x(self, obj):
 		"""Resolves a collision with a physical object on the x-axis.
 
@@ -32,18 +58,7 @@ class Tile(ExtendedSprite):
 		Returns:
 			True if a collision occurred, False otherwise.
 		"""
-		# If the object is moving left
-		if obj.moving_to_x < obj.x:
-			obj.moving_to_x = self.x2
-			obj.on_left_collision(self)
-
-			return True
-		# If the object is moving right
-		else:
-			obj.moving_to_x = self.x - obj.width
-			obj.on_right_collision(self)
-
-			return True
+		return self._shared_collision_tile.resolve_collision_x(obj, self.x_tile, self.y_tile)
 
 	def resolve_collision_y(self, obj):
 		"""Resolves a collision with a physical object on the y-axis.
@@ -54,19 +69,4 @@ class Tile(ExtendedSprite):
 		Returns:
 			True if a collision occurred, False otherwise.
 		"""
-		# If the object is moving down through the tile
-		if obj.moving_to_y < obj.y:
-			# Move it on top of the tile
-			obj.moving_to_y = self.y2
-			obj.on_bottom_collision(self)
-
-			return True
-		# If the object is moving up from below the tile
-		elif obj.moving_to_y < self.y2:
-			# Move it under the tile
-			obj.moving_to_y = self.y - obj.height
-			obj.on_top_collision(self)
-
-			return True
-
-		return False
+		return self._shared_collision_tile.resolve_collision_y(obj, self.x_tile, self.y_tile)
@@ -1,5 +1,6 @@
 from game import util
 from game.bounded_box import BoundedBox
+from collision_grid import CollisionGrid
 from game.settings.general_settings import TILE_SIZE
 
 class TileMap(object):
@@ -11,6 +12,7 @@ class TileMap(object):
 		tiles (2d list of :class:`game.tiles.tile.Tile`): 2d list of tiles on the map. Empty tiles are represented as ``None``.
 		rows (int): The number of rows of tiles in the map.
 		cols (int): The number of columns of tiles in the map.
+		collision_grid (:class:`game.tiles.collision_grid.CollisionGrid`): Collision data for the tiles on the map.
 	"""
 
 	def __init__(self, value_map, tileset, batch=None, group=None):
@@ -28,10 +30,10 @@ class TileMap(object):
 		self._batch = batch
 		self._group = group
 
-		self._visible_tiles = set()
 		self._tile_objects = [] # List of all tile objects
 
 		self.tiles = None
+		self.collision_grid = None
 		self.rows = len(value_map)
 		self.cols = len(value_map[0])
 
@@ -40,14 +42,21 @@ class TileMap(object):
 			0, 0, self.cols * TILE_SIZE, self.rows * TILE_SIZE
 		)
 
+		# Boxes which are reused while setting the visible region, so that scrolling doesn't allocate boxes
+		self._requested_region = BoundedBox(0, 0, 0, 0)
+		self._visible_box = BoundedBox(0, 0, 0, 0)
+
 		# The default visible area is the entire tile map
-		self._visible_region = self._max_dimensions
+		self._set_visible_box(self._max_dimensions)
+
+		# Tile indices of the visible area as (min_x, min_y, max_x, max_y), inclusive
+		self._visible_tile_region = (0, 0, self.cols - 1, self.rows - 1)
 
 		# Create the map from the given tile values and tileset
 		self._create_tile_map(value_map, tileset)
 
 	def _create_tile_map(self, value_map, tileset):
-		"""Creates a 2d list of tile objects.
+		"""Creates a 2d list of tile objects and the collision grid for them.
 
 		Args:
 			value_map (2d list of int): A 2d list of the tile values for each tile in the tile map.
@@ -66,7 +75,9 @@ class TileMap(object):
 					self.tiles[y][x] = tileset.create_tile(tile_value, x=coordinates[0], y=coordinates[1], batch=self._batch, group=self._group)
 
 					self._tile_objects.append(self.tiles[y][x])
-					self._visible_tiles.add(self.tiles[y][x])
+
+		# Keep compact collision data for the map
+		self.collision_grid = CollisionGrid.from_tiles(self.tiles)
 
 	def draw(self):
 		"""Draws the entire tile map."""
@@ -92,7 +103,10 @@ class TileMap(object):
 		"""Sets the visible region of the tile map.
 
 		Because invisible tiles are not drawn, this method can
-		reduce the amount of drawing to do.
+		reduce the amount of drawing to do. Only the visibility of
+		tiles which entered or left the region is changed, so the cost
+		of scrolling is proportional to the rows and columns scrolled.
+		If the region is outside of the tile map, no tiles are visible.
 
 		Args:
 			x (int): The x coordinate to draw the region from.
@@ -100,32 +114,79 @@ class TileMap(object):
 			width (int): The width of the region to draw.
 			height (int): The height of the region to draw.
 		"""
-		# Bound the region to the tile map's dimensions
-		region = BoundedBox(x, y, width, height)
-		region = region.get_intersection(self._max_dimensions)
+		region = self._bound_region(x, y, width, height)
 
-		# Do nothing if the requested region is the current visible region
-		if region == self._visible_region:
+		if region is None:
+			# Nothing is visible if the region is outside of the tile map
+			tile_region = _EMPTY_REGION
+		elif self._visible_region is not None and region == self._visible_region:
+			# Do nothing if the requested region is the current visible region
 			return
+		else:
+			tile_region = (region.x_tile, region.y_tile, region.x2_tile, region.y2_tile)
 
 		# Keep track of the currently visible region
-		self._visible_region = region
+		self._set_visible_box(region)
 
-		# Create a list of all tiles in the region
-		tiles_in_region = []
-		for y in xrange(region.y_tile, region.y2_tile+1):
-			for x in xrange(region.x_tile, region.x2_tile+1):
-				tile = self.tiles[y][x]
-				if tile:
-					tile.visible = True
-					tiles_in_region.append(tile)
+		previous_tile_region = self._visible_tile_region
+
+		# Only the tiles which entered or left the region need to change visibility
+		if tile_region == previous_tile_region:
+			return
+
+		self._visible_tile_region = tile_region
+
+		for strip in _get_region_difference(previous_tile_region, tile_region):
+			self._set_tile_visibility(strip, False)
+
+		for strip in _get_region_difference(tile_region, previous_tile_region):
+			self._set_tile_visibility(strip, True)
+
+	def _bound_region(self, x, y, width, height):
+		"""Bounds a region to the tile map's dimensions.
 
-		# Determine which tiles need to be made invisible
-		make_invisible = self._visible_tiles.difference(tiles_in_region)
-		map(lambda tile: tile.__setattr__('visible', False), make_invisible)
+		The returned box is reused by the next call, so it should be
+		copied if it needs to be kept.
 
-		# Keep track of which tiles are visible
-		self._visible_tiles = set(tiles_in_region)
+		Args:
+			x (int): The x coordinate of the region.
+			y (int): The y coordinate of the region.
+			width (int): The width of the region.
+			height (int): The height of the region.
+
+		Returns:
+			A :class:`game.bounded_box.BoundedBox` of the part of the region within the tile map, or ``None`` if the region is outside of the tile map.
+		"""
+		region = self._requested_region.set_bounds(x, y, width, height)
+
+		return region.intersect_into(self._max_dimensions, region)
+
+	def _set_visible_box(self, region):
+		"""Keeps track of the visible region by copying it.
+
+		Args:
+			region (:class:`game.bounded_box.BoundedBox`): The visible region, or ``None`` if nothing is visible.
+		"""
+		if region is None:
+			self._visible_region = None
+		else:
+			self._visible_region = self._visible_box.set_bounds(region.x, region.y, region.width, region.height)
+
+	def _set_tile_visibility(self, tile_region, visible):
+		"""Sets the visibility of every tile in a region of tile indices.
+
+		Args:
+			tile_region (tuple of int): The inclusive tile indices of the region as ``(min_x, min_y, max_x, max_y)``.
+			visible (bool): Whether the tiles should be visible.
+		"""
+		min_x, min_y, max_x, max_y = tile_region
+
+		for y in xrange(min_y, max_y+1):
+			row = self.tiles[y]
+			for x in xrange(min_x, max_x+1):
+				tile = row[x]
+				if tile:
+					tile.visible = visible
 
 
 
@@ -150,3 +211,52 @@ class TileMap(object):
 		"""Sets the graphics group for each tile in the map."""
 		map(lambda tile: tile.__setattr__('group', group), self._tile_objects)
 		self._group = group
+
+
+
+# A region of tile indices which contains no tiles
+_EMPTY_REGION = (0, 0, -1, -1)
+
+def _get_region_difference(region, other_region):
+	"""Returns the parts of a region of tile indices which are not in another region.
+
+	Regions are given as inclusive tile indices in the form
+	``(min_x, min_y, max_x, max_y)``, and a region whose maximum
+	is less than its minimum is empty.
+
+	Args:
+		region (tuple of int): The region to subtract from.
+		other_region (tuple of int): The region to subtract.
+
+	Returns:
+		A list of non-overlapping regions covering the difference.
+	"""
+	min_x, min_y, max_x, max_y = region
+	other_min_x, other_min_y, other_max_x, other_max_y = other_region
+
+	if max_x < min_x or max_y < min_y:
+		return []
+
+	# If the regions don't overlap, the entire region is the difference
+	if (other_max_x < other_min_x or other_max_y < other_min_y or
+		other_min_x > max_x or other_max_x < min_x or other_min_y > max_y or other_max_y < min_y):
+		return [region]
+
+	difference = []
+
+	# Full-width strips below and above the other region
+	if min_y < other_min_y:
+		difference.append((min_x, min_y, max_x, other_min_y - 1))
+	if max_y > other_max_y:
+		difference.append((min_x, other_max_y + 1, max_x, max_y))
+
+	# Strips to the left and right of the other region, between the strips above and below
+	overlap_min_y = max(min_y, other_min_y)
+	overlap_max_y = min(max_y, other_max_y)
+
+	if min_x < other_min_x:
+		difference.append((min_x, overlap_min_y, other_min_x - 1, overlap_max_y))
+	if max_x > other_max_x:
+		difference.append((other_max_x + 1, overlap_min_y, max_x, overlap_max_y))
+
+	return difference
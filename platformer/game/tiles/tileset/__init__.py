@@ -1,4 +1,4 @@
 from tileset import Tileset
 from tileset_image import TilesetImage
 from tileset_config import TilesetConfig
-from tileset_loaders import load_tileset_file, load_tileset_image, get_tileset_config, get_tileset_image
+from tileset_loaders import load_tileset_file, load_tileset_image, get_tileset_config, get_tileset_image, get_tileset_image_data
@@ -1,7 +1,8 @@
 from tileset_config import TilesetConfig
 from tileset_image import TilesetImage
-from tileset_loaders import get_tileset_config, get_tileset_image
+from tileset_loaders import get_tileset_config, get_tileset_image, get_tileset_image_data
 from .. import tile_factory
+from ...resource_cache import resource_cache, get_image_size
 
 class Tileset(object):
 	"""Manages the appearance and behavior of tiles in a tileset.
@@ -20,45 +21,71 @@ class Tileset(object):
 	on a :class:`game.tiles.tileset.Tileset` instance, or the cache can
 	be emptied for all tilesets by calling :func:`flush_cache` on this class.
 
+	Tilesets are cached in :data:`game.resource_cache.resource_cache`, so
+	the least recently used tilesets are evicted once the cache exceeds its
+	memory budget. Tilesets used by a loaded level can be kept cached with
+	:func:`pin` until they are released with :func:`unpin`. Tilesets packed
+	into a texture atlas are not counted against the budget, since the atlas
+	keeps their texture memory even once they are evicted.
+
 	Attributes:
 		name (str): The name of the tileset.
 		image (:class:`game.tiles.tileset.TilesetImage`): The image data for the tileset.
 		config (:class:`game.tiles.tileset.TilesetConfig`): The config data for the tileset.
+		packed (bool): Whether the tileset image is packed into a texture atlas.
 	"""
 
-	_cached_tilesets = {}
-
-	def __init__(self, tileset_name, tileset_image, tileset_config):
+	def __init__(self, tileset_name, tileset_image, tileset_config, packed=False):
 		"""Manages the tile images and config data for a tileset.
 
 		Args:
 			tileset_name (str): The name of the tileset.
 			tileset_image (:class:`game.tiles.tileset.TilesetImage`): The image data for the tileset.
 			tileset_config (:class:`game.tiles.tileset.TilesetConfig`): The config data for the tileset.
+
+		Kwargs:
+			packed (bool): Whether the tileset image is packed into a texture atlas.
 		"""
-		if not tileset_name in self._cached_tilesets:
-			self._cache_tileset(tileset_name, tileset_image, tileset_config)
-		else:
-			# Update the cache
-			self._cached_tilesets[tileset_name]['image'] = tileset_image
-			self._cached_tilesets[tileset_name]['config'] = tileset_config
+		# Cache the tileset, or update the cache
+		self._cache_tileset(tileset_name, tileset_image, tileset_config, packed)
 
 		self.name = tileset_name
-		self.image = self._cached_tilesets[tileset_name]['image']
-		self.config = self._cached_tilesets[tileset_name]['config']
+		self.image = tileset_image
+		self.config = tileset_config
+		self.packed = packed
+
+	@staticmethod
+	def _get_cache_key(tileset_name):
+		"""Returns the key of a tileset in the resource cache.
+
+		Args:
+			tileset_name (str): The name of the tileset.
+
+		Returns:
+			The resource cache key as a tuple.
+		"""
+		return ('tileset', tileset_name)
 
 	@classmethod
-	def _cache_tileset(cls, tileset_name, tileset_image, tileset_config):
+	def _cache_tileset(cls, tileset_name, tileset_image, tileset_config, packed=False):
 		"""Caches a tileset.
 
 		Args:
 			tileset_name (str): The name of the tileset.
 			tileset_image (:class:`game.tiles.tileset.TilesetImage`): The image data for the tileset.
 			tileset_config (:class:`game.tiles.tileset.TilesetConfig`): The config data for the tileset.
+
+		Kwargs:
+			packed (bool): Whether the tileset image is packed into a texture atlas.
 		"""
-		cls._cached_tilesets[tileset_name] = {}
-		cls._cached_tilesets[tileset_name]['image'] = tileset_image
-		cls._cached_tilesets[tileset_name]['config'] = tileset_config
+		# Evicting a packed tileset frees none of the atlas' memory
+		size = get_image_size(tileset_image.texture) if tileset_image and not packed else 0
+
+		resource_cache.add(cls._get_cache_key(tileset_name), {
+			'image': tileset_image,
+			'config': tileset_config,
+			'packed': packed,
+		}, size)
 
 	def create_tile(self, tile_value, *args, **kwargs):
 		"""Creates a tile object from a numeric tile value.
@@ -88,15 +115,50 @@ class Tileset(object):
 		Args:
 			tileset_name (str): The name of the tileset to empty from the cache.
 		"""
-		cls._cached_tilesets.pop(tileset_name)
+		resource_cache.pop(cls._get_cache_key(tileset_name))
+
+	@classmethod
+	def is_cached(cls, tileset_name):
+		"""Returns whether a tileset's data is cached.
+
+		Args:
+			tileset_name (str): The name of the tileset.
+
+		Returns:
+			True if the tileset is cached, False otherwise.
+		"""
+		return cls._get_cache_key(tileset_name) in resource_cache
 
 	@classmethod
 	def flush_cache(cls):
 		"""Empties all tilesets from the cache."""
-		cls._cached_tilesets = {}
+		for key in resource_cache.keys():
+			if key[0] == 'tileset':
+				resource_cache.pop(key)
+
+	@classmethod
+	def pin(cls, tileset_name):
+		"""Keeps a tileset's data cached until it is unpinned, regardless of the cache budget.
+
+		Args:
+			tileset_name (str): The name of the cached tileset.
+
+		Raises:
+			KeyError: If the tileset is not cached.
+		"""
+		resource_cache.pin(cls._get_cache_key(tileset_name))
+
+	@classmethod
+	def unpin(cls, tileset_name):
+		"""Allows a pinned tileset's data to be evicted from the cache again.
+
+		Args:
+			tileset_name (str): The name of the cached tileset.
+		"""
+		resource_cache.unpin(cls._get_cache_key(tileset_name))
 
 	@classmethod
-	def load(cls, tileset_name, rows=None, cols=None):
+	def load(cls, tileset_name, rows=None, cols=None, atlas=None):
 		"""Loads a tileset.
 
 		Args:
@@ -105,16 +167,24 @@ class Tileset(object):
 		Kwargs:
 			rows (int): The number of rows of tiles in the tileset image.
 			cols (int): The number of columns of tiles in the tileset image.
+			atlas (:class:`game.texture_atlas.TextureAtlas`): An atlas to pack the tileset image into, instead of giving it its own texture.
 
 		Returns:
 			A :class:`game.tiles.tileset.Tileset` object.
 		"""
-		# If this tileset's resources have not been loaded before, load and cache them
-		if not tileset_name in cls._cached_tilesets:
-			cls._cache_tileset(
-				tileset_name,
-				TilesetImage(get_tileset_image(tileset_name), rows, cols),
-				TilesetConfig(get_tileset_config(tileset_name))
-			)
-
-		return cls(tileset_name, cls._cached_tilesets[tileset_name]['image'], cls._cached_tilesets[tileset_name]['config'])
+		cached_tileset = resource_cache.get(cls._get_cache_key(tileset_name))
+
+		# If this tileset's resources are not cached, load them
+		if cached_tileset is None:
+			if atlas:
+				tileset_image = atlas.add(get_tileset_image_data(tileset_name), key=('tileset', tileset_name))
+			else:
+				tileset_image = get_tileset_image(tileset_name)
+
+			cached_tileset = {
+				'image': TilesetImage(tileset_image, rows, cols),
+				'config': TilesetConfig(get_tileset_config(tileset_name)),
+				'packed': bool(atlas),
+			}
+
+		return cls(tileset_name, cached_tileset['image'], cached_tileset['config'], cached_tileset['packed'])
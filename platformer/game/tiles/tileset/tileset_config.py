@@ -1,4 +1,5 @@
 from json import loads as parse_json
+from ..collision_tile import get_slope_height_profile
 
 class TilesetConfig(object):
 	"""Tileset config data which defines how each tile in a tileset should behave.
@@ -44,6 +45,10 @@ class TilesetConfig(object):
 		for tile_value, tile_config in raw_config.iteritems():
 			self._config[int(tile_value)] = tile_config
 
+			# Precompute slope heights, so that slope collisions only look them up
+			if tile_config.get('type') == 'slope' and 'left_height' in tile_config and 'right_height' in tile_config:
+				get_slope_height_profile(int(tile_config['left_height']), int(tile_config['right_height']))
+
 	def get_tile_entry(self, tile_value):
 		"""Returns the tileset config entry for the given tile value.
 
@@ -1,4 +1,5 @@
 from pyglet.image import ImageGrid, TextureGrid
+from ...resource_cache import resource_cache, get_image_size
 from ...settings.general_settings import TILE_SIZE
 from math import ceil
 
@@ -15,6 +16,7 @@ class TilesetImage(object):
 	Attributes:
 		rows (int): The number of rows of tiles in the tileset image.
 		cols (int): The number of columns of tiles in the tileset image.
+		texture (:class:`pyglet.image.TextureGrid`): The texture containing every tile image.
 	"""
 
 	def __init__(self, tileset_image, rows=None, cols=None):
@@ -37,7 +39,7 @@ class TilesetImage(object):
 			cols = int(ceil(tileset_image.width / TILE_SIZE))
 
 		self._image = TextureGrid(ImageGrid(tileset_image, rows, cols))
-		self._image_data = {}
+		self.texture = self._image
 		self.rows = rows
 		self.cols = cols
 
@@ -68,10 +70,22 @@ class TilesetImage(object):
 		indices = self._value_to_indices(tile_value)
 		return self._image[indices[0], indices[1]]
 
+	def get_tile_tex_coords(self, tile_value):
+		"""Returns the texture coordinates of a tile in the tileset texture.
+
+		Args:
+			tile_value (int): The integer value of a tile in the tileset.
+
+		Returns:
+			A tuple of the 3d texture coordinates of the tile image's corners, in the order used by :class:`pyglet.sprite.Sprite`.
+		"""
+		return self.get_tile_image(tile_value).tex_coords
+
 	def get_tile_image_data(self, tile_value):
 		"""Returns the image data for a tile in the tileset.
 
-		Image data retrieval calls are cached after the first access
+		Image data retrieval calls are cached in
+		:data:`game.resource_cache.resource_cache` after the first access
 		to improve performance.
 
 		Args:
@@ -80,8 +94,12 @@ class TilesetImage(object):
 		Returns:
 			A :class:`pyglet.image.ImageData` object for the tile's image data.
 		"""
+		cache_key = ('tile image data', self, tile_value)
+		image_data = resource_cache.get(cache_key)
+
 		# If the image data for this tile is not cached, cache it
-		if not tile_value in self._image_data:
-			self._image_data[tile_value] = self.get_tile_image(tile_value).get_image_data()
+		if image_data is None:
+			image_data = self.get_tile_image(tile_value).get_image_data()
+			resource_cache.add(cache_key, image_data, get_image_size(image_data))
 
-		return self._image_data[tile_value]
+		return image_data
@@ -1,7 +1,11 @@
+import pyglet.image
 import pyglet.resource
 from pyglet.resource import ResourceNotFoundException
 from ...settings.general_settings import TILESET_DIRECTORY
 
+# Image formats for tileset images, in the order they are searched for
+_tileset_image_formats = ['png', 'gif', 'jpg', 'jpeg']
+
 def load_tileset_file(tileset_name, name):
 	"""Loads a tileset resource file.
 
@@ -67,7 +71,7 @@ def get_tileset_image(tileset_name):
 		ResourceNotFoundException: The resource to load could not be found.
 	"""
 	# Try opening a "tiles.*" file in this order
-	filetypes = ['png', 'gif', 'jpg', 'jpeg']
+	filetypes = _tileset_image_formats
 
 	for filetype in filetypes:
 		try:
@@ -76,3 +80,32 @@ def get_tileset_image(tileset_name):
 			# If we've checked all of the filetypes, it doesn't exist
 			if filetype is filetypes[-1]:
 				raise ResourceNotFoundException("tiles.{supported format}")
+
+def get_tileset_image_data(tileset_name):
+	"""Decodes the image file for a tileset without creating a texture.
+
+	The image file is searched for in the same order as
+	:func:`get_tileset_image`. Because no OpenGL calls are made, this
+	can be called from threads other than the main thread.
+
+	Args:
+		tileset_name (str): The name of the tileset to load the image for.
+
+	Returns:
+		A :class:`pyglet.image.AbstractImage` object of the decoded image.
+
+	Raises:
+		ResourceNotFoundException: The resource to load could not be found.
+	"""
+	for filetype in _tileset_image_formats:
+		try:
+			image_file = load_tileset_file(tileset_name, 'tiles.'+filetype)
+		except ResourceNotFoundException:
+			continue
+
+		try:
+			return pyglet.image.load('tiles.'+filetype, file=image_file)
+		finally:
+			image_file.close()
+
+	raise ResourceNotFoundException("tiles.{supported format}")
@@ -0,0 +1,134 @@
+from array import array
+from pyglet.gl import GL_QUADS, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA
+from pyglet.graphics import Batch
+from pyglet.sprite import SpriteGroup
+from collision_grid import CollisionGrid
+from game.settings.general_settings import TILE_SIZE, TILE_MAP_CHUNK_SIZE
+
+class VertexTileMap(object):
+	"""A static grid of tiles drawn from vertex lists.
+
+	Rather than creating a sprite for every tile, the vertices and
+	texture coordinates of each chunk of the map are baked into a single
+	vertex list which draws directly from the tileset texture. Tiles
+	therefore cost a few dozen bytes each, and moving the map to a new
+	batch or group only migrates one vertex list per chunk.
+
+	Because the map is baked, its tiles can not be moved or hidden
+	individually. Collision data is kept separately in the collision grid.
+
+	Attributes:
+		rows (int): The number of rows of tiles in the map.
+		cols (int): The number of columns of tiles in the map.
+		collision_grid (:class:`game.tiles.collision_grid.CollisionGrid`): Collision data for the tiles on the map.
+		chunk_size (int): The width and height of each baked chunk, in tiles.
+	"""
+
+	def __init__(self, value_map, tileset, batch=None, group=None, chunk_size=TILE_MAP_CHUNK_SIZE):
+		"""Creates a new vertex tile map.
+
+		Args:
+			value_map (2d list of int): A 2d list of the tile values for each tile in the tile map.
+			tileset (:class:`game.tiles.tileset.Tileset`): The tileset to use for the map.
+
+		Kwargs:
+			batch (:class:`pyglet.graphics.Batch`): A graphics batch to add the map to.
+			group (:class:`pyglet.graphics.Group`): A graphics group to add the map to.
+			chunk_size (int): The width and height of each baked chunk, in tiles.
+		"""
+		self.rows = len(value_map)
+		self.cols = len(value_map[0])
+		self.chunk_size = chunk_size
+
+		# The map is drawn by its own batch until it is given one
+		self._batch = batch or Batch()
+		self._group = group
+		self._texture_group = SpriteGroup(tileset.image.texture, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, group)
+
+		self._vertex_lists = []
+
+		self.collision_grid = CollisionGrid.from_value_map(value_map, tileset)
+
+		self._create_vertex_lists(value_map, tileset)
+
+	def _create_vertex_lists(self, value_map, tileset):
+		"""Bakes each chunk of the map into a vertex list.
+
+		Args:
+			value_map (2d list of int): A 2d list of the tile values for each tile in the tile map.
+			tileset (:class:`game.tiles.tileset.Tileset`): The tileset to use for the map.
+		"""
+		# Texture coordinates are shared by every tile with the same value
+		tex_coords = {}
+
+		for chunk_y in xrange(0, self.rows, self.chunk_size):
+			for chunk_x in xrange(0, self.cols, self.chunk_size):
+				vertices = array('i')
+				chunk_tex_coords = array('f')
+
+				for y in xrange(chunk_y, min(chunk_y + self.chunk_size, self.rows)):
+					row = value_map[y]
+					y1 = y * TILE_SIZE
+					y2 = y1 + TILE_SIZE
+
+					for x in xrange(chunk_x, min(chunk_x + self.chunk_size, self.cols)):
+						tile_value = row[x]
+
+						if tile_value != 0: # Ignore empty tiles
+							if not tile_value in tex_coords:
+								tex_coords[tile_value] = tileset.image.get_tile_tex_coords(tile_value)
+
+							x1 = x * TILE_SIZE
+							x2 = x1 + TILE_SIZE
+
+							# Corners are in the same order as sprite vertices
+							vertices.extend((x1, y1, x2, y1, x2, y2, x1, y2))
+							chunk_tex_coords.extend(tex_coords[tile_value])
+
+				# Skip empty chunks
+				if vertices:
+					self._vertex_lists.append(self._batch.add(
+						len(vertices) / 2, GL_QUADS, self._texture_group,
+						('v2i/static', vertices), ('t3f/static', chunk_tex_coords)
+					))
+
+	def draw(self):
+		"""Draws the entire tile map."""
+		self._batch.draw()
+
+	def delete(self):
+		"""Deletes the map's vertex lists."""
+		map(lambda vertex_list: vertex_list.delete(), self._vertex_lists)
+		self._vertex_lists = []
+
+
+
+	@property
+	def batch(self):
+		"""Gets batch."""
+		return self._batch
+
+	@batch.setter
+	def batch(self, batch):
+		"""Migrates the map's vertex lists to a graphics batch."""
+		batch = batch or Batch()
+
+		for vertex_list in self._vertex_lists:
+			self._batch.migrate(vertex_list, GL_QUADS, self._texture_group, batch)
+
+		self._batch = batch
+
+	@property
+	def group(self):
+		"""Gets group."""
+		return self._group
+
+	@group.setter
+	def group(self, group):
+		"""Migrates the map's vertex lists to a graphics group."""
+		self._texture_group = SpriteGroup(self._texture_group.texture, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, group)
+
+		for vertex_list in self._vertex_lists:
+			self._batch.migrate(vertex_list, GL_QUADS, self._texture_group, self._batch)
+
+		self._group = group
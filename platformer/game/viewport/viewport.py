@@ -20,6 +20,9 @@ class Viewport(BoundedBox):
 
 		super(Viewport, self).__init__(*args, **kwargs)
 
+		# Reused for bounding focused coordinates, so that focusing doesn't allocate boxes
+		self._focus_box = BoundedBox(0, 0, 0, 0)
+
 		# Use ease out as the default easing function
 		self._default_easing_function = EaseOut
 
@@ -30,6 +33,11 @@ class Viewport(BoundedBox):
 		self._easing_x = None
 		self._easing_y = None
 
+		# The position at the start of the last simulation step, and the position to draw from
+		self._previous_x = self.x
+		self._previous_y = self.y
+		self._interpolated_position = None
+
 		# Needed for adjusting the viewport with OpenGL
 		self._aspect =  self.width  / float(self.height)
 		self._scale  =  self.height / 2
@@ -53,6 +61,8 @@ class Viewport(BoundedBox):
 		Args:
 			dt (float): The number of seconds between the current frame and the previous frame.
 		"""
+		self._interpolated_position = None
+
 		if self.fixed:
 			return
 
@@ -68,8 +78,9 @@ class Viewport(BoundedBox):
 	def focus(self):
 		"""Focuses the viewport for the next frame.
 		This method should be called before drawing and after clearing the window."""
-		x = self.mid_x
-		y = self.mid_y
+		x, y = self.get_interpolated_position()
+		x += self._half_width_int
+		y += self._half_height_int
 
 		glMatrixMode(GL_PROJECTION)
 		glLoadIdentity()
@@ -80,6 +91,37 @@ class Viewport(BoundedBox):
 		glMatrixMode(GL_MODELVIEW)
 		glLoadIdentity()
 
+	def store_previous_position(self):
+		"""Stores the viewport's current position as its previous position.
+
+		This should be called before each simulation step, so that the
+		viewport can be focused between its positions before and after the step.
+		"""
+		self._previous_x = self.x
+		self._previous_y = self.y
+
+	def interpolate(self, alpha):
+		"""Focuses the viewport between its previous and current positions.
+
+		The viewport's position is unchanged, and it will be focused on
+		its position again after its next update.
+
+		Args:
+			alpha (float): How far between the previous and current positions to focus, from 0 to 1.
+		"""
+		self._interpolated_position = (
+			self._previous_x + (self.x - self._previous_x) * alpha,
+			self._previous_y + (self.y - self._previous_y) * alpha
+		)
+
+	def get_interpolated_position(self):
+		"""Returns the position that the viewport is focused on.
+
+		Returns:
+			The bottom left coordinates of the interpolated viewport as a tuple of ``(x, y)``, or the viewport's coordinates if it has not been interpolated since its last update.
+		"""
+		return self._interpolated_position or (self.x, self.y)
+
 	def focus_on_coordinates(self, x, y, duration=1, easing=None, x_easing=None, y_easing=None):
 		"""Focuses the center of the viewport on the given coordinates.
 
@@ -98,7 +140,7 @@ class Viewport(BoundedBox):
 		x_easing, y_easing = self._get_easing_functions(easing, x_easing, y_easing)
 
 		if self.bounds:
-			coordinates = BoundedBox(x, y, 0, 0).bound_within(self.bounds)
+			coordinates = self._focus_box.set_bounds(x, y, 0, 0).bound_within(self.bounds)
 			x = coordinates.x
 			y = coordinates.y
 		else:
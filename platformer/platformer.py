@@ -1,6 +1,9 @@
 from pyglet.gl import glEnable, glBlendFunc, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA
+from game.fixed_step_scheduler import FixedStepScheduler
+from game.frame_skipping_event_loop import FrameSkippingEventLoop
+from game.load import Level, LevelStack
 from game.settings.general_settings import FRAME_LENGTH
-from game.load import Level
+from game.texture_atlas import TextureAtlas
 from game import stageevents
 import pyglet
 import game
@@ -22,10 +25,21 @@ game_window = pyglet.window.Window(800, 600, caption='Platformer Demo')
 
 game_window.push_handlers(game.key_handler)
 
+# Tilesets are packed into a shared atlas, so tile maps from different tilesets can share a texture
+game.atlas = TextureAtlas()
+
 # TODO The stage to load shouldn't be passed like this, there should be some sort of saved data handler that passes the level to load
 level = Level.load('demo')
 game.level = level # Make it globally available
 
+# Sub-levels are pushed onto the level stack, which keeps the levels beneath them loaded
+level_stack = LevelStack(level)
+game.level_stack = level_stack # Make it globally available
+
+@level_stack.event
+def on_level_change(top_level):
+	game.level = top_level
+
 # TODO This should be a LevelEvents object inside a Level class
 events = {
     'player_events': [
@@ -46,19 +60,33 @@ def on_draw():
 	# TODO It's possible that this could be removed if it's a significant performance bottleneck
 	game_window.clear()
 
-	level.layer_manager.draw()
+	# Draw moving objects between their last two simulated positions
+	level_stack.top.layer_manager.interpolate(scheduler.alpha)
+	level_stack.draw()
 
 def update(dt):
-	stage_events.update()
+	level_stack.top.layer_manager.store_previous_positions()
+
+	# The stage events belong to the demo level
+	if level_stack.top is level:
+		stage_events.update()
 
         # TODO The level object should have its own update method
-	level.layer_manager.update(dt)
+	level_stack.update(dt)
 
 	#module_reloader.update()
 
+# Simulate at a fixed rate regardless of the frame rate
+scheduler = FixedStepScheduler(update)
+game.scheduler = scheduler # Make it globally available
+
 if __name__ == '__main__':
 	glEnable(GL_BLEND)
 	glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
-	pyglet.clock.schedule_interval(update, FRAME_LENGTH)
+	# Tick at the simulation rate, so the event loop sleeps between frames rather than spinning
+	pyglet.clock.schedule_interval(scheduler.tick, FRAME_LENGTH)
+
+	# Skip drawing while the simulation catches up
+	pyglet.app.event_loop = FrameSkippingEventLoop(scheduler)
 	pyglet.app.run()